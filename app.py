@@ -1,81 +1,166 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
 import json
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import urllib3
+import os
 import warnings
-import numpy as np
+from dataclasses import replace
 from datetime import datetime
 
-# SSL 경고 및 인증서 검증 비활성화
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-warnings.filterwarnings('ignore')
-
-# 페이지 설정
-st.set_page_config(
-    page_title="주민대피시설 현황 대시보드",
-    page_icon="🏢",
-    layout="wide",
-    initial_sidebar_state="expanded"
+from shelter import metrics
+from shelter.api import ShelterAPIError
+from shelter.cache import FRESH
+from shelter.charts import (
+    TABS,
+    TREND_METRICS,
+    build_figure,
+    scenario_heatmap,
+    trend_growth,
+    trend_line,
+)
+from shelter.core import ALL_REGIONS, rate_bounds
+from shelter.export import EXPORT_FORMATS, export_bytes
+from shelter.facilities import facility_source, load_facilities
+from shelter.loader import ShelterLoader
+from shelter.maps import (
+    DEFAULT_ZOOM,
+    KOREA_BOUNDS,
+    ClusterPyramid,
+    base_map,
+    cluster_layer,
+    load_boundaries,
+    parse_bounds,
+    region_centers,
+)
+from shelter.memo import LRUCache
+from shelter.preprocess import TOTAL_REGION
+from shelter.rollup import LEVEL_LABELS, NATION, NATION_NAME
+from shelter.scenarios import monte_carlo, national_grid, scenario_base, scenario_table
+from shelter.scheduler import RefreshScheduler
+from shelter.shared import SharedStore
+from shelter.table import (
+    DEFAULT_PAGE_SIZE,
+    FULL_TABLE_ROWS,
+    PAGE_SIZES,
+    TableQuery,
+    ordered_positions,
+    page_count,
+    table_page,
 )
+from shelter.trends import TrendTable, load_years
+from shelter.views import COLUMN_LABELS, build_view, dataset_from_frames, prepare_dataset
+
+# 경고 메시지 숨김
+warnings.filterwarnings('ignore')
 
 # SERVICE_KEY 설정 (디코딩된 키)
 SERVICE_KEY = "jUxxEMTFyxsIT2rt2P8JBO9y0EmFT9mx1zNPb31XLX27rFNH12NQ+6+ZLqqvW6k/ffQ5ZOOYzzcSo0Fq4u3Lfg=="
 
-# 제목 및 설명
-st.title("🏢 주민대피시설 현황 대시보드")
-st.markdown("---")
-st.markdown("**행정안전부 통계연보 - 지역별 주민대피시설 현황을 시각화한 대시보드입니다.**")
+# 선택 가능한 연도 (2025부터 2019까지 역순)
+YEARS = list(range(2025, 2018, -1))
+
+# 데이터 로더 (프로세스 단위로 공유, 디스크 캐시 사용)
+@st.cache_resource
+def get_shelter_loader(service_key):
+    """디스크 캐시를 공유하는 데이터 로더 생성"""
+    return ShelterLoader(service_key)
+
+# 레플리카 간 공유하는 전처리 결과 (메모리 매핑 파일)
+@st.cache_resource
+def get_shared_store():
+    """같은 호스트의 프로세스들이 함께 읽는 연도별 전처리 결과 저장소"""
+    return SharedStore()
+
+# 재실행 간 결과 재사용 캐시 (처리된 데이터셋, 필터별 화면 데이터)
+@st.cache_resource
+def get_view_cache():
+    """연도/필터 상태별 계산 결과를 보관하는 LRU 캐시"""
+    return LRUCache(maxsize=64, name='view')
+
+# 그림 캐시 (연도/필터 상태/차트 ID별 Plotly 그림)
+@st.cache_resource
+def get_figure_cache():
+    """생성한 Plotly 그림을 보관하는 LRU 캐시"""
+    return LRUCache(maxsize=128, name='figure')
+
+# 연도별 추이 표 (새 연도/바뀐 연도만 반영)
+@st.cache_resource
+def get_trend_table(service_key):
+    """전체 연도를 모은 추이 표"""
+    return TrendTable()
+
+# 시설 단위 데이터와 줌 단계별 클러스터 (프로세스당 한 번 로드)
+@st.cache_resource
+def get_facilities():
+    """시설 좌표와 격자 인덱스"""
+    return load_facilities()
+
+@st.cache_resource
+def get_cluster_pyramid():
+    """줌 단계별 시설 클러스터"""
+    return ClusterPyramid(get_facilities())
+
+@st.cache_resource
+def get_region_centers():
+    """시도별 시설 좌표 평균 (경계 GeoJSON이 없을 때 수용률 표시 위치)"""
+    return region_centers(get_facilities())
+
+# 시도 경계 GeoJSON (처음 한 번만 읽음)
+@st.cache_resource
+def get_boundaries():
+    """시도 경계 (SHELTER_BOUNDARY_PATH 미지정 시 None)"""
+    return load_boundaries()
+
+# Prometheus 텍스트 형식 계측 엔드포인트 (SHELTER_METRICS_PORT 지정 시 프로세스당 한 번 시작)
+@st.cache_resource
+def get_metrics_server():
+    """/metrics 를 제공하는 백그라운드 HTTP 서버의 URL (미지정 시 None)
+
+    기본은 로컬(127.0.0.1)에만 열고, 수집기가 다른 호스트에 있으면
+    SHELTER_METRICS_HOST 로 주소를 지정합니다.
+    """
+    port = os.environ.get("SHELTER_METRICS_PORT")
+    if not port:
+        return None
+    metrics.enable()
+    host = os.environ.get("SHELTER_METRICS_HOST", "127.0.0.1")
+    _, url = metrics.serve_prometheus(int(port), host=host)
+    return url
+
+# 백그라운드 갱신 스케줄러 (프로세스당 한 번 시작)
+@st.cache_resource
+def get_refresh_scheduler(service_key, years):
+    """모든 연도를 미리 불러오고 만료 전에 갱신하는 스케줄러 시작"""
+    scheduler = RefreshScheduler(get_shelter_loader(service_key), years)
+    scheduler.start()
+    return scheduler
 
 # API 호출 함수
-@st.cache_data(ttl=300)
-def fetch_air_raid_shelter_data(service_key, year, page_no=1, num_of_rows=1000):
-    """공공데이터 API에서 주민대피시설 데이터를 가져오는 함수"""
-    
-    # API 엔드포인트
-    url = "http://apis.data.go.kr/1741000/AirRaidShelterRegion/getAirRaidShelterRegionList"
-    
-    # 파라미터 설정
-    params = {
-        'ServiceKey': service_key,
-        'pageNo': page_no,
-        'numOfRows': num_of_rows,
-        'type': 'json',
-        'bas_yy': year
-    }
-    
+def fetch_air_raid_shelter_data(service_key, year):
+    """공공데이터 API에서 주민대피시설 데이터를 가져오는 함수
+
+    LoadResult를 반환합니다. 캐시가 신선하면 네트워크 호출 없이 반환하고, 없으면
+    첫 페이지의 totalCount를 기준으로 나머지 페이지를 동시에 호출해 합칩니다.
+    """
+
     try:
-        # API 호출
-        response = requests.get(url, params=params, verify=False, timeout=15)
-        response.raise_for_status()
-        
-        # JSON 응답 파싱
-        data = response.json()
-        
-        # JSON 구조에 따른 파싱
-        if "AirRaidShelterRegion" in data:
-            arr = data["AirRaidShelterRegion"]
-            
-            # 실제 레코드 데이터 추출
-            rows = None
-            for block in arr:
-                if "row" in block:
-                    rows = block["row"]
-                    break
-            
-            if rows:
-                st.success(f"✅ {year}년 데이터 로드 성공 ({len(rows)}개 지역)")
-                return rows
-            else:
-                st.warning(f"⚠️ {year}년 데이터가 없습니다.")
-                return None
+        result = get_shelter_loader(service_key).load(year)
+        if not result.frame.empty:
+            st.success(f"✅ {year}년 데이터 로드 성공 ({len(result.frame)}개 지역)")
+            if result.error:
+                fetched = datetime.fromtimestamp(result.fetched_at).strftime('%Y-%m-%d %H:%M')
+                st.warning(f"⚠️ API 호출 장애로 {fetched} 기준 마지막 정상 데이터를 표시합니다. ({result.error})")
+            elif result.stale:
+                st.caption("🔄 캐시된 데이터를 표시하고 백그라운드에서 갱신 중입니다.")
+            return result
         else:
-            st.error("🚨 예상과 다른 API 응답 구조입니다.")
+            st.warning(f"⚠️ {year}년 데이터가 없습니다.")
             return None
-            
+
+    except ShelterAPIError as e:
+        st.error(f"🚨 {str(e)}")
+        return None
     except requests.exceptions.RequestException as e:
         st.error(f"🚨 API 호출 실패: {str(e)}")
         return None
@@ -86,494 +171,834 @@ def fetch_air_raid_shelter_data(service_key, year, page_no=1, num_of_rows=1000):
         st.error(f"🚨 예상치 못한 오류: {str(e)}")
         return None
 
-# 데이터 전처리 함수
-def preprocess_data(raw_data):
-    """원시 데이터를 DataFrame으로 변환하고 전처리"""
-    
-    if not raw_data:
-        return pd.DataFrame(), pd.DataFrame()
-    
-    # DataFrame 생성
-    df = pd.DataFrame(raw_data)
-    
-    if df.empty:
-        return df, pd.DataFrame()
-    
-    # 수치형 컬럼 리스트
-    numeric_columns = [
-        'target_popl', 'accpt_rt', 'shelt_abl_popl_smry',
-        'shelt_abl_popl_gov_shelts', 'shelt_abl_popl_pub_shelts',
-        'gov_shelts_shelts', 'gov_shelts_area',
-        'pub_shelts_shelts', 'pub_shelts_area'
-    ]
-    
-    # 수치형 컬럼 변환
-    for col in numeric_columns:
-        if col in df.columns:
-            # 콤마 제거 및 숫자형 변환
-            df[col] = df[col].astype(str).str.replace(',', '').replace('', '0')
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # 결측치 처리 (0으로 채우기)
-    df = df.fillna(0)
-    
-    # '합계' 행 저장 후 제거 (컬럼 존재 확인)
-    total_row = pd.DataFrame()
+def year_dataset(result, view_cache):
+    """LoadResult의 Dataset (처음 전처리한 결과는 공유 파일로 게시하고 매핑해 씀)"""
+    def build():
+        dataset = prepare_dataset(result.frame)
+        store = get_shared_store()
+        try:
+            store.publish(result.year, result.fetched_at, dataset.df, dataset.total_df,
+                          result.content_hash)
+        except OSError:
+            # 공유 파일은 최적화일 뿐이므로 기록 실패는 무시
+            return dataset
+        shared = store.get(result.year)
+        if shared is None or shared.content_hash != result.content_hash:
+            return dataset
+        # 게시한 프로세스도 매핑한 파일을 씀
+        return dataset_from_frames(shared.df, shared.total_df)
+
+    # 같은 연도/같은 내용의 데이터는 다시 받아왔더라도 전처리 결과를 재사용
+    dataset = view_cache.get_or_compute(('dataset', result.year, result.content_hash), build)
+    # 같은 내용을 다시 받아온 경우(build 를 건너뜀)에도 게시본의 fetched_at 을 갱신하고,
+    # 게시본이 이 내용이면 로더 메모리의 원본 표는 버림
+    # (다음 재실행부터는 shared_dataset 이 공유 파일을 찾음)
+    try:
+        published = get_shared_store().touch(result.year, result.fetched_at, result.content_hash)
+    except OSError:
+        published = False
+    if published:
+        get_shelter_loader(SERVICE_KEY).forget(result.year)
+    return dataset
+
+def shared_dataset(year, view_cache):
+    """다른 프로세스가 게시한 신선한 전처리 결과 ((Dataset, content_hash), 없으면 None)
+
+    신선도는 게시본이 아니라 디스크 캐시 기준입니다. 스케줄러/로더가 같은 내용을
+    다시 받아오면 디스크 캐시의 fetched_at 만 바뀌고 게시본은 그대로 씁니다.
+    """
+    shared = get_shared_store().get(year)
+    if shared is None:
+        return None
+    loader = get_shelter_loader(SERVICE_KEY)
+    info = loader.cache.year_info(year, loader.num_of_rows)
+    if info is None or loader.cache.policy.state(year, info[0]) != FRESH:
+        return None
+    # 디스크 캐시가 무효화됐거나 (이 프로세스를 포함해) 누군가 다른 내용으로
+    # 갱신했으면 공유 파일은 이전 데이터이므로 로더에서 다시 읽어 게시
+    if info[1] != shared.content_hash:
+        return None
+    dataset = view_cache.get_or_compute(
+        ('dataset', year, shared.content_hash),
+        lambda: dataset_from_frames(shared.df, shared.total_df),
+    )
+    return dataset, shared.content_hash
+
+def load_selected_dataset(selected_year, view_cache):
+    """선택 연도의 Dataset과 데이터 버전 (불러올 수 없으면 실행 중단)
+
+    다른 레플리카가 게시한 신선한 공유 파일이 있으면 호출/파싱 없이 매핑해 씁니다.
+    """
+    with st.spinner(f"📡 {selected_year}년 데이터를 불러오는 중..."):
+        shared = shared_dataset(selected_year, view_cache)
+        if shared is not None:
+            dataset, content_hash = shared
+            st.success(f"✅ {selected_year}년 데이터 로드 성공 "
+                       f"({len(dataset.df) + len(dataset.total_df)}개 지역)")
+        else:
+            load_result = fetch_air_raid_shelter_data(SERVICE_KEY, selected_year)
+
+            if load_result is None:
+                st.error(f"❌ {selected_year}년 데이터를 불러올 수 없습니다. 다른 연도를 선택해주세요.")
+                st.stop()
+
+            dataset = year_dataset(load_result, view_cache)
+            content_hash = load_result.content_hash
+        # 하위 캐시(뷰, 차트, 지도, 표, 내보내기) 키는 수신 시각이 아니라 내용 기준
+        data_version = (selected_year, content_hash)
+
+        if dataset.df.empty:
+            st.warning(f"⚠️ {selected_year}년도 데이터가 비어있습니다.")
+            st.stop()
+    return dataset, data_version
+
+def render_refresh_status(scheduler):
+    """사이드바 캐시 갱신 상태"""
+    def _format_time(ts):
+        return datetime.fromtimestamp(ts).strftime('%m-%d %H:%M:%S') if ts else '-'
+
+    with st.sidebar.expander("🩺 캐시 갱신 상태"):
+        status_df = pd.DataFrame([
+            {
+                '연도': status.year,
+                '결과': status.outcome,
+                '마지막 갱신': _format_time(status.last_refresh_at),
+                '소요(초)': round(status.duration, 2) if status.duration is not None else None,
+                '다음 갱신': _format_time(status.next_refresh_at),
+                '내용 변경': _format_time(status.changed_at),
+                '오류': status.error or '',
+            }
+            for status in scheduler.status()
+        ])
+        st.dataframe(status_df, hide_index=True, use_container_width=True)
+
+def render_filters(dataset):
+    """사이드바 필터 (선택 지역, 수용률 범위)"""
+    df = dataset.df
+    st.sidebar.header("🔍 데이터 필터")
+
+    # 지역 선택 (컬럼 존재 확인)
     if 'regi' in df.columns:
-        total_row = df[df['regi'] == '합계'].copy()
-        df_filtered = df[df['regi'] != '합계'].copy()
+        selected_region = st.sidebar.selectbox(
+            "🏙️ 지역 선택",
+            options=dataset.regions,
+            index=0,
+            help="분석할 지역을 선택하세요."
+        )
     else:
-        df_filtered = df.copy()
-    
-    return df_filtered, total_row
-
-# 사이드바 설정
-st.sidebar.header("🔍 데이터 설정")
-
-# 연도 선택 (2025부터 2019까지 역순)
-years = list(range(2025, 2018, -1))
-selected_year = st.sidebar.selectbox(
-    "📅 기준연도 선택",
-    options=years,
-    index=0,  # 기본값: 2025
-    help="분석할 연도를 선택하세요."
-)
+        selected_region = ALL_REGIONS
+        st.sidebar.warning("지역 정보가 없습니다.")
+
+    # 수용률 범위 슬라이더
+    bounds = rate_bounds(df)
+    if bounds is not None:
+        min_rate, max_rate = bounds
+
+        rate_range = st.sidebar.slider(
+            "📊 수용률 범위 (%)",
+            min_value=min_rate,
+            max_value=max_rate,
+            value=(min_rate, max_rate),
+            help="수용률 범위를 설정하세요."
+        )
+    else:
+        rate_range = (0, 100)
+        st.sidebar.warning("수용률 정보가 없습니다.")
 
-# 데이터 로드
-with st.spinner(f"📡 {selected_year}년 데이터를 불러오는 중..."):
-    raw_data = fetch_air_raid_shelter_data(SERVICE_KEY, selected_year)
-    
-    if raw_data is None:
-        st.error(f"❌ {selected_year}년 데이터를 불러올 수 없습니다. 다른 연도를 선택해주세요.")
-        st.stop()
-    
-    df, total_df = preprocess_data(raw_data)
-    
-    if df.empty:
-        st.warning(f"⚠️ {selected_year}년도 데이터가 비어있습니다.")
-        st.stop()
-
-# 사이드바 필터
-st.sidebar.header("🔍 데이터 필터")
-
-# 지역 선택 (컬럼 존재 확인)
-if 'regi' in df.columns:
-    regions = ['전체'] + sorted(df['regi'].unique().tolist())
-    selected_region = st.sidebar.selectbox(
-        "🏙️ 지역 선택",
-        options=regions,
-        index=0,
-        help="분석할 지역을 선택하세요."
-    )
-else:
-    selected_region = '전체'
-    st.sidebar.warning("지역 정보가 없습니다.")
-
-# 수용률 범위 슬라이더
-if 'accpt_rt' in df.columns and not df['accpt_rt'].isna().all():
-    min_rate = float(df['accpt_rt'].min())
-    max_rate = float(df['accpt_rt'].max())
-    
-    rate_range = st.sidebar.slider(
-        "📊 수용률 범위 (%)",
-        min_value=min_rate,
-        max_value=max_rate,
-        value=(min_rate, max_rate),
-        help="수용률 범위를 설정하세요."
-    )
-else:
-    rate_range = (0, 100)
-    st.sidebar.warning("수용률 정보가 없습니다.")
+    return selected_region, tuple(rate_range)
 
-# 데이터 필터링
-filtered_df = df.copy()
+def render_kpis(view):
+    """전국 통계와 선택 지역 통계"""
+    # 전국 통계 (합계 행 활용)
+    st.markdown("### 🇰🇷 전국 통계 현황")
+    national = view.national
+    col1, col2, col3, col4 = st.columns(4)
+    if view.national_from_total:
+        with col1:
+            st.metric(
+                label="👥 전국 대상인구",
+                value=f"{national['target_popl']:,.0f}명",
+                help="전국 주민대피시설 대상인구"
+            )
 
-if selected_region != '전체' and 'regi' in df.columns:
-    filtered_df = filtered_df[filtered_df['regi'] == selected_region]
+        with col2:
+            st.metric(
+                label="📊 전국 평균 수용률",
+                value=f"{national['accpt_rt']:.1f}%",
+                help="전국 평균 대피시설 수용률"
+            )
 
-if 'accpt_rt' in filtered_df.columns:
-    filtered_df = filtered_df[
-        (filtered_df['accpt_rt'] >= rate_range[0]) & 
-        (filtered_df['accpt_rt'] <= rate_range[1])
-    ]
+        with col3:
+            st.metric(
+                label="🏢 전국 총 시설 수",
+                value=f"{national['pub_shelts_shelts']:,.0f}개소",
+                help="전국 공공용 대피시설 수"
+            )
+
+        with col4:
+            st.metric(
+                label="📐 전국 총 시설 면적",
+                value=f"{national['pub_shelts_area']:,.0f}㎡",
+                help="전국 공공용 대피시설 면적"
+            )
+    else:
+        # 합계 행이 없는 경우 필터링된 데이터로 계산
+        with col1:
+            st.metric(
+                label="👥 대상인구 합계",
+                value=f"{national['target_popl']:,.0f}명"
+            )
+
+        with col2:
+            st.metric(
+                label="📊 평균 수용률",
+                value=f"{national['accpt_rt']:.1f}%"
+            )
 
-# 전국 통계 (합계 행 활용)
-st.markdown("### 🇰🇷 전국 통계 현황")
-if not total_df.empty:
+        with col3:
+            st.metric(
+                label="🏢 총 시설 수",
+                value=f"{national['pub_shelts_shelts']:,.0f}개소"
+            )
+
+        with col4:
+            st.metric(
+                label="📐 총 시설 면적",
+                value=f"{national['pub_shelts_area']:,.0f}㎡"
+            )
+
+    # 필터링된 지역 통계
+    st.markdown("---")
+    st.markdown("### 📊 선택 지역 통계")
+    selection = view.selection
     col1, col2, col3, col4 = st.columns(4)
-    
-    total_row = total_df.iloc[0]
-    
+
     with col1:
-        target_popl = total_row.get('target_popl', 0)
         st.metric(
-            label="👥 전국 대상인구",
-            value=f"{target_popl:,.0f}명",
-            help="전국 주민대피시설 대상인구"
+            label="📍 총 지역 수",
+            value=selection['region_count'],
+            delta=f"{selection['region_delta']} (필터 적용)" if selection['region_delta'] else None
         )
-    
+
     with col2:
-        accpt_rt = total_row.get('accpt_rt', 0)
         st.metric(
-            label="📊 전국 평균 수용률",
-            value=f"{accpt_rt:.1f}%",
-            help="전국 평균 대피시설 수용률"
+            label="👥 대상 인구",
+            value=f"{selection['target_popl']:,}명"
         )
-    
+
     with col3:
-        pub_shelts = total_row.get('pub_shelts_shelts', 0)
         st.metric(
-            label="🏢 전국 총 시설 수",
-            value=f"{pub_shelts:,.0f}개소",
-            help="전국 공공용 대피시설 수"
+            label="📊 평균 수용률",
+            value=f"{selection['accpt_rt']:.1f}%"
         )
-    
+
     with col4:
-        pub_area = total_row.get('pub_shelts_area', 0)
         st.metric(
-            label="📐 전국 총 시설 면적",
-            value=f"{pub_area:,.0f}㎡",
-            help="전국 공공용 대피시설 면적"
+            label="🏢 총 시설 수",
+            value=f"{selection['pub_shelts_shelts']:,}개소"
         )
-else:
-    # 합계 행이 없는 경우 필터링된 데이터로 계산
-    col1, col2, col3, col4 = st.columns(4)
-    
+
+def _table_query(view, filter_key):
+    """상세 표 정렬/검색/페이지 크기 조작 위젯 (페이지 번호는 _page_input)"""
+    sortable = {col: label for col, label in COLUMN_LABELS.items() if col in view.filtered_df.columns}
+    col1, col2, col3, col4 = st.columns([3, 3, 2, 2])
     with col1:
-        total_population = filtered_df.get('target_popl', pd.Series([0])).sum()
-        st.metric(
-            label="👥 대상인구 합계",
-            value=f"{total_population:,.0f}명"
-        )
-    
+        search = st.text_input("🔎 지역 검색", key="table_search", placeholder="지역명 일부")
     with col2:
-        avg_rate = filtered_df.get('accpt_rt', pd.Series([0])).mean()
-        st.metric(
-            label="📊 평균 수용률",
-            value=f"{avg_rate:.1f}%"
+        sort = st.selectbox(
+            "↕️ 정렬 기준",
+            options=[None] + list(sortable),
+            format_func=lambda col: "기본 순서" if col is None else sortable[col],
+            key="table_sort"
         )
-    
     with col3:
-        total_facilities = filtered_df.get('pub_shelts_shelts', pd.Series([0])).sum()
-        st.metric(
-            label="🏢 총 시설 수",
-            value=f"{total_facilities:,.0f}개소"
-        )
-    
+        descending = st.toggle("내림차순", value=False, key="table_descending")
     with col4:
-        total_area = filtered_df.get('pub_shelts_area', pd.Series([0])).sum()
-        st.metric(
-            label="📐 총 시설 면적",
-            value=f"{total_area:,.0f}㎡"
-        )
+        page_size = st.selectbox("행/페이지", options=PAGE_SIZES,
+                                 index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key="table_page_size")
+    # 필터/정렬/검색/페이지 크기가 바뀌면 첫 페이지로
+    order_key = filter_key + (sort, descending, search, page_size)
+    if st.session_state.get("table_order_key") != order_key:
+        st.session_state["table_order_key"] = order_key
+        st.session_state["table_page"] = 1
+    return TableQuery(sort, not descending, search, 0, page_size)
+
+def _page_input(pages):
+    """페이지 번호 위젯 (1부터, 페이지 수가 줄면 마지막 페이지로)"""
+    # 기본값은 min_value 로 두고 세션 상태로만 바꿈 (value= 와 함께 쓰면 경고)
+    if st.session_state.get("table_page", 1) > pages:
+        st.session_state["table_page"] = pages
+    page = st.number_input("페이지", min_value=1, max_value=pages, step=1, key="table_page")
+    return int(page) - 1
+
+def render_table(view, dataset, filter_key, view_cache):
+    """상세 데이터 표 (큰 표는 서버에서 정렬/검색하고 보이는 페이지만 전송)"""
+    st.markdown("---")
+    st.subheader("📋 상세 데이터")
+
+    if view.filtered_df.empty:
+        st.warning("표시할 데이터가 없습니다.")
+        return
 
-# 필터링된 지역 통계
-st.markdown("---")
-st.markdown("### 📊 선택 지역 통계")
-col1, col2, col3, col4 = st.columns(4)
+    if len(view.filtered_df) <= FULL_TABLE_ROWS:
+        with metrics.span('render.table') as span:
+            frame = view.display_df
+            st.dataframe(frame, use_container_width=True)
+            span.set(rows=len(frame))
+    else:
+        query = _table_query(view, filter_key)
+        with metrics.span('render.table', mode='page') as span:
+            # 정렬/검색 결과는 페이지를 넘겨도 재사용
+            positions = view_cache.get_or_compute(
+                ('table',) + filter_key + query.order_key(),
+                lambda: ordered_positions(dataset.engine, view.positions, query),
+            )
+            query = replace(query, page=_page_input(page_count(len(positions), query.page_size)))
+            page = table_page(dataset.df, positions, query)
+            frame = page.frame
+            st.dataframe(frame, use_container_width=True)
+            span.set(rows=len(frame), total=page.total_rows)
+        shown = f"{page.start + 1:,}–{page.start + len(frame):,}" if len(frame) else "0"
+        st.caption(f"전체 {page.total_rows:,}행 중 {shown}행 (페이지 {page.page + 1:,}/{page.pages:,})")
+    if metrics.enabled():
+        metrics.gauge('dataframe_payload_bytes', int(frame.memory_usage(deep=True).sum()))
+
+def render_charts(view, filter_key):
+    """시각화 (선택한 탭의 그림만 생성)"""
+    filtered_df = view.filtered_df
+    if filtered_df.empty or 'accpt_rt' not in filtered_df.columns:
+        return
 
-with col1:
-    st.metric(
-        label="📍 총 지역 수",
-        value=len(filtered_df),
-        delta=f"{len(filtered_df) - len(df)} (필터 적용)" if len(filtered_df) != len(df) else None
+    st.markdown("---")
+    st.subheader("📊 데이터 시각화")
+
+    # 탭 선택
+    tab_names = [name for name, _ in TABS]
+    selected_tab = st.radio(
+        "시각화 탭",
+        options=tab_names,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="visualization_tab"
     )
+    charts = dict(TABS)[selected_tab]
+
+    # 그림은 (연도, 필터 상태, 차트 ID) 별로 재사용
+    figure_cache = get_figure_cache()
+    for col, (title, chart_id) in zip(st.columns(len(charts)), charts):
+        with col:
+            st.markdown(title)
+            fig = figure_cache.get_or_compute(
+                ('figure',) + filter_key + (chart_id,),
+                lambda: build_figure(chart_id, filtered_df),
+            )
+            if fig is not None:
+                st.plotly_chart(fig, use_container_width=True)
+
+def render_statistics(view):
+    """통계 요약"""
+    st.markdown("---")
+    st.subheader("📈 통계 요약")
 
-with col2:
-    total_population = filtered_df.get('target_popl', pd.Series([0])).sum()
-    st.metric(
-        label="👥 대상 인구",
-        value=f"{total_population:,}명"
+    filtered_df = view.filtered_df
+    if not filtered_df.empty and 'accpt_rt' in filtered_df.columns:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("**🏆 수용률 통계**")
+            st.dataframe(view.rate_stats, use_container_width=True)
+
+        with col2:
+            st.markdown("**🏢 시설 통계**")
+            if not view.facility_stats.empty:
+                st.dataframe(view.facility_stats, use_container_width=True)
+
+def cached_year_frames(service_key, years, view_cache):
+    """네트워크 호출 없이 캐시에 있는 연도별 데이터를 차례로 반환"""
+    loader = get_shelter_loader(service_key)
+    for year in years:
+        result = loader.cached(year)
+        if result is None or result.frame.empty:
+            continue
+        yield year_dataset(result, view_cache).df
+
+def update_trend_table(service_key, years, view_cache):
+    """전체 연도를 동시에 불러와 추이 표에 반영 (바뀐 연도만 다시 계산)"""
+    loader = get_shelter_loader(service_key)
+    table = get_trend_table(service_key)
+    for year, result in load_years(loader.load, years).items():
+        if result.frame.empty:
+            continue
+        dataset = year_dataset(result, view_cache)
+        table.update(year, result.content_hash, dataset.df, dataset.total_df)
+    return table
+
+# 단계별 집계 표 컬럼 (롤업 큐브 컬럼 → 표시 이름)
+ROLLUP_COLUMNS = {
+    'target_popl': '대상인구(명)',
+    'accpt_rt': '수용률(%)',
+    'shelters': '대피시설 수(개소)',
+    'pub_shelts_area': '공공용시설 면적(㎡)',
+    'regions': '말단 지역 수',
+}
+
+def render_rollup(dataset):
+    """지역 단계별 집계 (미리 계산한 롤업 큐브만 조회, 원본 행은 다시 읽지 않음)"""
+    st.markdown("---")
+    st.subheader("🧭 지역 단계별 집계")
+
+    rollup = dataset.rollup
+    if rollup is None:
+        st.info("지역 정보가 없어 단계별 집계를 만들 수 없습니다.")
+        return
+
+    st.sidebar.markdown("**🧭 단계별 집계 위치**")
+    sido = st.sidebar.selectbox(
+        "시도",
+        options=[NATION_NAME] + rollup.children(NATION)['name'].tolist(),
+        key="rollup_sido"
     )
+    key = NATION if sido == NATION_NAME else (sido,)
+    if key and rollup.has_children(key):
+        sigungu = st.sidebar.selectbox(
+            "시군구",
+            options=[ALL_REGIONS] + rollup.children(key)['name'].tolist(),
+            # 시도마다 따로 두어 이전 시도의 선택이 남지 않게
+            key=f"rollup_sigungu_{sido}"
+        )
+        if sigungu != ALL_REGIONS:
+            key = key + (sigungu,)
 
-with col3:
-    avg_rate = filtered_df.get('accpt_rt', pd.Series([0])).mean()
-    st.metric(
-        label="📊 평균 수용률",
-        value=f"{avg_rate:.1f}%"
+    node = rollup.node(key)
+    st.caption(" › ".join((NATION_NAME,) + key) + f" ({LEVEL_LABELS[node['level']]})")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("👥 대상인구", f"{node.get('target_popl', 0):,.0f}명")
+    with col2:
+        rate = node.get('accpt_rt')
+        st.metric("📊 수용률", f"{rate:.1f}%" if pd.notna(rate) else "-",
+                  help="대피가능인구 합계 ÷ 대상인구 합계 (인구 가중)")
+    with col3:
+        st.metric("🏢 대피시설 수", f"{node.get('shelters', 0):,.0f}개소",
+                  help="정부지원시설 + 공공용시설")
+    with col4:
+        st.metric("📍 말단 지역 수", f"{node['regions']:,}")
+
+    children = rollup.children(key)
+    if children.empty:
+        st.info("하위 지역이 없습니다.")
+        return
+    columns = {col: label for col, label in ROLLUP_COLUMNS.items() if col in children.columns}
+    table = children[['name'] + list(columns)].rename(
+        columns={'name': LEVEL_LABELS[children['level'].iloc[0]], **columns}
+    )
+    st.dataframe(table.round(1), hide_index=True, use_container_width=True)
+
+# 시나리오 히트맵 축 (추가 시설 수, 대상인구 증감률)
+SCENARIO_ADDED = np.arange(0, 201, 5)
+SCENARIO_GROWTH = np.linspace(-0.10, 0.30, 41)
+SCENARIO_COLUMNS = {
+    'regi': '지역',
+    'current_rate': '현재 수용률(%)',
+    'scenario_rate': '시나리오 수용률(%)',
+    'projected_p5': '전망 하위 5%(%)',
+    'projected_p50': '전망 중앙값(%)',
+    'projected_p95': '전망 상위 5%(%)',
+    'shortfall_pct': '목표 미달 확률(%)',
+    'shelters_needed': '목표까지 필요 시설(개소)',
+}
+
+def _scenario_outcome(base, added, growth, target, years, growth_mean, growth_std, draws):
+    """선택한 시나리오의 전체/지역별 결과 (표본 배열은 보관하지 않고 요약만 반환)"""
+    # 시드를 고정해 재실행마다 전망 값이 흔들리지 않게
+    samples, national_samples = monte_carlo(
+        base, added, years, growth_mean, growth_std, draws, seed=0
     )
+    return {
+        'current': national_grid(base, [0], [0])[0, 0],
+        'chosen': national_grid(base, [added], [growth])[0, 0],
+        'projected': np.nanpercentile(national_samples, [5, 50, 95]),
+        'shortfall': (national_samples < target).mean(),
+        'draws': len(samples),
+        'table': scenario_table(base, added, growth, samples, target),
+    }
+
+def render_scenarios(view, filter_key, view_cache):
+    """수용률 what-if 시나리오 (선택 지역 기준, 모든 조합을 배열 연산으로 계산)"""
+    st.markdown("---")
+    st.subheader("🧮 수용률 시나리오")
 
-with col4:
-    total_facilities = filtered_df.get('pub_shelts_shelts', pd.Series([0])).sum()
-    st.metric(
-        label="🏢 총 시설 수",
-        value=f"{total_facilities:,}개소"
+    base = view_cache.get_or_compute(
+        ('scenario_base',) + filter_key,
+        lambda: scenario_base(view.filtered_df),
     )
+    if base is None:
+        st.info("시나리오에 필요한 컬럼(대상인구, 대피가능인구, 공공용시설 수/면적)이 없습니다.")
+        return
 
-# 데이터 테이블
-st.markdown("---")
-st.subheader("📋 상세 데이터")
-
-if not filtered_df.empty:
-    # 컬럼명 한글화
-    column_mapping = {
-        'bas_yy': '기준년도',
-        'regi': '지역',
-        'target_popl': '대상인구(명)',
-        'accpt_rt': '수용률(%)',
-        'shelt_abl_popl_smry': '대피가능인구 계(명)',
-        'shelt_abl_popl_gov_shelts': '정부지원시설 대피가능인구(명)',
-        'shelt_abl_popl_pub_shelts': '공공용시설 대피가능인구(명)',
-        'gov_shelts_shelts': '정부지원시설 수(개소)',
-        'gov_shelts_area': '정부지원시설 면적(㎡)',
-        'pub_shelts_shelts': '공공용시설 수(개소)',
-        'pub_shelts_area': '공공용시설 면적(㎡)'
-    }
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        added = st.slider("➕ 지역별 공공용시설 추가(개소)", 0, int(SCENARIO_ADDED[-1]), 0,
+                          help="지역마다 해당 지역 평균 면적의 공공용시설을 더합니다.",
+                          key="scenario_added")
+    with col2:
+        growth = st.slider("👥 대상인구 증감률(%)", -10.0, 30.0, 0.0, 0.5,
+                           key="scenario_growth") / 100
+    with col3:
+        target = st.number_input("🎯 목표 수용률(%)", 0.0, 500.0, 100.0, 10.0,
+                                 key="scenario_target")
+    with st.expander("🎲 몬테카를로 인구 전망 설정"):
+        col1, col2, col3, col4 = st.columns(4)
+        years = col1.slider("기간(년)", 1, 20, 5, key="scenario_years")
+        growth_mean = col2.number_input("연평균 증가율(%)", -5.0, 5.0, 0.0, 0.1,
+                                        key="scenario_growth_mean") / 100
+        growth_std = col3.number_input("증가율 표준편차(%p)", 0.0, 5.0, 1.0, 0.1,
+                                       key="scenario_growth_std") / 100
+        draws = col4.select_slider("표본 수", options=[1_000, 5_000, 10_000, 50_000],
+                                   value=10_000, key="scenario_draws")
+
+    # 필터 상태와 시나리오 설정이 같으면 재실행 때 다시 계산하지 않음
+    params = (added, growth, target, years, growth_mean, growth_std, draws)
+    with metrics.span('scenario') as span:
+        national = view_cache.get_or_compute(
+            ('scenario_grid',) + filter_key,
+            lambda: national_grid(base, SCENARIO_ADDED, SCENARIO_GROWTH),
+        )
+        outcome = view_cache.get_or_compute(
+            ('scenario',) + filter_key + params,
+            lambda: _scenario_outcome(base, *params),
+        )
+        span.set(regions=len(base.regions), draws=outcome['draws'])
 
-    display_df = filtered_df.copy()
-    
-    # 존재하는 컬럼만 매핑
-    existing_columns = {k: v for k, v in column_mapping.items() if k in display_df.columns}
-    display_df = display_df.rename(columns=existing_columns)
-
-    # 숫자 포맷팅
-    numeric_cols = ['대상인구(명)', '수용률(%)', '대피가능인구 계(명)', 
-                    '정부지원시설 대피가능인구(명)', '공공용시설 대피가능인구(명)',
-                    '정부지원시설 수(개소)', '정부지원시설 면적(㎡)',
-                    '공공용시설 수(개소)', '공공용시설 면적(㎡)']
-
-    for col in numeric_cols:
-        if col in display_df.columns:
-            if col == '수용률(%)':
-                display_df[col] = display_df[col].round(1)
-            else:
-                display_df[col] = display_df[col].astype(int)
+    current, chosen = outcome['current'], outcome['chosen']
+    low, mid, high = outcome['projected']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📊 현재 수용률", f"{current:.1f}%", help="선택 지역 전체 (인구 가중)")
+    with col2:
+        st.metric("🧮 시나리오 수용률", f"{chosen:.1f}%", delta=f"{chosen - current:+.1f}%p")
+    with col3:
+        st.metric(f"🎲 {years}년 뒤 전망 (중앙값)", f"{mid:.1f}%",
+                  help=f"5%~95% 구간: {low:.1f}% ~ {high:.1f}% ({outcome['draws']:,}개 표본)")
+    with col4:
+        st.metric("⚠️ 목표 미달 확률", f"{outcome['shortfall'] * 100:.1f}%")
 
-    st.dataframe(display_df, use_container_width=True)
-else:
-    st.warning("표시할 데이터가 없습니다.")
+    st.plotly_chart(
+        scenario_heatmap(national, SCENARIO_ADDED, SCENARIO_GROWTH, target, (added, growth)),
+        use_container_width=True
+    )
+    st.dataframe(
+        outcome['table'].rename(columns=SCENARIO_COLUMNS).round(1),
+        hide_index=True,
+        use_container_width=True
+    )
 
-# 시각화
-if not filtered_df.empty and 'accpt_rt' in filtered_df.columns:
+def render_trends(table, selected_region):
+    """연도별 추이 (미리 계산한 추이 표로 그림/순위 생성)"""
     st.markdown("---")
-    st.subheader("📊 데이터 시각화")
-
-    # 탭 생성
-    tab1, tab2, tab3, tab4 = st.tabs(["🏆 수용률 분석", "👥 인구 현황", "🏢 시설 현황", "📈 종합 분석"])
+    st.subheader("📈 연도별 추이")
+
+    if len(table.versions) < 2:
+        st.info("추이를 보려면 2개 연도 이상의 데이터가 필요합니다.")
+        return
+
+    metric = st.radio(
+        "추이 지표",
+        options=list(TREND_METRICS),
+        format_func=lambda col: TREND_METRICS[col][0],
+        horizontal=True,
+        key="trend_metric"
+    )
+    regions = [TOTAL_REGION] if selected_region == ALL_REGIONS else [TOTAL_REGION, selected_region]
+    trend_version = tuple(sorted(table.versions.items()))
+    latest = table.latest()
+    latest = latest[latest['regi'] != TOTAL_REGION]
 
-    with tab1:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**🔝 수용률 상위 10개 지역**")
-            if len(filtered_df) > 0:
-                top10 = filtered_df.nlargest(min(10, len(filtered_df)), 'accpt_rt')
-                if 'regi' in top10.columns:
-                    fig = px.bar(
-                        top10, 
-                        x='accpt_rt', 
-                        y='regi',
-                        orientation='h',
-                        title="수용률 상위 지역",
-                        labels={'accpt_rt': '수용률(%)', 'regi': '지역'},
-                        color='accpt_rt',
-                        color_continuous_scale='Greens',
-                        text='accpt_rt'
-                    )
-                    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("**📊 수용률 분포**")
-            fig = px.histogram(
-                filtered_df,
-                x='accpt_rt',
-                nbins=20,
-                title="수용률 분포",
-                labels={'accpt_rt': '수용률(%)', 'count': '지역 수'},
-                color_discrete_sequence=['skyblue']
-            )
-            fig.add_vline(x=100, line_dash="dash", line_color="red", 
-                         annotation_text="100% 기준선")
+    figure_cache = get_figure_cache()
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = figure_cache.get_or_compute(
+            ('trend_line', trend_version, metric, selected_region),
+            lambda: trend_line(table.frame, metric, regions),
+        )
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        fig = figure_cache.get_or_compute(
+            ('trend_growth', trend_version, metric),
+            lambda: trend_growth(latest, metric),
+        )
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
 
-    with tab2:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**👥 대상인구 vs 대피가능인구**")
-            if 'target_popl' in filtered_df.columns and 'shelt_abl_popl_smry' in filtered_df.columns:
-                hover_name = 'regi' if 'regi' in filtered_df.columns else None
-                size_col = 'pub_shelts_shelts' if 'pub_shelts_shelts' in filtered_df.columns else None
-                
-                fig = px.scatter(
-                    filtered_df,
-                    x='target_popl',
-                    y='shelt_abl_popl_smry',
-                    hover_name=hover_name,
-                    size=size_col,
-                    title="대상인구 vs 대피가능인구",
-                    labels={
-                        'target_popl': '대상인구(명)',
-                        'shelt_abl_popl_smry': '대피가능인구(명)',
-                        'pub_shelts_shelts': '시설 수'
-                    }
-                )
-                # 100% 수용률 기준선
-                max_val = max(filtered_df['target_popl'].max(), filtered_df['shelt_abl_popl_smry'].max())
-                fig.add_shape(
-                    type="line",
-                    x0=0, y0=0, x1=max_val, y1=max_val,
-                    line=dict(color="red", width=2, dash="dash"),
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("**📊 지역별 대상인구 순위**")
-            if 'target_popl' in filtered_df.columns and 'regi' in filtered_df.columns:
-                top_pop = filtered_df.nlargest(10, 'target_popl')
-                fig = px.bar(
-                    top_pop,
-                    x='target_popl',
-                    y='regi',
-                    orientation='h',
-                    title="대상인구 상위 10개 지역",
-                    labels={'target_popl': '대상인구(명)', 'regi': '지역'},
-                    color='target_popl',
-                    color_continuous_scale='Blues'
-                )
-                st.plotly_chart(fig, use_container_width=True)
+    name, unit = TREND_METRICS[metric]
+    ranking = latest.sort_values(f'{metric}_yoy', ascending=False)[
+        ['regi', metric, f'{metric}_yoy', f'{metric}_yoy_pct', f'{metric}_cagr']
+    ]
+    ranking.columns = ['지역', f'{name}({unit})', '전년 대비', '전년 대비(%)', '연평균 증감률(%)']
+    st.markdown(f"**🏅 {max(table.versions)}년 전년 대비 {name} 변화 순위**")
+    st.dataframe(ranking.round(2), hide_index=True, use_container_width=True)
+
+def _store_map_view():
+    """지도 이동/확대/클릭 시 화면 범위와 클릭 위치 저장"""
+    state = st.session_state.get('shelter_map') or {}
+    bounds = parse_bounds(state.get('bounds'))
+    if bounds is not None and state.get('zoom') is not None:
+        st.session_state['map_view'] = (state['zoom'], tuple(round(v, 4) for v in bounds))
+    st.session_state['map_clicked'] = state.get('last_clicked')
+
+def render_map(dataset, data_version):
+    """대피시설 지도 (화면 범위 안의 클러스터만 전송)"""
+    from streamlit_folium import st_folium
 
-    with tab3:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**🏢 시설 수 vs 면적 관계**")
-            if 'pub_shelts_shelts' in filtered_df.columns and 'pub_shelts_area' in filtered_df.columns:
-                hover_name = 'regi' if 'regi' in filtered_df.columns else None
-                
-                fig = px.scatter(
-                    filtered_df,
-                    x='pub_shelts_shelts',
-                    y='pub_shelts_area',
-                    hover_name=hover_name,
-                    color='accpt_rt',
-                    title="공공용시설 수 vs 면적",
-                    labels={
-                        'pub_shelts_shelts': '시설 수(개소)',
-                        'pub_shelts_area': '면적(㎡)',
-                        'accpt_rt': '수용률(%)'
-                    }
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("**📐 시설당 평균 면적**")
-            if 'pub_shelts_shelts' in filtered_df.columns and 'pub_shelts_area' in filtered_df.columns and 'regi' in filtered_df.columns:
-                filtered_df_calc = filtered_df[filtered_df['pub_shelts_shelts'] > 0].copy()
-                if not filtered_df_calc.empty:
-                    filtered_df_calc['avg_area'] = filtered_df_calc['pub_shelts_area'] / filtered_df_calc['pub_shelts_shelts']
-                    top_avg = filtered_df_calc.nlargest(10, 'avg_area')
-                    
-                    fig = px.bar(
-                        top_avg,
-                        x='avg_area',
-                        y='regi',
-                        orientation='h',
-                        title="시설당 평균 면적 상위 10개 지역",
-                        labels={'avg_area': '시설당 평균 면적(㎡)', 'regi': '지역'},
-                        color='avg_area',
-                        color_continuous_scale='Oranges'
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-
-    with tab4:
-        st.markdown("**📈 종합 분석**")
-        if 'regi' in filtered_df.columns:
-            # 지역별 히트맵
-            heatmap_data = filtered_df.copy().sort_values('accpt_rt', ascending=True)
-            
-            fig = px.bar(
-                heatmap_data,
-                x='accpt_rt',
-                y='regi',
-                orientation='h',
-                title="지역별 수용률 현황",
-                labels={'accpt_rt': '수용률(%)', 'regi': '지역'},
-                color='accpt_rt',
-                color_continuous_scale='RdYlGn'
-            )
-            fig.update_layout(height=max(400, len(filtered_df) * 25))
-            st.plotly_chart(fig, use_container_width=True)
+    st.markdown("---")
+    st.subheader("🗺️ 대피시설 지도")
 
-# 통계 요약
-st.markdown("---")
-st.subheader("📈 통계 요약")
+    try:
+        facilities = get_facilities()
+    except (OSError, ValueError) as e:
+        st.warning(f"⚠️ 시설 데이터를 불러올 수 없습니다. ({e})")
+        return
+
+    sample = facility_source()[1]
+    if sample:
+        st.warning("⚠️ 가상 표본 데이터입니다. 지도의 시설 이름/주소/위치는 실제 대피시설이 아닙니다.")
+
+    zoom, bounds = st.session_state.get('map_view', (DEFAULT_ZOOM, KOREA_BOUNDS))
+    clusters = get_cluster_pyramid().viewport(zoom, bounds)
+
+    # 배경 지도 입력(수용률, 경계, 중심점)은 재사용하고 Map 은 매번 새로 만듦
+    # (st_folium 이 클러스터 레이어를 Map 에 직접 붙이므로 캐시한 Map 을 넘기면
+    # 이전 화면의 클러스터가 쌓이고 다른 세션과도 같은 객체를 바꾸게 됨)
+    df = dataset.df
+    rates = get_figure_cache().get_or_compute(
+        ('map_rates',) + data_version,
+        lambda: dict(zip(df['regi'].astype(str), df['accpt_rt'].astype('float64').round(1))),
+    )
+    fmap = base_map(rates, boundaries=get_boundaries(), centers=get_region_centers())
+    st.caption(f"전체 {len(facilities):,}개소 중 화면 안 {int(clusters['count'].sum()):,}개소 "
+               f"({len(clusters):,}개 마커) · 지도를 클릭하면 가까운 대피시설을 찾습니다.")
+    st_folium(
+        fmap,
+        key='shelter_map',
+        height=520,
+        use_container_width=True,
+        feature_group_to_add=cluster_layer(clusters),
+        returned_objects=['bounds', 'zoom', 'last_clicked'],
+        on_change=_store_map_view,
+    )
 
-if not filtered_df.empty and 'accpt_rt' in filtered_df.columns:
-    col1, col2 = st.columns(2)
+    clicked = st.session_state.get('map_clicked')
+    if clicked:
+        nearest = facilities.nearest(clicked['lat'], clicked['lng'], k=5)
+        nearest = nearest[['name', 'regi', 'address', 'capacity', 'distance_km']]
+        nearest.columns = ['시설명', '시도', '주소', '최대수용인원', '거리(km)']
+        label = "가까운 가상 표본 시설 (실제 대피시설 아님)" if sample else "가까운 대피시설"
+        st.markdown(f"**📍 클릭 위치({clicked['lat']:.4f}, {clicked['lng']:.4f})에서 {label}**")
+        st.dataframe(nearest.round(2), hide_index=True, use_container_width=True)
+
+def render_downloads(view, selected_year, filter_key, view_cache):
+    """데이터 다운로드 (요청할 때만 파일 생성)"""
+    st.markdown("---")
+    st.subheader("💾 데이터 다운로드")
 
-    with col1:
-        st.markdown("**🏆 수용률 통계**")
-        stats_df = pd.DataFrame({
-            '통계': ['평균', '중앙값', '최댓값', '최솟값', '표준편차'],
-            '수용률(%)': [
-                filtered_df['accpt_rt'].mean(),
-                filtered_df['accpt_rt'].median(),
-                filtered_df['accpt_rt'].max(),
-                filtered_df['accpt_rt'].min(),
-                filtered_df['accpt_rt'].std()
-            ]
-        })
-        stats_df['수용률(%)'] = stats_df['수용률(%)'].round(2)
-        st.dataframe(stats_df, use_container_width=True)
+    export_scopes = {
+        'selected': f"{selected_year}년 (필터 적용)",
+        'all_years': "전체 연도 (캐시된 데이터)",
+    }
 
-    with col2:
-        st.markdown("**🏢 시설 통계**")
-        if 'pub_shelts_shelts' in filtered_df.columns:
-            facility_stats = pd.DataFrame({
-                '통계': ['총 시설 수', '평균 시설 수', '최대 시설 수', '최소 시설 수'],
-                '값': [
-                    filtered_df['pub_shelts_shelts'].sum(),
-                    filtered_df['pub_shelts_shelts'].mean(),
-                    filtered_df['pub_shelts_shelts'].max(),
-                    filtered_df['pub_shelts_shelts'].min()
-                ]
-            })
-            facility_stats['값'] = facility_stats['값'].round(0).astype(int)
-            st.dataframe(facility_stats, use_container_width=True)
-
-# 데이터 다운로드
-st.markdown("---")
-st.subheader("💾 데이터 다운로드")
-
-if not filtered_df.empty:
     col1, col2 = st.columns(2)
-
     with col1:
-        # CSV 다운로드
-        if 'display_df' in locals():
-            csv = display_df.to_csv(index=False, encoding='utf-8-sig')
-            st.download_button(
-                label="📁 CSV 파일 다운로드",
-                data=csv,
-                file_name=f"주민대피시설현황_{selected_year}년.csv",
-                mime="text/csv",
-                help="필터링된 데이터를 CSV 파일로 다운로드합니다."
-            )
-
+        export_format = st.selectbox(
+            "📄 파일 형식",
+            options=list(EXPORT_FORMATS),
+            format_func=lambda fmt: EXPORT_FORMATS[fmt].label,
+        )
     with col2:
-        # JSON 다운로드
-        json_data = filtered_df.to_json(orient='records', force_ascii=False, indent=2)
+        export_scope = st.radio(
+            "📅 범위",
+            options=list(export_scopes),
+            format_func=export_scopes.get,
+            horizontal=True,
+        )
+
+    # 같은 조건으로 만든 파일은 다시 만들지 않음
+    export_key = filter_key + (export_format, export_scope)
+    if export_scope == 'selected' and view.filtered_df.empty:
+        st.warning("내보낼 데이터가 없습니다.")
+    elif st.button("📦 다운로드 파일 생성", help="선택한 형식과 범위로 파일을 만듭니다."):
+        with st.spinner("파일을 생성하는 중..."):
+            if export_scope == 'selected':
+                frames = [view.filtered_df]
+                file_label = f"{selected_year}년"
+            else:
+                frames = cached_year_frames(SERVICE_KEY, sorted(YEARS), view_cache)
+                file_label = f"{min(YEARS)}-{max(YEARS)}년"
+            st.session_state['export'] = (export_key, file_label, export_bytes(frames, export_format))
+
+    prepared = st.session_state.get('export')
+    if prepared is not None and prepared[0] == export_key:
+        _, file_label, export_data = prepared
+        fmt = EXPORT_FORMATS[export_format]
         st.download_button(
-            label="📄 JSON 파일 다운로드",
-            data=json_data,
-            file_name=f"주민대피시설현황_{selected_year}년.json",
-            mime="application/json",
-            help="필터링된 데이터를 JSON 파일로 다운로드합니다."
+            label=f"{fmt.label} 파일 다운로드",
+            data=export_data,
+            file_name=f"주민대피시설현황_{file_label}.{fmt.extension}",
+            mime=fmt.mime,
+            help="생성한 파일을 다운로드합니다."
         )
 
-# 푸터
-st.markdown("---")
-st.markdown(
-    f"""
-    <div style='text-align: center; color: #666; font-size: 12px;'>
-        📊 <strong>행정안전부 주민대피시설 현황 대시보드</strong><br>
-        🔄 데이터 기준: {selected_year}년 | 📅 대시보드 생성: {datetime.now().strftime('%Y년 %m월 %d일')}<br>
-        📞 문의: 행정안전부 정보통계담당관 (044-205-1644)<br>
-        🌐 데이터 출처: <a href="https://data.go.kr" target="_blank">공공데이터포털 (data.go.kr)</a>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+def render_footer(selected_year):
+    """푸터"""
+    st.markdown("---")
+    st.markdown(
+        f"""
+        <div style='text-align: center; color: #666; font-size: 12px;'>
+            📊 <strong>행정안전부 주민대피시설 현황 대시보드</strong><br>
+            🔄 데이터 기준: {selected_year}년 | 📅 대시보드 생성: {datetime.now().strftime('%Y년 %m월 %d일')}<br>
+            📞 문의: 행정안전부 정보통계담당관 (044-205-1644)<br>
+            🌐 데이터 출처: <a href="https://data.go.kr" target="_blank">공공데이터포털 (data.go.kr)</a>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def render_performance_panel():
+    """사이드바 성능 패널 (켠 세션의 재실행만 계측)"""
+    show = st.sidebar.checkbox(
+        "🛠️ 성능 패널",
+        key="performance_panel",
+        help="구간별 소요 시간과 캐시 적중률을 표시합니다. 켜 둔 동안 이 세션의 재실행"
+             "(그 재실행이 띄운 페이지 병렬 호출과 백그라운드 재검증 포함)을 계측하며, "
+             "표는 이 서버 프로세스에서 계측한 값을 모두 합친 것입니다. "
+             "주기적 백그라운드 갱신(스케줄러)은 SHELTER_METRICS=1 일 때만 기록됩니다."
+    )
+    if not show:
+        return
+
+    with st.sidebar.expander("🛠️ 성능 패널", expanded=True):
+        recent = list(metrics.REGISTRY.recent)
+        rerun = [record for record in recent if record['span'] == 'rerun']
+        if rerun:
+            st.metric("마지막 재실행", f"{rerun[-1]['seconds'] * 1000:,.0f} ms")
+
+        summary_df = pd.DataFrame(metrics.summary())
+        if not summary_df.empty:
+            for col in ['mean', 'p50', 'p95', 'max', 'last']:
+                summary_df[col] = (summary_df[col] * 1000).round(1)
+            summary_df.columns = ['구간', '횟수', '평균(ms)', 'p50(ms)', 'p95(ms)', '최대(ms)', '마지막(ms)']
+            st.dataframe(summary_df, hide_index=True, use_container_width=True)
+
+        counters = [
+            {'이름': name, '라벨': ', '.join(f"{k}={v}" for k, v in labels), '값': value}
+            for (name, labels), value in sorted(metrics.REGISTRY.counters.items())
+        ]
+        if counters:
+            st.markdown("**캐시/로더 카운터**")
+            st.dataframe(pd.DataFrame(counters), hide_index=True, use_container_width=True)
+
+        payload = metrics.REGISTRY.values.get(('dataframe_payload_bytes', ()))
+        if payload is not None:
+            st.caption(f"상세 데이터 표 크기: {payload / 1024:,.1f} KiB")
+
+        st.download_button(
+            "📥 Prometheus 텍스트",
+            data=metrics.to_prometheus(),
+            file_name="shelter_metrics.prom",
+            mime="text/plain",
+        )
+        metrics_url = get_metrics_server()
+        if metrics_url:
+            st.caption(f"엔드포인트: {metrics_url}")
+
+def render_dashboard():
+    """대시보드 본문 (데이터 로드부터 다운로드까지)"""
+    # 제목 및 설명
+    st.title("🏢 주민대피시설 현황 대시보드")
+    st.markdown("---")
+    st.markdown("**행정안전부 통계연보 - 지역별 주민대피시설 현황을 시각화한 대시보드입니다.**")
+
+    # 사이드바 설정
+    st.sidebar.header("🔍 데이터 설정")
+
+    scheduler = get_refresh_scheduler(SERVICE_KEY, tuple(YEARS))
+    selected_year = st.sidebar.selectbox(
+        "📅 기준연도 선택",
+        options=YEARS,
+        index=0,  # 기본값: 2025
+        help="분석할 연도를 선택하세요."
+    )
+
+    # 데이터 로드
+    view_cache = get_view_cache()
+    with metrics.span('load'):
+        dataset, data_version = load_selected_dataset(selected_year, view_cache)
+
+    render_refresh_status(scheduler)
+    show_trends = st.sidebar.checkbox(
+        "📈 연도별 추이 보기",
+        value=False,
+        help="전체 연도 데이터를 불러와 연도별 추이를 함께 표시합니다."
+    )
+    # 시설 위치 데이터(SHELTER_FACILITY_PATH)가 없으면 지도 메뉴를 숨김
+    show_map = facility_source()[0] is not None and st.sidebar.checkbox(
+        "🗺️ 대피시설 지도 보기",
+        value=False,
+        help="시설 위치를 지도에 표시합니다. 확대할수록 세부 시설이 나타납니다."
+    )
+    show_rollup = st.sidebar.checkbox(
+        "🧭 지역 단계별 집계 보기",
+        value=False,
+        help="전국 → 시도 → 시군구 단계별 합계와 수용률을 표시합니다."
+    )
+    show_scenarios = st.sidebar.checkbox(
+        "🧮 수용률 시나리오 보기",
+        value=False,
+        help="시설 추가와 인구 변화에 따른 수용률을 계산합니다."
+    )
+    selected_region, rate_range = render_filters(dataset)
+
+    # 데이터 필터링 (연도/필터 상태별 결과 재사용)
+    filter_key = data_version + (selected_region, rate_range)
+    view = view_cache.get_or_compute(
+        ('view',) + filter_key,
+        lambda: build_view(dataset, selected_region, rate_range),
+    )
+
+    render_kpis(view)
+    render_table(view, dataset, filter_key, view_cache)
+    render_charts(view, filter_key)
+    render_statistics(view)
+    if show_trends:
+        with st.spinner("📡 전체 연도 데이터를 불러오는 중..."):
+            trend_table = update_trend_table(SERVICE_KEY, YEARS, view_cache)
+        render_trends(trend_table, selected_region)
+    if show_map:
+        render_map(dataset, data_version)
+    if show_rollup:
+        render_rollup(dataset)
+    if show_scenarios:
+        render_scenarios(view, filter_key, view_cache)
+    render_downloads(view, selected_year, filter_key, view_cache)
+    render_footer(selected_year)
+
+def main():
+    # 페이지 설정
+    st.set_page_config(
+        page_title="주민대피시설 현황 대시보드",
+        page_icon="🏢",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # 성능 패널을 켠 세션은 이번 재실행만 계측 (다른 세션과 백그라운드 스레드는
+    # SHELTER_METRICS / SHELTER_METRICS_PORT 설정을 따름)
+    get_metrics_server()
+    with metrics.scoped(st.session_state.get("performance_panel", False)):
+        with metrics.span('rerun'):
+            render_dashboard()
+        render_performance_panel()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""차트 그림 데이터(JSON) 크기 점검: 행 수와 무관하게 예산 이내인지 확인
+
+    python -m benchmarks.chart_payload            # 17 ~ 100,000 행
+    python -m benchmarks.chart_payload --rows 100000
+
+예산을 넘는 그림이 있으면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import sys
+import time
+
+import plotly.io as pio
+
+from shelter.charts import CHARTS, build_figure
+from shelter.views import prepare_dataset
+from tools.synthetic import synthetic_rows
+
+ROW_COUNTS = [17, 1_000, 10_000, 100_000]
+# 그림 하나당 JSON 크기 예산
+PAYLOAD_BUDGET = 256 * 1024
+
+
+def measure(rows):
+    """차트별 (생성 시간 초, JSON 바이트 수, trace 종류)"""
+    df = prepare_dataset(synthetic_rows(rows)).df
+    results = {}
+    for chart_id in CHARTS:
+        start = time.perf_counter()
+        fig = build_figure(chart_id, df)
+        elapsed = time.perf_counter() - start
+        if fig is None:
+            continue
+        payload = len(pio.to_json(fig, validate=False).encode('utf-8'))
+        results[chart_id] = (elapsed, payload, ','.join(sorted({t.type for t in fig.data})))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="차트 그림 데이터 크기 점검")
+    parser.add_argument('--rows', type=int, nargs='*', default=ROW_COUNTS)
+    parser.add_argument('--budget', type=int, default=PAYLOAD_BUDGET, help="그림당 최대 바이트")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'rows':>8} {'chart':<20} {'build(ms)':>10} {'payload(KiB)':>13}  trace")
+    for rows in args.rows:
+        for chart_id, (elapsed, payload, traces) in measure(rows).items():
+            flag = '' if payload <= args.budget else '  ← 예산 초과'
+            print(f"{rows:>8} {chart_id:<20} {elapsed * 1000:>10.1f} "
+                  f"{payload / 1024:>13.1f}  {traces}{flag}")
+            if payload > args.budget:
+                over_budget.append((rows, chart_id, payload))
+
+    if over_budget:
+        print(f"\n예산({args.budget / 1024:.0f} KiB) 초과: {len(over_budget)}개 그림")
+        sys.exit(1)
+    print(f"\n모든 그림이 예산({args.budget / 1024:.0f} KiB) 이내입니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""콜드 스타트(새 프로세스에서의 import 시간) 측정
+
+    python -m benchmarks.cold_start
+
+각 항목을 새 파이썬 프로세스에서 REPEAT 번 import 해 최소 시간을 비교합니다.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+REPEAT = 5
+
+CASES = {
+    # 분리 이전 app.py 가 시작 시 불러오던 모듈
+    'legacy app imports': [
+        'streamlit', 'pandas', 'requests', 'json', 'plotly.express',
+        'plotly.graph_objects', 'plotly.subplots', 'urllib3', 'numpy',
+    ],
+    'app.py': ['app'],
+    'shelter.core (headless)': ['shelter.core'],
+    'plotly.express (첫 차트)': ['plotly.express'],
+}
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+{imports}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(modules):
+    """새 프로세스에서 modules 를 import 하는 데 걸린 최소 시간(초)"""
+    code = SNIPPET.format(imports='\n'.join(f'import {m}' for m in modules))
+    best = float('inf')
+    for _ in range(REPEAT):
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        best = min(best, float(output.strip().splitlines()[-1]))
+    return best
+
+
+def main():
+    print(f"{'case':<28} {'import(ms)':>10}")
+    for name, modules in CASES.items():
+        print(f"{name:<28} {import_time(modules) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
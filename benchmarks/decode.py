@@ -0,0 +1,85 @@
+"""응답 디코딩 벤치마크: 레코드 목록 경로 vs 페이지별 컬럼 배열 경로
+
+    python -m benchmarks.decode
+    python -m benchmarks.decode --rows 200000 --page-size 1000
+
+두 경로 모두 응답 바이트에서 전처리된 DataFrame까지의 시간과 최대 메모리를 잽니다.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+from shelter.api import RESPONSE_KEY, decode_page, merge_pages, orjson, parse_response
+from shelter.preprocess import preprocess_data
+from tools.synthetic import synthetic_rows
+
+ROW_COUNTS = [10_000, 100_000]
+PAGE_SIZE = 1_000
+
+
+def encode_pages(rows, page_size):
+    """API 응답과 같은 구조의 페이지별 응답 바이트"""
+    pages = []
+    for start in range(0, len(rows), page_size):
+        body = {RESPONSE_KEY: [
+            {"head": [{"totalCount": len(rows)}, {"numOfRows": page_size}]},
+            {"row": rows[start:start + page_size]},
+        ]}
+        pages.append(json.dumps(body, ensure_ascii=False).encode('utf-8'))
+    return pages
+
+
+def legacy_path(pages):
+    """기존 경로: response.json() → 레코드 목록 합치기 → preprocess_data"""
+    rows = []
+    for content in pages:
+        rows.extend(parse_response(json.loads(content))[1])
+    return preprocess_data(rows)
+
+
+def columnar_path(pages):
+    """페이지마다 컬럼 배열로 디코딩 → 합치기 → preprocess_data"""
+    frames = {page_no: decode_page(content)[1] for page_no, content in enumerate(pages, 1)}
+    return preprocess_data(merge_pages(frames))
+
+
+def measure(fn, pages):
+    """(결과, 시간 초, 최대 메모리 바이트) — tracemalloc 부하를 피해 시간과 메모리를 따로 잼"""
+    gc.collect()
+    start = time.perf_counter()
+    result = fn(pages)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    fn(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 디코딩 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='*', default=ROW_COUNTS)
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+
+    print(f"decoder: {'orjson' if orjson is not None else 'json'}")
+    print(f"{'rows':>8} {'path':<10} {'time(ms)':>10} {'peak(MiB)':>10}")
+    for n in args.rows:
+        pages = encode_pages(synthetic_rows(n), args.page_size)
+        results = {}
+        for name, fn in [('legacy', legacy_path), ('columnar', columnar_path)]:
+            results[name], elapsed, peak = measure(fn, pages)
+            print(f"{n:>8} {name:<10} {elapsed * 1000:>10.1f} {peak / 2**20:>10.1f}")
+        # 두 경로의 결과가 같은지 확인 (지역 범주 순서는 무시)
+        for legacy, columnar in zip(results['legacy'], results['columnar']):
+            pd.testing.assert_frame_equal(legacy, columnar, check_categorical=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""동시 세션 부하 테스트: AppTest 세션 N개로 app.py 재실행 지연 측정
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --sessions 1 4 16 --actions 20 --think 0.5
+    python -m benchmarks.load_test --scale 50 --latency 0.2 --output load.json
+
+로컬 목업 API(tools.mock_api)를 띄우고, 세션마다 한 스레드에서 AppTest 로
+app.py 를 실행합니다. 각 세션은 무작위 대기(평균 --think 초, 지수분포) 후
+연도 / 지역 / 수용률 슬라이더 중 하나를 바꿔 재실행합니다. 실제 서버처럼
+모든 세션이 한 프로세스의 캐시(st.cache_resource)를 함께 씁니다.
+
+세션 수마다 재실행 지연 p50/p95/p99, 처리량(재실행/초), 프로세스 메모리
+(VmRSS)와 세션당 증가량을 출력합니다. 첫 세션의 API 조회를 빼고 재려고
+본 측정 전에 세션 하나로 모든 연도를 한 번씩 불러 둡니다.
+
+AppTest 는 한 번에 하나만 실행하는 것을 전제로 전역 상태(Runtime 싱글턴,
+설정값)를 실행마다 바꿨다 되돌리므로, 여러 스레드에서 쓰도록
+allow_concurrent_apptest() 로 먼저 고정해 둡니다.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from tools.mock_api import load_fixture_rows, scale_rows, start_mock_server
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+SESSIONS = [1, 2, 4, 8]
+ACTIONS = 10
+THINK = 0.2
+TIMEOUT = 120
+ACTION_KINDS = ('year', 'region', 'rate')
+# allow_concurrent_apptest() 가 바꾸는 Streamlit 내부 속성을 확인한 버전
+TESTED_STREAMLIT = "1.65"
+
+
+def rss_bytes():
+    """현재 프로세스 메모리 (Linux 는 VmRSS, 그 밖에는 최대 RSS)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def allow_concurrent_apptest():
+    """여러 스레드에서 AppTest 를 동시에 실행할 수 있게 전역 상태를 고정
+
+    AppTest.run() 은 끝날 때 Runtime._instance 를 None 으로, 설정
+    global.appTest 를 원래 값으로 되돌립니다. 다른 세션이 그 사이에 스크립트를
+    시작하면 "Runtime hasn't been created!" 로 빈 화면이 되므로, 마지막으로
+    만든 목업 Runtime 을 계속 쓰고 설정값은 프로세스 전체에 켜 둡니다.
+
+    또 실행마다 새 ScriptCache 로 app.py 를 다시 컴파일하는데, 실제 서버는
+    모든 세션이 컴파일 결과 하나를 함께 씁니다 (여러 스레드가 동시에
+    컴파일하면 Python 3.11 에서 SystemError 도 납니다). 그래서 하나를 공유합니다.
+
+    Streamlit 내부(비공개) 속성에 기대므로 바꿀 대상이 없으면 빈 재실행을
+    측정하지 않도록 RuntimeError 로 멈춥니다 (TESTED_STREAMLIT 에서 확인).
+    """
+    import streamlit
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    try:
+        from streamlit.runtime.runtime import Runtime
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import app_test, local_script_runner
+    except ImportError as e:
+        raise RuntimeError(_unsupported_message(streamlit.__version__, str(e))) from e
+    missing = [
+        name for owner, attrs, prefix in (
+            (Runtime, ('_instance', 'instance', 'exists'), 'Runtime.'),
+            (app_test, ('ScriptCache',), 'app_test.'),
+            (local_script_runner, ('ScriptCache',), 'local_script_runner.'),
+        )
+        for name in (prefix + attr for attr in attrs if not hasattr(owner, attr))
+    ]
+    try:
+        config.get_option('global.appTest')
+    except RuntimeError:
+        missing.append("설정 global.appTest")
+    if missing:
+        raise RuntimeError(_unsupported_message(streamlit.__version__, ', '.join(missing)))
+
+    config.set_option('global.appTest', True)
+    # 세션마다 반복되는 사용 중단 경고로 표가 묻히지 않게
+    set_log_level('error')
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+            return cls._instance
+        if last:
+            return last[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+def _unsupported_message(version, detail):
+    return (f"streamlit {version} 에서 AppTest 동시 실행용 내부 속성을 찾을 수 없습니다 ({detail}). "
+            f"이 부하 테스트는 streamlit {TESTED_STREAMLIT} 에서 확인했습니다.")
+
+
+def _year_box(at):
+    return next(box for box in at.sidebar.selectbox if box.label == "📅 기준연도 선택")
+
+
+def _region_box(at):
+    return next((box for box in at.sidebar.selectbox if box.label == "🏙️ 지역 선택"), None)
+
+
+def _rate_slider(at):
+    return next((slider for slider in at.sidebar.slider if slider.label == "📊 수용률 범위 (%)"), None)
+
+
+def apply_action(at, kind, rng):
+    """위젯 하나를 무작위 값으로 바꿈 (해당 위젯이 없으면 연도 변경)"""
+    region, slider = _region_box(at), _rate_slider(at)
+    if kind == 'region' and region is not None:
+        region.set_value(rng.choice(region.options))
+    elif kind == 'rate' and slider is not None:
+        low, high = slider.min, slider.max
+        a, b = sorted(round(rng.uniform(low, high), 1) for _ in range(2))
+        slider.set_value((a, b))
+    else:
+        year_box = _year_box(at)
+        year_box.set_value(int(rng.choice(year_box.options)))
+
+
+class SessionResult:
+    """세션 하나의 재실행 지연(초)과 오류 메시지"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = []
+
+
+def run_session(seed, actions, think, start_barrier, results, apps):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    result = SessionResult()
+    at = AppTest.from_file(str(APP), default_timeout=TIMEOUT)
+    start_barrier.wait()
+    try:
+        for step in range(actions + 1):
+            if step:
+                time.sleep(rng.expovariate(1 / think) if think > 0 else 0)
+                apply_action(at, rng.choice(ACTION_KINDS), rng)
+            start = time.perf_counter()
+            at.run()
+            result.latencies.append(time.perf_counter() - start)
+            result.errors.extend(str(e.value) for e in at.exception)
+    except Exception as exc:
+        result.errors.append(f"{type(exc).__name__}: {exc}")
+    results.append(result)
+    # 메모리 측정이 끝날 때까지 세션 상태를 유지
+    apps.append(at)
+
+
+def run_round(sessions, actions, think, seed):
+    """세션 sessions 개를 동시에 실행해 지표 dict 반환"""
+    results, apps = [], []
+    barrier = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(seed + i, actions, think, barrier, results, apps),
+            name=f"session-{i}",
+        )
+        for i in range(sessions)
+    ]
+    rss_before = rss_bytes()
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    rss_after = rss_bytes()
+
+    latencies = np.array([value for result in results for value in result.latencies])
+    p50, p95, p99 = (np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3)
+    del apps
+    return {
+        'sessions': sessions,
+        'reruns': int(len(latencies)),
+        'errors': [error for result in results for error in result.errors],
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'throughput': len(latencies) / wall if wall else 0.0,
+        'rss_bytes': rss_after,
+        'rss_per_session': (rss_after - rss_before) / sessions,
+    }
+
+
+def warm_up():
+    """모든 연도를 한 번씩 불러 API 조회와 전처리를 측정에서 제외"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=TIMEOUT)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    years = list(_year_box(at).options)
+    for year in years:
+        _year_box(at).set_value(int(year))
+        at.run()
+    return first, years
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    parser.add_argument('--sessions', type=int, nargs='*', default=SESSIONS)
+    parser.add_argument('--actions', type=int, default=ACTIONS, help="세션당 위젯 조작 횟수")
+    parser.add_argument('--think', type=float, default=THINK, help="조작 사이 평균 대기(초)")
+    parser.add_argument('--scale', type=int, default=1, help="목업 API 레코드 수 배율")
+    parser.add_argument('--latency', type=float, default=0.0, help="목업 API 요청당 지연(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    rows = scale_rows(load_fixture_rows(), args.scale)
+    server, url = start_mock_server(rows, latency=args.latency)
+    workdir = tempfile.mkdtemp(prefix='shelter-load-')
+    # app.py 를 처음 실행하기 전에 설정해야 shelter 모듈이 읽음
+    os.environ['SHELTER_API_URL'] = url
+    os.environ['SHELTER_CACHE_DIR'] = os.path.join(workdir, 'cache')
+    os.environ['SHELTER_SHARED_DIR'] = os.path.join(workdir, 'shared')
+
+    allow_concurrent_apptest()
+    try:
+        first, years = warm_up()
+        print(f"목업 API: {len(rows)}개 레코드, 첫 실행 {first * 1000:.0f} ms ({len(years)}개 연도 예열)")
+        print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50(ms)':>9} {'p95(ms)':>9} "
+              f"{'p99(ms)':>9} {'rerun/s':>8} {'rss(MiB)':>9} {'/session':>9}")
+        report = []
+        for sessions in args.sessions:
+            row = run_round(sessions, args.actions, args.think, args.seed)
+            report.append(row)
+            print(f"{sessions:>8} {row['reruns']:>7} {len(row['errors']):>6} {row['p50'] * 1000:>9.0f} "
+                  f"{row['p95'] * 1000:>9.0f} {row['p99'] * 1000:>9.0f} {row['throughput']:>8.2f} "
+                  f"{row['rss_bytes'] / 2**20:>9.0f} {row['rss_per_session'] / 2**20:>9.1f}",
+                  flush=True)
+            for error in dict.fromkeys(row['errors']):
+                print(f"{'':>8} 오류: {error[:200]}")
+    finally:
+        server.shutdown()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            'records': len(rows),
+            'actions': args.actions,
+            'think': args.think,
+            'api_latency': args.latency,
+            'rounds': report,
+        }, indent=2), encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
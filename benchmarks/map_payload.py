@@ -0,0 +1,64 @@
+"""지도 HTML 크기/생성 시간 점검: 시설 수와 무관하게 예산 이내인지 확인
+
+    python -m benchmarks.map_payload                  # 2천 ~ 30만 개소
+    python -m benchmarks.map_payload --points 36731
+
+예산을 넘는 화면이 있으면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+
+from shelter.facilities import prepare_facilities
+from shelter.maps import KOREA_BOUNDS, ClusterPyramid, base_map, cluster_layer, region_centers
+from tools.synthetic import synthetic_facilities
+
+POINT_COUNTS = [2_000, 36_731, 300_000]
+# (이름, 줌, 화면 범위)
+VIEWPORTS = [
+    ('전국', 7, KOREA_BOUNDS),
+    ('수도권', 10, (37.0, 126.4, 37.9, 127.6)),
+    ('서울 도심', 14, (37.54, 126.95, 37.59, 127.02)),
+    ('동네', 17, (37.563, 126.972, 37.570, 126.985)),
+]
+# 화면 하나당 HTML 크기 예산
+PAYLOAD_BUDGET = 512 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지도 HTML 크기 점검")
+    parser.add_argument('--points', type=int, nargs='*', default=POINT_COUNTS)
+    parser.add_argument('--budget', type=int, default=PAYLOAD_BUDGET, help="화면당 최대 바이트")
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    over_budget = []
+    print(f"{'points':>8} {'view':<10} {'markers':>8} {'render(ms)':>11} {'html(KiB)':>10}")
+    for points in args.points:
+        facilities = prepare_facilities(synthetic_facilities(points, seed=1))
+        pyramid = ClusterPyramid(facilities)
+        centers = region_centers(facilities)
+        rates = {regi: 80.0 for regi in centers.index}
+        for name, zoom, bounds in VIEWPORTS:
+            start = time.perf_counter()
+            clusters = pyramid.viewport(zoom, bounds)
+            fmap = base_map(rates, centers=centers)
+            cluster_layer(clusters).add_to(fmap)
+            payload = len(fmap.get_root().render().encode('utf-8'))
+            elapsed = time.perf_counter() - start
+            flag = '' if payload <= args.budget else '  ← 예산 초과'
+            print(f"{points:>8} {name:<10} {len(clusters):>8} {elapsed * 1000:>11.1f} "
+                  f"{payload / 1024:>10.1f}{flag}")
+            if payload > args.budget:
+                over_budget.append((points, name, payload))
+
+    if over_budget:
+        print(f"\n예산({args.budget / 1024:.0f} KiB) 초과: {len(over_budget)}개 화면")
+        sys.exit(1)
+    print(f"\n모든 화면이 예산({args.budget / 1024:.0f} KiB) 이내입니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""가까운 대피시설 검색 벤치마크: 격자 인덱스 vs 전체 하버사인 탐색
+
+    python -m benchmarks.nearest                  # 전국 규모 (약 3.7만 개소)
+    python -m benchmarks.nearest --points 200000
+
+격자 인덱스 결과가 전체 탐색과 다르면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from shelter.facilities import haversine_km, prepare_facilities
+from tools.synthetic import synthetic_facilities
+
+QUERIES = 1_000
+K = 10
+RADIUS_KM = 2.0
+
+
+def brute_force_nearest(facilities, lat, lon, k):
+    distances = haversine_km(lat, lon, facilities.lats, facilities.lons)
+    positions = np.argsort(distances, kind='stable')[:k]
+    return positions, distances[positions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가까운 대피시설 검색 벤치마크")
+    parser.add_argument('--points', type=int, default=None, help="시설 수 (기본: 전국 시설 수)")
+    parser.add_argument('--queries', type=int, default=QUERIES)
+    args = parser.parse_args()
+
+    frame = synthetic_facilities(args.points, seed=1)
+    start = time.perf_counter()
+    facilities = prepare_facilities(frame)
+    build = time.perf_counter() - start
+
+    # 시설이 있는 지역 주변에서 검색 지점 선택
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(facilities), args.queries)
+    lats = facilities.lats[picks] + rng.normal(0, 0.05, args.queries)
+    lons = facilities.lons[picks] + rng.normal(0, 0.05, args.queries)
+
+    timings = {}
+    mismatches = 0
+    for name, search in [
+        ('grid nearest', lambda lat, lon: facilities.nearest_positions(lat, lon, K)),
+        ('brute nearest', lambda lat, lon: brute_force_nearest(facilities, lat, lon, K)),
+        ('grid radius', lambda lat, lon: facilities.within_positions(lat, lon, RADIUS_KM)),
+    ]:
+        start = time.perf_counter()
+        for lat, lon in zip(lats, lons):
+            search(lat, lon)
+        timings[name] = (time.perf_counter() - start) / args.queries
+
+    for lat, lon in zip(lats[:100], lons[:100]):
+        _, grid = facilities.nearest_positions(lat, lon, K)
+        _, brute = brute_force_nearest(facilities, lat, lon, K)
+        mismatches += not np.allclose(grid, brute)
+
+    print(f"시설 {len(facilities):,}개소, 인덱스 생성 {build * 1000:.1f} ms")
+    for name, elapsed in timings.items():
+        print(f"{name:<14} {elapsed * 1000:>8.3f} ms/query")
+    if mismatches:
+        print(f"\n전체 탐색과 다른 결과: {mismatches}건")
+        sys.exit(1)
+    print("\n격자 인덱스 결과가 전체 탐색과 일치합니다.")
+
+
+if __name__ == "__main__":
+    main()
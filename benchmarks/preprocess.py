@@ -0,0 +1,100 @@
+"""preprocess_data 마이크로 벤치마크: 기존 구현 대비 시간과 최대 메모리 비교
+
+    python -m benchmarks.preprocess
+    python -m benchmarks.preprocess --regions 250 --scales 100 1000 10000
+
+입력은 API 레코드 목록(records)과 로더가 실제로 넘기는 디코딩된 표(frame)
+두 가지입니다. 지역명은 --regions 개를 돌려 써서 실제 응답처럼 같은 지역이
+반복됩니다 (행마다 지역이 다르면 범주형이 아무것도 줄이지 못함). 최대 메모리는
+입력을 만든 뒤 tracemalloc 으로 잰 추가 할당량입니다.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from shelter.api import rows_to_frame
+from shelter.preprocess import preprocess_data
+from tools.synthetic import synthetic_rows
+
+# 실제 시도 단위 응답(17개 지역) 대비 배율
+SCALES = [100, 1000, 10000]
+BASE_REGIONS = 17
+# 돌려 쓸 지역명 수 (시군구 수준)
+REGIONS = 250
+REPEAT = 3
+
+
+def legacy_preprocess_data(raw_data):
+    """스키마 도입 이전의 preprocess_data (비교 기준)"""
+    if raw_data is None or len(raw_data) == 0:
+        return pd.DataFrame(), pd.DataFrame()
+    df = pd.DataFrame(raw_data)
+    if df.empty:
+        return df, pd.DataFrame()
+    numeric_columns = [
+        'target_popl', 'accpt_rt', 'shelt_abl_popl_smry',
+        'shelt_abl_popl_gov_shelts', 'shelt_abl_popl_pub_shelts',
+        'gov_shelts_shelts', 'gov_shelts_area',
+        'pub_shelts_shelts', 'pub_shelts_area'
+    ]
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.replace(',', '').replace('', '0')
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.fillna(0)
+    total_row = pd.DataFrame()
+    if 'regi' in df.columns:
+        total_row = df[df['regi'] == '합계'].copy()
+        df_filtered = df[df['regi'] != '합계'].copy()
+    else:
+        df_filtered = df.copy()
+    return df_filtered, total_row
+
+
+def measure(fn, rows):
+    """(최소 실행 시간 초, 최대 추가 메모리 바이트, 결과 DataFrame 메모리 바이트)"""
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    df, _ = fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, int(df.memory_usage(deep=True).sum())
+
+
+def repeated_regions(rows, regions):
+    """'합계' 행은 두고 지역명을 regions 개로 돌려 씀"""
+    names = [f"지역 {i + 1:04d}" for i in range(regions)]
+    return [row if row['regi'] == '합계' else {**row, 'regi': names[i % regions]}
+            for i, row in enumerate(rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="preprocess_data 기존 구현 대비 비교")
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--regions', type=int, default=REGIONS)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'input':>8} {'impl':>8} {'time(ms)':>10} {'peak(MiB)':>10} {'frame(MiB)':>11}")
+    for scale in args.scales:
+        records = repeated_regions(synthetic_rows(BASE_REGIONS * scale), args.regions)
+        for kind, raw in [('records', records), ('frame', rows_to_frame(records))]:
+            results = {}
+            for name, fn in [('legacy', legacy_preprocess_data), ('schema', preprocess_data)]:
+                results[name] = measure(fn, raw)
+                elapsed, peak, frame = results[name]
+                print(f"{len(raw):>8} {kind:>8} {name:>8} {elapsed * 1000:>10.1f} "
+                      f"{peak / 2**20:>10.2f} {frame / 2**20:>11.2f}")
+            (t0, p0, f0), (t1, p1, f1) = results['legacy'], results['schema']
+            print(f"{'':>8} {'':>8} {'ratio':>8} {t0 / t1:>9.1f}x {p0 / p1:>9.1f}x {f0 / f1:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""레플리카별 데이터 메모리 비교: 각자 전처리 vs 공유 메모리 매핑 파일
+
+    python -m benchmarks.shared_memory
+    python -m benchmarks.shared_memory --rows 1000000 --replicas 4
+    python -m benchmarks.shared_memory --app --scale 2000       # app.py 전체 (스케줄러 포함)
+
+프로세스마다 데이터를 올리기 전후의 /proc/self/status 값을 비교합니다.
+RssAnon 은 프로세스 전용 메모리, RssFile 은 여러 프로세스가 함께 쓰는
+파일 매핑 페이지입니다 (Linux 전용).
+
+지역명은 --regions 개를 돌려 씁니다 (시군구 수준 250개가 기본). 행마다 지역이
+다르면 범주 해시 테이블이 데이터 자체보다 커져 비교가 흐려집니다.
+
+--app 은 목업 API(레코드 수 --scale 배)를 띄우고 레플리카마다 AppTest 로
+app.py 를 실행해, 백그라운드 스케줄러가 모든 연도를 불러온 뒤의 값을 잽니다.
+레플리카는 차례로 실행하므로 첫 레플리카가 기본 연도를 게시합니다. 목업 행은
+모두 지역명이 달라 범주 색인, 롤업 큐브, 지역 선택 목록처럼 레플리카마다
+만드는 것이 지역 수에 비례해 커지는 나쁜 경우입니다.
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from shelter.api import rows_to_frame
+from shelter.shared import SharedStore
+from shelter.views import dataset_from_frames, prepare_dataset
+from tools.mock_api import load_fixture_rows, scale_rows, start_mock_server
+from tools.synthetic import synthetic_rows
+
+ROWS = 1_000_000
+REGIONS = 250
+REPLICAS = 4
+YEAR = 2024
+APP = Path(__file__).resolve().parent.parent / "app.py"
+APP_SCALE = 2_000
+# 스케줄러가 모든 연도를 불러올 때까지 기다리는 최대 시간 (초)
+APP_TIMEOUT = 600
+
+
+def _status_kib():
+    values = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('RssAnon', 'RssFile'):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def _replica(mode, root, frame, queue):
+    before = _status_kib()
+    start = time.perf_counter()
+    if mode == 'shared':
+        shared = SharedStore(root).get(YEAR)
+        dataset = dataset_from_frames(shared.df, shared.total_df)
+    else:
+        dataset = prepare_dataset(frame)
+    elapsed = time.perf_counter() - start
+    # 대시보드처럼 전체 컬럼을 한 번 읽음
+    dataset.df.select_dtypes('number').sum()
+    after = _status_kib()
+    queue.put((elapsed, after['RssAnon'] - before['RssAnon'], after['RssFile'] - before['RssFile']))
+
+
+def _app_replica(queue):
+    from streamlit.testing.v1 import AppTest
+
+    # app.py 가 불러오는 라이브러리는 기준값에 넣어 데이터 메모리만 비교
+    import app  # noqa: F401
+
+    before = _status_kib()
+    start = time.perf_counter()
+    at = AppTest.from_file(str(APP), default_timeout=APP_TIMEOUT).run()
+    elapsed = time.perf_counter() - start
+    # 사이드바 '캐시 갱신 상태' 표가 모든 연도 ok 가 될 때까지 재실행
+    deadline = time.monotonic() + APP_TIMEOUT
+    while time.monotonic() < deadline:
+        status = [df.value for df in at.dataframe if '결과' in df.value.columns]
+        if status and (status[0]['결과'] == 'ok').all():
+            break
+        time.sleep(0.5)
+        at.run()
+    after = _status_kib()
+    errors = [str(e.value) for e in at.exception]
+    queue.put((elapsed, after['RssAnon'] - before['RssAnon'],
+               after['RssFile'] - before['RssFile'], errors))
+
+
+def run_app(scale, replicas):
+    """레플리카마다 app.py 를 실행해 (첫 실행 초, 전용 KiB, 파일 KiB) 출력"""
+    rows = scale_rows(load_fixture_rows(), scale)
+    server, url = start_mock_server(rows)
+    workdir = tempfile.mkdtemp(prefix='shelter-app-memory-')
+    os.environ['SHELTER_API_URL'] = url
+    os.environ['SHELTER_CACHE_DIR'] = os.path.join(workdir, 'cache')
+    os.environ['SHELTER_SHARED_DIR'] = os.path.join(workdir, 'shared')
+
+    # 자식 프로세스가 streamlit 을 새로 불러오도록 spawn 사용
+    ctx = multiprocessing.get_context('spawn')
+    print(f"목업 API: 연도당 {len(rows):,}개 레코드")
+    print(f"{'replica':>7} {'run(ms)':>9} {'anon(MiB)':>10} {'file(MiB)':>10}")
+    try:
+        for replica in range(replicas):
+            queue = ctx.Queue()
+            process = ctx.Process(target=_app_replica, args=(queue,))
+            process.start()
+            elapsed, anon, file_kib, errors = queue.get()
+            process.join()
+            print(f"{replica:>7} {elapsed * 1000:>9.0f} {anon / 1024:>10.1f} {file_kib / 1024:>10.1f}",
+                  flush=True)
+            for error in errors:
+                print(f"{'':>7} 오류: {error[:200]}")
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레플리카별 데이터 메모리 비교")
+    parser.add_argument('--rows', type=int, default=ROWS)
+    parser.add_argument('--regions', type=int, default=REGIONS)
+    parser.add_argument('--replicas', type=int, default=REPLICAS)
+    parser.add_argument('--app', action='store_true', help="app.py 전체를 레플리카마다 실행")
+    parser.add_argument('--scale', type=int, default=APP_SCALE, help="--app 목업 API 레코드 수 배율")
+    args = parser.parse_args()
+
+    if args.app:
+        run_app(args.scale, args.replicas)
+        return
+
+    frame = rows_to_frame(synthetic_rows(args.rows))
+    names = [f"지역 {i + 1:04d}" for i in range(args.regions)]
+    frame['regi'] = [names[i % args.regions] for i in range(len(frame))]
+    frame.loc[0, 'regi'] = '합계'
+
+    root = tempfile.mkdtemp(prefix='shelter-shared-')
+    dataset = prepare_dataset(frame)
+    SharedStore(root).publish(YEAR, time.time(), dataset.df, dataset.total_df)
+    del dataset
+
+    ctx = multiprocessing.get_context('fork')
+    print(f"{'mode':<10} {'replica':>7} {'load(ms)':>9} {'anon(MiB)':>10} {'file(MiB)':>10}")
+    for mode in ('preprocess', 'shared'):
+        queue = ctx.Queue()
+        for replica in range(args.replicas):
+            process = ctx.Process(target=_replica, args=(mode, root, frame, queue))
+            process.start()
+            elapsed, anon, file_kib = queue.get()
+            process.join()
+            print(f"{mode:<10} {replica:>7} {elapsed * 1000:>9.1f} "
+                  f"{anon / 1024:>10.1f} {file_kib / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
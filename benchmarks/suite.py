@@ -0,0 +1,244 @@
+"""단계별 벤치마크 모음: 응답 파싱부터 내보내기까지 크기별 시간/메모리 측정
+
+    python -m benchmarks.suite                          # 17, 250, 1만, 100만 행
+    python -m benchmarks.suite --sizes 17 250 10000     # 빠른 확인
+    python -m benchmarks.suite --no-memory              # 시간만 (100만 행의 tracemalloc 측정은 수 분)
+    python -m benchmarks.suite --compare .cache/benchmarks/<이전 커밋>.json
+
+17행은 녹화된 fixtures/ 응답을 그대로, 나머지는 같은 스키마의 합성 레코드를
+API 응답 바이트로 만들어 씁니다 (네트워크 호출 없음). 결과는 커밋별 JSON
+(기본: .cache/benchmarks/<커밋>.json)으로 저장하며, --compare 로 준 기준 결과보다
+--threshold 이상 느려진 단계가 있으면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.decode import encode_pages
+from shelter.api import decode_page, merge_pages
+from shelter.charts import CHARTS, build_figure
+from shelter.export import export_bytes
+from shelter.filters import Between, Equals
+from shelter.preprocess import preprocess_data
+from shelter.scenarios import monte_carlo, national_grid, scenario_base, scenario_grid
+from shelter.table import TableQuery, ordered_positions, table_page
+from shelter.views import (
+    dataset_from_frames,
+    facility_statistics,
+    national_summary,
+    rate_statistics,
+    selection_summary,
+)
+from tools.mock_api import load_fixture_rows
+from tools.synthetic import synthetic_rows
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULT_DIR = ROOT / ".cache" / "benchmarks"
+SIZES = [17, 250, 10_000, 1_000_000]
+PAGE_SIZE = 1_000
+# 크기별 반복 횟수 (최소 시간 사용)
+REPEAT = 5
+LARGE_REPEAT = 1
+LARGE_ROWS = 100_000
+# 이보다 느려지면 회귀로 판단 (기준 대비 비율)
+THRESHOLD = 0.20
+# 작은 단계는 잡음이 커서 이만큼 이상 느려졌을 때만 회귀로 판단 (초)
+MIN_DELTA = 0.005
+
+
+def source_rows(size):
+    """녹화된 응답(17행) 또는 같은 스키마의 합성 레코드"""
+    if size == 17:
+        return load_fixture_rows()
+    # 합성 레코드는 '합계' 행이 하나 더 붙으므로 size 개 지역만 생성
+    return synthetic_rows(size)
+
+
+def _stages(pages):
+    """(단계 이름, 함수) 목록 — 각 단계는 앞 단계 결과를 입력으로 씀"""
+    state = {}
+
+    def parse():
+        state['frame'] = merge_pages({
+            page_no: decode_page(content)[1] for page_no, content in enumerate(pages, 1)
+        })
+
+    def preprocess():
+        state['frames'] = preprocess_data(state['frame'])
+
+    def index():
+        state['dataset'] = dataset_from_frames(*state['frames'])
+
+    def filter_():
+        dataset = state['dataset']
+        rates = dataset.df['accpt_rt']
+        region = dataset.regions[min(1, len(dataset.regions) - 1)]
+        # 수용률 범위 필터 (대시보드 기본 상태)와 지역+범위 필터
+        dataset.engine.filter([Between('accpt_rt', rates.quantile(0.1), rates.quantile(0.9))])
+        dataset.engine.filter([Equals('regi', region), Between('accpt_rt', rates.min(), rates.max())])
+        state['filtered'] = dataset.engine.filter(
+            [Between('accpt_rt', rates.quantile(0.1), rates.quantile(0.9))]
+        )
+
+    def kpi():
+        dataset, filtered = state['dataset'], state['filtered']
+        national_summary(dataset.total_df, filtered)
+        selection_summary(filtered, dataset.df)
+        rate_statistics(filtered)
+        facility_statistics(filtered)
+
+    def figures():
+        for chart_id in CHARTS:
+            build_figure(chart_id, state['filtered'])
+
+    def scenarios():
+        # 앱 시나리오 화면과 같은 격자(41 × 41)와 몬테카를로 1만 표본
+        base = scenario_base(state['filtered'])
+        added, growth = np.arange(0, 201, 5), np.linspace(-0.10, 0.30, 41)
+        national_grid(base, added, growth)
+        scenario_grid(base, [10], [0.05])
+        monte_carlo(base, 10, years=5, growth_std=0.01, draws=10_000, seed=0)
+
+    def table():
+        # 상세 표: 수용률 내림차순 첫 페이지 (정렬 인덱스는 데이터셋당 한 번 생성)
+        dataset = state['dataset']
+        query = TableQuery(sort='accpt_rt', ascending=False)
+        selected = dataset.engine.select(
+            [Between('accpt_rt', *state['filtered']['accpt_rt'].agg(['min', 'max']))]
+        )
+        table_page(dataset.df, ordered_positions(dataset.engine, selected, query), query)
+
+    def export_csv():
+        export_bytes([state['filtered']], 'csv')
+
+    def export_json():
+        export_bytes([state['filtered']], 'json')
+
+    return [
+        ('parse', parse),
+        ('preprocess', preprocess),
+        ('index', index),
+        ('filter', filter_),
+        ('kpi', kpi),
+        ('figures', figures),
+        ('scenarios', scenarios),
+        ('table_page', table),
+        ('export_csv', export_csv),
+        ('export_json', export_json),
+    ]
+
+
+def run_size(size, repeat, memory=True):
+    """크기 하나의 단계별 (stage, {seconds, peak_bytes}) 를 끝나는 대로 내보냄"""
+    pages = encode_pages(source_rows(size), PAGE_SIZE)
+    for stage, fn in _stages(pages):
+        best = float('inf')
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        peak = None
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        yield stage, {'seconds': best, 'peak_bytes': peak}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def compare(current, baseline, threshold):
+    """기준 대비 느려진 단계 [(size, stage, 기준 초, 현재 초)]"""
+    regressions = []
+    print(f"\n기준: {baseline.get('commit')} ({baseline.get('created_at')})")
+    print(f"{'rows':>9} {'stage':<12} {'base(ms)':>10} {'now(ms)':>10} {'ratio':>7}")
+    for size, stages in current['results'].items():
+        for stage, now in stages.items():
+            base = baseline.get('results', {}).get(size, {}).get(stage)
+            if base is None:
+                continue
+            ratio = now['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+            slow = ratio > 1 + threshold and now['seconds'] - base['seconds'] >= MIN_DELTA
+            flag = '  ← 회귀' if slow else ''
+            print(f"{size:>9} {stage:<12} {base['seconds'] * 1000:>10.2f} "
+                  f"{now['seconds'] * 1000:>10.2f} {ratio:>6.2f}x{flag}")
+            if slow:
+                regressions.append((size, stage, base['seconds'], now['seconds']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단계별 벤치마크 모음")
+    parser.add_argument('--sizes', type=int, nargs='*', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 측정 생략")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본: .cache/benchmarks/<커밋>.json)")
+    parser.add_argument('--compare', help="비교할 기준 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'results': {},
+    }
+
+    print(f"{'rows':>9} {'stage':<12} {'time(ms)':>10} {'peak(MiB)':>10}")
+    for size in args.sizes:
+        repeat = LARGE_REPEAT if size >= LARGE_ROWS else args.repeat
+        # JSON 키는 문자열이므로 크기도 문자열로 저장
+        results = report['results'][str(size)] = {}
+        for stage, result in run_size(size, repeat, memory=not args.no_memory):
+            results[stage] = result
+            peak = result['peak_bytes']
+            peak_text = f"{peak / 2**20:>10.2f}" if peak is not None else f"{'-':>10}"
+            print(f"{size:>9} {stage:<12} {result['seconds'] * 1000:>10.2f} {peak_text}", flush=True)
+
+    output = Path(args.output) if args.output else RESULT_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{args.threshold:.0%} 이상 느려진 단계: {len(regressions)}개")
+            sys.exit(1)
+        print("\n회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
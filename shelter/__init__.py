@@ -0,0 +1 @@
+"""주민대피시설 대시보드 데이터 계층 (Streamlit 비의존)"""
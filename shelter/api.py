@@ -0,0 +1,217 @@
+"""행정안전부 주민대피시설(AirRaidShelterRegion) 공공데이터 API 클라이언트"""
+
+import json
+import math
+import os
+import re
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from shelter import metrics
+from shelter.preprocess import NUMERIC_COLUMNS
+
+# orjson이 설치되어 있으면 응답 디코딩에 사용 (없으면 표준 json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# SSL 경고 비활성화 (data.go.kr 인증서 검증을 끄고 호출함)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# API 엔드포인트 (SHELTER_API_URL 환경변수로 로컬 목업 서버 지정 가능)
+API_URL = os.environ.get(
+    "SHELTER_API_URL",
+    "http://apis.data.go.kr/1741000/AirRaidShelterRegion/getAirRaidShelterRegionList",
+)
+RESPONSE_KEY = "AirRaidShelterRegion"
+
+DEFAULT_NUM_OF_ROWS = 1000
+DEFAULT_TIMEOUT = 15
+# 동시에 요청할 최대 페이지 수
+DEFAULT_MAX_WORKERS = 4
+# parse_numbers 빠른 경로에서 제외하는 값 (공백이 들면 읽은 개수가 어긋남)
+_WHITESPACE = re.compile(r'\s')
+
+
+class ShelterAPIError(Exception):
+    """API 응답을 해석할 수 없을 때 발생하는 예외"""
+
+
+def is_transient_error(error):
+    """재시도하면 성공할 수 있는 오류인지 판단 (연결 오류, 타임아웃, 5xx)"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is None or response.status_code >= 500
+    return isinstance(error, (requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout))
+
+
+def create_session(pool_size=DEFAULT_MAX_WORKERS):
+    """커넥션 풀을 공유하는 requests 세션 생성"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = False
+    return session
+
+
+def parse_response(data):
+    """응답 JSON에서 (totalCount, 레코드 목록)을 추출"""
+    if not isinstance(data, dict) or RESPONSE_KEY not in data:
+        raise ShelterAPIError("예상과 다른 API 응답 구조입니다.")
+
+    total_count = None
+    rows = []
+    for block in data[RESPONSE_KEY]:
+        # head 블록: [{"totalCount": n}, {"numOfRows": ..}, {"RESULT": ..}]
+        for item in block.get("head", []):
+            if "totalCount" in item:
+                total_count = int(item["totalCount"])
+        if "row" in block:
+            rows = block["row"] or []
+
+    if total_count is None:
+        total_count = len(rows)
+    return total_count, rows
+
+
+def loads(content):
+    """응답 바이트를 JSON으로 디코딩 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_numbers(values):
+    """숫자 문자열('1,234') 목록을 float64 배열로 변환 (변환 불가/결측치는 NaN)
+
+    모두 공백 없는 한 덩어리 문자열이면 한 문자열로 이어 붙여 numpy에서 한 번에
+    읽고, 그렇지 않거나 읽은 개수가 맞지 않으면 값별 변환으로 처리합니다. 빈 값과
+    공백이 든 값은 이어 붙이면 개수가 서로 상쇄될 수 있어('1 2' 와 '') 빠른
+    경로에서 제외합니다.
+    """
+    if (all(isinstance(v, str) for v in values) and '' not in values
+            and _WHITESPACE.search(''.join(values)) is None):
+        text = ' '.join(values).replace(',', '')
+        try:
+            with warnings.catch_warnings():
+                # numpy 버전에 따라 읽다 멈추면 경고 또는 ValueError
+                warnings.simplefilter('ignore', DeprecationWarning)
+                parsed = np.fromstring(text, sep=' ')
+        except ValueError:
+            parsed = None
+        if parsed is not None and len(parsed) == len(values):
+            return parsed
+    series = pd.Series(values, dtype=object)
+    numeric = pd.to_numeric(series, errors='coerce')
+    is_text = series.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    if is_text.any():
+        numeric[is_text] = pd.to_numeric(
+            series[is_text].str.replace(',', '', regex=False), errors='coerce'
+        )
+    return numeric.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def rows_to_frame(rows):
+    """레코드 목록을 컬럼 배열로 바꾼 DataFrame (수치형 컬럼은 float64, 나머지는 문자열)"""
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    for col in columns:
+        values = [row.get(col) for row in rows]
+        if col in NUMERIC_COLUMNS:
+            columns[col] = parse_numbers(values)
+        else:
+            columns[col] = np.array([None if v is None else str(v) for v in values], dtype=object)
+    return pd.DataFrame(columns)
+
+
+def decode_page(content):
+    """응답 바이트에서 (totalCount, 컬럼 배열 DataFrame)을 만듦
+
+    페이지 단위로 디코딩하고 바로 컬럼 배열로 바꾸므로, 원본 바이트와
+    레코드 목록은 한 페이지 분량만 메모리에 남습니다.
+    """
+    total_count, rows = parse_response(loads(content))
+    return total_count, rows_to_frame(rows)
+
+
+def fetch_page(session, service_key, year, page_no, num_of_rows=DEFAULT_NUM_OF_ROWS,
+               url=None, timeout=DEFAULT_TIMEOUT):
+    """단일 페이지를 호출해 (totalCount, 컬럼 배열 DataFrame)을 반환"""
+    params = {
+        'ServiceKey': service_key,
+        'pageNo': page_no,
+        'numOfRows': num_of_rows,
+        'type': 'json',
+        'bas_yy': year
+    }
+    with metrics.span('api.request') as span:
+        response = session.get(url or API_URL, params=params, timeout=timeout)
+        span.set(page=page_no, status=response.status_code, bytes=len(response.content))
+    response.raise_for_status()
+    with metrics.span('api.decode'):
+        return decode_page(response.content)
+
+
+def fetch_pages(service_key, year, num_of_rows=DEFAULT_NUM_OF_ROWS,
+                max_workers=DEFAULT_MAX_WORKERS, session=None, url=None,
+                timeout=DEFAULT_TIMEOUT):
+    """첫 페이지의 totalCount를 읽고 나머지 페이지를 동시에 호출
+
+    반환값은 (totalCount, {pageNo: 컬럼 배열 DataFrame}) 입니다.
+    """
+    own_session = session is None
+    if own_session:
+        session = create_session(max_workers)
+
+    try:
+        total_count, first_rows = fetch_page(
+            session, service_key, year, 1, num_of_rows, url, timeout
+        )
+        pages = {1: first_rows}
+
+        page_count = max(1, math.ceil(total_count / num_of_rows))
+        remaining = list(range(2, page_count + 1))
+        if remaining:
+            # 남은 페이지는 max_workers 개까지 동시에 호출
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining))) as pool:
+                results = pool.map(
+                    metrics.propagate(lambda page_no: fetch_page(
+                        session, service_key, year, page_no, num_of_rows, url, timeout
+                    )),
+                    remaining,
+                )
+                for page_no, (_, rows) in zip(remaining, results):
+                    pages[page_no] = rows
+        return total_count, pages
+    finally:
+        if own_session:
+            session.close()
+
+
+def merge_pages(pages):
+    """페이지별 표를 페이지 순서대로 합치고 중복 레코드를 제거"""
+    frames = [pages[page_no] for page_no in sorted(pages)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+
+
+def fetch_all_pages(service_key, year, num_of_rows=DEFAULT_NUM_OF_ROWS,
+                    max_workers=DEFAULT_MAX_WORKERS, session=None, url=None,
+                    timeout=DEFAULT_TIMEOUT):
+    """모든 페이지를 가져와 중복이 제거된 하나의 표로 반환"""
+    _, pages = fetch_pages(
+        service_key, year, num_of_rows, max_workers, session, url, timeout
+    )
+    return merge_pages(pages)
@@ -0,0 +1,270 @@
+"""API 응답을 페이지 단위 Parquet 파일로 보관하는 디스크 캐시
+
+키는 (bas_yy, pageNo, numOfRows) 이며, 프로세스 재시작이나 새 레플리카도
+네트워크 호출 없이 디스크에서 바로 데이터를 읽습니다.
+
+페이지마다 내용 해시를 메타데이터로 함께 기록하고, 연도의 페이지 해시를
+합친 값(content_hash)을 데이터 버전으로 씁니다. 다시 받아온 데이터가 이전과
+같으면 버전도 같으므로 전처리/집계/차트 캐시를 그대로 재사용합니다.
+연도 content_hash 는 작은 파일(<year>/content_rows<numOfRows>)로도 기록해
+다른 프로세스가 페이지를 읽지 않고 캐시가 바뀌었거나 무효화됐는지 확인합니다.
+
+    python -m shelter.cache list
+    python -m shelter.cache invalidate --year 2024
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CACHE_DIR = Path(os.environ.get("SHELTER_CACHE_DIR", ".cache/shelter"))
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# 캐시 상태
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """연도별 캐시 신선도 정책
+
+    마감된 연도는 거의 바뀌지 않으므로 TTL을 길게, 올해는 짧게 둡니다.
+    TTL이 지난 뒤 max_stale 까지는 오래된 데이터를 먼저 돌려주고 백그라운드에서 갱신합니다.
+    """
+
+    closed_year_ttl: float = 30 * DAY
+    current_year_ttl: float = 1 * HOUR
+    closed_year_max_stale: float = 365 * DAY
+    current_year_max_stale: float = 1 * DAY
+
+    def is_closed(self, year):
+        return int(year) < datetime.now().year
+
+    def ttl(self, year):
+        return self.closed_year_ttl if self.is_closed(year) else self.current_year_ttl
+
+    def max_stale(self, year):
+        return self.closed_year_max_stale if self.is_closed(year) else self.current_year_max_stale
+
+    def state(self, year, fetched_at, now=None):
+        """fetched_at 시각에 받은 데이터의 상태 (fresh / stale / expired)"""
+        age = (now or time.time()) - fetched_at
+        ttl = self.ttl(year)
+        if age < ttl:
+            return FRESH
+        if age < ttl + self.max_stale(year):
+            return STALE
+        return EXPIRED
+
+
+def frame_hash(frame):
+    """표 내용의 해시 (컬럼명과 행 값 기준, dtype 표현이나 인덱스와 무관)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(frame.columns)).encode())
+    rows = pd.util.hash_pandas_object(frame, index=False)
+    digest.update(rows.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def content_hash(page_hashes):
+    """{pageNo: 페이지 해시} → 연도 데이터 버전 (페이지 순서대로 합침)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for page_no in sorted(page_hashes):
+        digest.update(f"{page_no}:{page_hashes[page_no]};".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedPage:
+    """디스크에서 읽은 한 페이지"""
+
+    frame: pd.DataFrame
+    total_count: int
+    fetched_at: float
+    content_hash: str = None
+
+
+def _to_table(frame, total_count, fetched_at, page_hash):
+    """컬럼 배열 표를 Parquet 메타데이터가 붙은 Arrow 테이블로 변환 (dtype 그대로 보관)"""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    return table.replace_schema_metadata({
+        b"total_count": str(total_count).encode(),
+        b"fetched_at": repr(fetched_at).encode(),
+        b"content_hash": page_hash.encode(),
+    })
+
+
+class ShelterCache:
+    """페이지 단위 Parquet 디스크 캐시"""
+
+    def __init__(self, cache_dir=CACHE_DIR, policy=None):
+        self.cache_dir = Path(cache_dir)
+        self.policy = policy or FreshnessPolicy()
+
+    def path(self, year, page_no, num_of_rows):
+        return self.cache_dir / str(year) / f"page{page_no}_rows{num_of_rows}.parquet"
+
+    def hash_path(self, year, num_of_rows):
+        return self.cache_dir / str(year) / f"content_rows{num_of_rows}"
+
+    def year_hash(self, year, num_of_rows):
+        """기록된 연도 content_hash (캐시가 없거나 무효화됐으면 None, 페이지는 읽지 않음)"""
+        try:
+            return self.hash_path(year, num_of_rows).read_text().strip() or None
+        except OSError:
+            return None
+
+    def year_info(self, year, num_of_rows):
+        """(fetched_at, content_hash) — 연도 해시와 첫 페이지 메타데이터만 읽음 (없으면 None)"""
+        year_hash = self.year_hash(year, num_of_rows)
+        if year_hash is None:
+            return None
+        try:
+            meta = pq.read_schema(self.path(year, 1, num_of_rows)).metadata or {}
+            return float(meta[b"fetched_at"]), year_hash
+        except (OSError, pa.ArrowInvalid, KeyError, ValueError):
+            return None
+
+    def _put_year_hash(self, year, num_of_rows, value):
+        path = self.hash_path(year, num_of_rows)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+        with os.fdopen(fd, "w") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+    def get_page(self, year, page_no, num_of_rows):
+        """캐시된 페이지를 읽음 (없거나 손상된 경우 None)"""
+        path = self.path(year, page_no, num_of_rows)
+        try:
+            table = pq.read_table(path)
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            return None
+        meta = table.schema.metadata or {}
+        try:
+            total_count = int(meta[b"total_count"])
+            fetched_at = float(meta[b"fetched_at"])
+        except (KeyError, ValueError):
+            return None
+        frame = table.to_pandas()
+        # 해시가 없는 이전 형식 파일은 읽은 내용으로 계산
+        page_hash = meta[b"content_hash"].decode() if b"content_hash" in meta else frame_hash(frame)
+        return CachedPage(frame, total_count, fetched_at, page_hash)
+
+    def put_page(self, year, page_no, num_of_rows, frame, total_count, fetched_at=None):
+        """페이지를 원자적으로 기록 (임시 파일 작성 후 교체) 하고 페이지 해시를 반환"""
+        path = self.path(year, page_no, num_of_rows)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        page_hash = frame_hash(frame)
+        table = _to_table(frame, total_count, fetched_at or time.time(), page_hash)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return page_hash
+
+    def get_year(self, year, num_of_rows):
+        """연도의 모든 페이지를 읽어 ({pageNo: 표}, 가장 오래된 fetched_at, content_hash) 반환
+
+        페이지가 하나라도 빠져 있으면 None을 반환합니다.
+        """
+        first = self.get_page(year, 1, num_of_rows)
+        if first is None:
+            return None
+        pages = {1: first.frame}
+        hashes = {1: first.content_hash}
+        fetched_at = first.fetched_at
+        page_count = max(1, -(-first.total_count // num_of_rows))
+        for page_no in range(2, page_count + 1):
+            page = self.get_page(year, page_no, num_of_rows)
+            if page is None:
+                return None
+            pages[page_no] = page.frame
+            hashes[page_no] = page.content_hash
+            fetched_at = min(fetched_at, page.fetched_at)
+        year_hash = content_hash(hashes)
+        if self.year_hash(year, num_of_rows) != year_hash:
+            # 연도 해시 파일이 없던 이전 형식 캐시
+            self._put_year_hash(year, num_of_rows, year_hash)
+        return pages, fetched_at, year_hash
+
+    def put_year(self, year, num_of_rows, total_count, pages, fetched_at=None):
+        """연도의 모든 페이지를 같은 fetched_at 으로 기록하고 content_hash 를 반환"""
+        fetched_at = fetched_at or time.time()
+        year_hash = content_hash({
+            page_no: self.put_page(year, page_no, num_of_rows, frame, total_count, fetched_at)
+            for page_no, frame in pages.items()
+        })
+        self._put_year_hash(year, num_of_rows, year_hash)
+        return year_hash
+
+    def invalidate(self, year=None):
+        """연도(또는 전체) 캐시 파일을 삭제하고 삭제한 페이지 파일 수를 반환
+
+        연도 해시 파일을 먼저 지우므로 실행 중인 다른 프로세스도 다음 조회부터
+        메모리/공유 파일의 이전 데이터를 쓰지 않습니다.
+        """
+        year_dir = "*" if year is None else str(year)
+        for path in self.cache_dir.glob(f"{year_dir}/content_rows*"):
+            path.unlink(missing_ok=True)
+        targets = self.cache_dir.glob(f"{year_dir}/*.parquet")
+        removed = 0
+        for path in targets:
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def entries(self):
+        """캐시된 페이지 목록 [(year, 파일명, fetched_at, 상태)]"""
+        entries = []
+        for path in sorted(self.cache_dir.glob("*/*.parquet")):
+            year = path.parent.name
+            try:
+                meta = pq.read_schema(path).metadata or {}
+                fetched_at = float(meta[b"fetched_at"])
+            except (OSError, pa.ArrowInvalid, KeyError, ValueError):
+                continue
+            entries.append((year, path.name, fetched_at, self.policy.state(year, fetched_at)))
+        return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주민대피시설 API 디스크 캐시 관리")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="캐시된 페이지 목록 출력")
+    invalidate = sub.add_parser("invalidate", help="캐시 무효화")
+    invalidate.add_argument("--year", type=int, help="무효화할 연도 (생략 시 전체)")
+    args = parser.parse_args()
+
+    cache = ShelterCache(args.cache_dir)
+    if args.command == "list":
+        for year, name, fetched_at, state in cache.entries():
+            stamp = datetime.fromtimestamp(fetched_at).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{year}\t{name}\t{stamp}\t{state}")
+    else:
+        removed = cache.invalidate(args.year)
+        target = f"{args.year}년" if args.year else "전체"
+        print(f"{target} 캐시 {removed}개 파일 삭제")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""시각화 탭별 Plotly 그림 생성
+
+plotly는 그림을 실제로 만들 때 불러옵니다. 그림은 차트 ID로 생성하며,
+호출 측에서 (연도, 필터 상태, 차트 ID) 단위로 캐시합니다.
+
+행 수가 많으면 산점도는 WebGL(scattergl)로, 그보다 더 많으면 서버에서
+격자 구간으로 집계한 밀도 그림으로 바꿔 그림 데이터 크기를 일정하게 유지합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from shelter import metrics
+
+# 이 행 수를 넘으면 산점도를 WebGL(scattergl)로 그림
+WEBGL_THRESHOLD = 1_000
+# 이 행 수를 넘으면 산점도를 격자 밀도 그림으로, 히스토그램을 서버 집계로 대체
+MAX_SCATTER_POINTS = 5_000
+DENSITY_BINS = 60
+HISTOGRAM_BINS = 20
+# 지역별 막대그래프에 그릴 최대 막대 수 (초과분은 '기타' 막대로 합침)
+MAX_BARS = 40
+
+# 시각화 탭 구성: (탭 이름, [(제목, 차트 ID), ...])
+TABS = [
+    ("🏆 수용률 분석", [
+        ("**🔝 수용률 상위 10개 지역**", 'rate_top10'),
+        ("**📊 수용률 분포**", 'rate_histogram'),
+    ]),
+    ("👥 인구 현황", [
+        ("**👥 대상인구 vs 대피가능인구**", 'population_scatter'),
+        ("**📊 지역별 대상인구 순위**", 'population_top10'),
+    ]),
+    ("🏢 시설 현황", [
+        ("**🏢 시설 수 vs 면적 관계**", 'facility_scatter'),
+        ("**📐 시설당 평균 면적**", 'avg_area_top10'),
+    ]),
+    ("📈 종합 분석", [
+        ("**📈 종합 분석**", 'rate_by_region'),
+    ]),
+]
+
+
+def _has(df, *columns):
+    return all(col in df.columns for col in columns)
+
+
+def _render_mode(df):
+    return 'webgl' if len(df) > WEBGL_THRESHOLD else 'auto'
+
+
+def _density_heatmap(df, x, y, title, labels):
+    """산점도 대신 격자 구간별 지역 수를 그린 밀도 그림 (크기는 DENSITY_BINS²에 비례)"""
+    import plotly.graph_objects as go
+
+    counts, x_edges, y_edges = np.histogram2d(
+        df[x].to_numpy(dtype='float64'), df[y].to_numpy(dtype='float64'), bins=DENSITY_BINS
+    )
+    counts[counts == 0] = np.nan
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=counts.T,
+        colorscale='Blues',
+        colorbar=dict(title='지역 수'),
+        hovertemplate=f"{labels[x]}: %{{x:,.0f}}<br>{labels[y]}: %{{y:,.0f}}<br>지역 수: %{{z}}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"{title} (격자 집계, {len(df):,}개 지역)",
+        xaxis_title=labels[x],
+        yaxis_title=labels[y],
+    )
+    return fig
+
+
+def rate_top10(df):
+    """수용률 상위 10개 지역 막대그래프"""
+    import plotly.express as px
+
+    if len(df) == 0:
+        return None
+    top10 = df.nlargest(min(10, len(df)), 'accpt_rt')
+    if 'regi' not in top10.columns:
+        return None
+    fig = px.bar(
+        top10, 
+        x='accpt_rt', 
+        y='regi',
+        orientation='h',
+        title="수용률 상위 지역",
+        labels={'accpt_rt': '수용률(%)', 'regi': '지역'},
+        color='accpt_rt',
+        color_continuous_scale='Greens',
+        text='accpt_rt'
+    )
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    fig.update_layout(height=400)
+    return fig
+
+
+def rate_histogram(df):
+    """수용률 분포 히스토그램"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    if len(df) > MAX_SCATTER_POINTS:
+        # 원본 값을 보내지 않고 서버에서 구간별 개수만 계산
+        counts, edges = np.histogram(df['accpt_rt'].to_numpy(dtype='float64'), bins=HISTOGRAM_BINS)
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            marker_color='skyblue',
+        ))
+        fig.update_layout(title="수용률 분포", xaxis_title='수용률(%)',
+                          yaxis_title='지역 수', bargap=0)
+    else:
+        fig = px.histogram(
+            df,
+            x='accpt_rt',
+            nbins=HISTOGRAM_BINS,
+            title="수용률 분포",
+            labels={'accpt_rt': '수용률(%)', 'count': '지역 수'},
+            color_discrete_sequence=['skyblue']
+        )
+    fig.add_vline(x=100, line_dash="dash", line_color="red", 
+                 annotation_text="100% 기준선")
+    return fig
+
+
+def population_scatter(df):
+    """대상인구 vs 대피가능인구 산점도 (100% 수용률 기준선 포함)"""
+    import plotly.express as px
+
+    if not _has(df, 'target_popl', 'shelt_abl_popl_smry'):
+        return None
+    labels = {
+        'target_popl': '대상인구(명)',
+        'shelt_abl_popl_smry': '대피가능인구(명)',
+        'pub_shelts_shelts': '시설 수'
+    }
+    if len(df) > MAX_SCATTER_POINTS:
+        fig = _density_heatmap(df, 'target_popl', 'shelt_abl_popl_smry',
+                               "대상인구 vs 대피가능인구", labels)
+    else:
+        hover_name = 'regi' if 'regi' in df.columns else None
+        size_col = 'pub_shelts_shelts' if 'pub_shelts_shelts' in df.columns else None
+        
+        fig = px.scatter(
+            df,
+            x='target_popl',
+            y='shelt_abl_popl_smry',
+            hover_name=hover_name,
+            size=size_col,
+            title="대상인구 vs 대피가능인구",
+            labels=labels,
+            render_mode=_render_mode(df)
+        )
+    # 100% 수용률 기준선
+    max_val = max(df['target_popl'].max(), df['shelt_abl_popl_smry'].max())
+    fig.add_shape(
+        type="line",
+        x0=0, y0=0, x1=max_val, y1=max_val,
+        line=dict(color="red", width=2, dash="dash"),
+    )
+    return fig
+
+
+def population_top10(df):
+    """대상인구 상위 10개 지역 막대그래프"""
+    import plotly.express as px
+
+    if not _has(df, 'target_popl', 'regi'):
+        return None
+    top_pop = df.nlargest(10, 'target_popl')
+    return px.bar(
+        top_pop,
+        x='target_popl',
+        y='regi',
+        orientation='h',
+        title="대상인구 상위 10개 지역",
+        labels={'target_popl': '대상인구(명)', 'regi': '지역'},
+        color='target_popl',
+        color_continuous_scale='Blues'
+    )
+
+
+def facility_scatter(df):
+    """공공용시설 수 vs 면적 산점도"""
+    import plotly.express as px
+
+    if not _has(df, 'pub_shelts_shelts', 'pub_shelts_area'):
+        return None
+    labels = {
+        'pub_shelts_shelts': '시설 수(개소)',
+        'pub_shelts_area': '면적(㎡)',
+        'accpt_rt': '수용률(%)'
+    }
+    if len(df) > MAX_SCATTER_POINTS:
+        return _density_heatmap(df, 'pub_shelts_shelts', 'pub_shelts_area',
+                                "공공용시설 수 vs 면적", labels)
+    hover_name = 'regi' if 'regi' in df.columns else None
+    
+    return px.scatter(
+        df,
+        x='pub_shelts_shelts',
+        y='pub_shelts_area',
+        hover_name=hover_name,
+        color='accpt_rt',
+        title="공공용시설 수 vs 면적",
+        labels=labels,
+        render_mode=_render_mode(df)
+    )
+
+
+def avg_area_top10(df):
+    """시설당 평균 면적 상위 10개 지역 막대그래프"""
+    import plotly.express as px
+
+    if not _has(df, 'pub_shelts_shelts', 'pub_shelts_area', 'regi'):
+        return None
+    df_calc = df[df['pub_shelts_shelts'] > 0]
+    if df_calc.empty:
+        return None
+    df_calc = df_calc.assign(avg_area=df_calc['pub_shelts_area'] / df_calc['pub_shelts_shelts'])
+    top_avg = df_calc.nlargest(10, 'avg_area')
+    
+    return px.bar(
+        top_avg,
+        x='avg_area',
+        y='regi',
+        orientation='h',
+        title="시설당 평균 면적 상위 10개 지역",
+        labels={'avg_area': '시설당 평균 면적(㎡)', 'regi': '지역'},
+        color='avg_area',
+        color_continuous_scale='Oranges'
+    )
+
+
+def rate_by_region(df):
+    """지역별 수용률 막대그래프
+
+    지역이 MAX_BARS 개를 넘으면 수용률 하위/상위 지역만 그리고
+    나머지는 평균 수용률의 '기타' 막대 하나로 합칩니다.
+    """
+    import plotly.express as px
+
+    if 'regi' not in df.columns:
+        return None
+    heatmap_data = df.sort_values('accpt_rt', ascending=True)
+    if len(heatmap_data) > MAX_BARS:
+        half = MAX_BARS // 2
+        rest = heatmap_data.iloc[half:-half]
+        others = pd.DataFrame({
+            'regi': [f"기타 {len(rest):,}개 지역 (평균)"],
+            'accpt_rt': [rest['accpt_rt'].mean()],
+        })
+        heatmap_data = pd.concat([
+            heatmap_data.head(half)[['regi', 'accpt_rt']].astype({'regi': object}),
+            others,
+            heatmap_data.tail(half)[['regi', 'accpt_rt']].astype({'regi': object}),
+        ], ignore_index=True)
+    
+    fig = px.bar(
+        heatmap_data,
+        x='accpt_rt',
+        y='regi',
+        orientation='h',
+        title="지역별 수용률 현황",
+        labels={'accpt_rt': '수용률(%)', 'regi': '지역'},
+        color='accpt_rt',
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(height=max(400, len(heatmap_data) * 25))
+    return fig
+
+
+CHARTS = {
+    'rate_top10': rate_top10,
+    'rate_histogram': rate_histogram,
+    'population_scatter': population_scatter,
+    'population_top10': population_top10,
+    'facility_scatter': facility_scatter,
+    'avg_area_top10': avg_area_top10,
+    'rate_by_region': rate_by_region,
+}
+
+
+def build_figure(chart_id, df):
+    """차트 ID에 해당하는 그림 생성 (그릴 수 없으면 None)"""
+    with metrics.span('figure', chart=chart_id):
+        return CHARTS[chart_id](df)
+
+
+# 연도별 추이 지표: (컬럼, 이름, 단위)
+TREND_METRICS = {
+    'accpt_rt': ('수용률', '%'),
+    'target_popl': ('대상인구', '명'),
+    'pub_shelts_shelts': ('시설 수', '개소'),
+}
+
+
+def trend_line(trends, metric, regions):
+    """선택 지역들의 연도별 값 선그래프 (trends: TrendTable.frame)"""
+    import plotly.express as px
+
+    data = trends[trends['regi'].isin(regions)]
+    if data.empty:
+        return None
+    name, unit = TREND_METRICS[metric]
+    fig = px.line(
+        data,
+        x='year',
+        y=metric,
+        color='regi',
+        markers=True,
+        title=f"연도별 {name} 추이",
+        labels={'year': '연도', metric: f'{name}({unit})', 'regi': '지역'},
+    )
+    fig.update_xaxes(dtick=1)
+    return fig
+
+
+def trend_growth(latest, metric):
+    """최근 연도 기준 지역별 연평균 증감률(CAGR) 막대그래프
+
+    지역이 MAX_BARS 개를 넘으면 증감률 하위/상위 지역만 그립니다.
+    """
+    import plotly.express as px
+
+    column = f'{metric}_cagr'
+    data = latest.dropna(subset=[column]).sort_values(column)
+    if data.empty:
+        return None
+    if len(data) > MAX_BARS:
+        half = MAX_BARS // 2
+        data = pd.concat([data.head(half), data.tail(half)])
+    name, _ = TREND_METRICS[metric]
+    fig = px.bar(
+        data,
+        x=column,
+        y='regi',
+        orientation='h',
+        title=f"지역별 {name} 연평균 증감률",
+        labels={column: '연평균 증감률(%)', 'regi': '지역'},
+        color=column,
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(height=max(400, len(data) * 25))
+    return fig
+
+
+def scenario_heatmap(national, added_axis, growth_axis, target_rate, selected=None):
+    """(추가 시설 수 × 대상인구 증감률) 조합별 전체 수용률 히트맵
+
+    national 은 scenarios.national_grid 결과(모양 (추가 시설 수, 증감률))이며,
+    목표 수용률을 색 중앙값으로 두어 미달/달성 조합이 색으로 갈립니다.
+    selected=(추가 시설 수, 증감률) 이면 현재 시나리오 위치를 표시합니다.
+    """
+    import plotly.graph_objects as go
+
+    growth_pct = np.asarray(growth_axis) * 100
+    fig = go.Figure(go.Heatmap(
+        x=growth_pct,
+        y=added_axis,
+        z=national,
+        colorscale='RdYlGn',
+        zmid=target_rate,
+        colorbar=dict(title='수용률(%)'),
+        hovertemplate="인구 증감률: %{x:.1f}%<br>추가 시설: %{y}개소<br>수용률: %{z:.1f}%<extra></extra>",
+    ))
+    if selected is not None:
+        fig.add_trace(go.Scatter(
+            x=[selected[1] * 100], y=[selected[0]], mode='markers',
+            marker=dict(symbol='x', size=12, color='black'), name='현재 시나리오',
+            hoverinfo='skip',
+        ))
+    fig.update_layout(
+        title=f"시나리오별 전체 수용률 ({len(added_axis) * len(growth_pct):,}개 조합)",
+        xaxis_title='대상인구 증감률(%)',
+        yaxis_title='지역별 추가 공공용시설(개소)',
+        showlegend=False,
+    )
+    return fig
@@ -0,0 +1,90 @@
+"""Streamlit 없이 쓰는 핵심 함수: 수집 → 전처리 → 필터링 → 집계
+
+배치 작업, 테스트, 다른 페이지에서 대시보드와 같은 계산을 재사용할 때 씁니다.
+
+    from shelter.core import load_dataset, summarize
+
+    dataset = load_dataset(service_key, 2024)
+    view = summarize(dataset, region='서울특별시', rate_range=(50, 150))
+    view.selection['accpt_rt']
+"""
+
+from shelter.api import fetch_all_pages
+from shelter.preprocess import preprocess_data
+from shelter.trends import TrendTable, load_years
+from shelter.views import (
+    ALL_REGIONS,
+    Dataset,
+    DashboardView,
+    build_view,
+    filter_predicates,
+    prepare_dataset,
+)
+
+__all__ = [
+    'ALL_REGIONS',
+    'Dataset',
+    'DashboardView',
+    'fetch_rows',
+    'load_dataset',
+    'preprocess_data',
+    'filter_dataset',
+    'rate_bounds',
+    'summarize',
+    'load_trends',
+]
+
+
+def fetch_rows(service_key, year, loader=None):
+    """연도 레코드 표 (loader를 주면 캐시를 거치고, 없으면 API를 직접 호출)"""
+    if loader is not None:
+        return loader.load(year).frame
+    return fetch_all_pages(service_key, year)
+
+
+def load_dataset(service_key, year, loader=None):
+    """연도 데이터를 받아 전처리한 Dataset"""
+    return prepare_dataset(fetch_rows(service_key, year, loader))
+
+
+def rate_bounds(df):
+    """수용률 슬라이더 범위 (수용률 정보가 없으면 None)"""
+    if 'accpt_rt' not in df.columns or df['accpt_rt'].isna().all():
+        return None
+    # float32 값을 가장 짧은 십진 표현으로 변환 (예: 45.29999923 → 45.3)
+    return float(str(df['accpt_rt'].min())), float(str(df['accpt_rt'].max()))
+
+
+def filter_dataset(dataset, region=ALL_REGIONS, rate_range=None, predicates=()):
+    """지역/수용률 범위와 추가 조건으로 필터링한 DataFrame"""
+    df = dataset.df
+    if rate_range is None:
+        rate_range = rate_bounds(df) or (0, 100)
+    conditions = filter_predicates(df, region, rate_range) + list(predicates)
+    return dataset.engine.filter(conditions)
+
+
+def summarize(dataset, region=ALL_REGIONS, rate_range=None):
+    """필터 상태에 대한 KPI/통계표/표시용 표 (DashboardView)"""
+    if rate_range is None:
+        rate_range = rate_bounds(dataset.df) or (0, 100)
+    return build_view(dataset, region, rate_range)
+
+
+def load_trends(service_key, years, loader=None, table=None):
+    """여러 연도를 동시에 불러와 추이 표(TrendTable)에 반영
+
+    table을 주면 바뀐 연도만 갱신합니다. 불러오지 못한 연도는 건너뜁니다.
+    """
+    table = table if table is not None else TrendTable()
+    if loader is not None:
+        results = load_years(loader.load, years)
+        for year, result in sorted(results.items()):
+            if not result.frame.empty:
+                table.update(year, result.content_hash, *preprocess_data(result.frame))
+    else:
+        results = load_years(lambda year: fetch_all_pages(service_key, year), years)
+        for year, frame in sorted(results.items()):
+            if not frame.empty:
+                table.update(year, None, *preprocess_data(frame))
+    return table
@@ -0,0 +1,181 @@
+"""다운로드 파일 생성 (CSV / JSON / Parquet / XLSX)
+
+DataFrame을 CHUNK_SIZE 행씩 잘라 파일에 이어 쓰므로 전체 파일 문자열을
+메모리에 따로 만들지 않으며, 여러 연도의 데이터를 한 파일로 이어 쓸 수 있습니다.
+"""
+
+import tempfile
+from dataclasses import dataclass
+
+import pandas as pd
+
+from shelter.preprocess import SCHEMA
+from shelter.views import display_frame
+
+CHUNK_SIZE = 50_000
+# 이 크기까지는 메모리에, 넘으면 임시 파일에 기록
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class _CsvWriter:
+    """한글 컬럼명 CSV (Excel 호환을 위해 UTF-8 BOM 포함)"""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.header = True
+        fp.write('\ufeff'.encode('utf-8'))
+
+    def write(self, chunk):
+        text = display_frame(chunk).to_csv(index=False, header=self.header)
+        self.fp.write(text.encode('utf-8'))
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class _JsonWriter:
+    """레코드 배열 JSON"""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.first = True
+        fp.write(b'[')
+
+    def write(self, chunk):
+        records = chunk.to_json(orient='records', force_ascii=False, double_precision=4)
+        # 청크별 배열의 대괄호를 떼고 하나의 배열로 이어 붙임
+        body = records[1:-1]
+        if not body:
+            return
+        if not self.first:
+            self.fp.write(b',')
+        self.fp.write(body.encode('utf-8'))
+        self.first = False
+
+    def close(self):
+        self.fp.write(b']')
+
+
+def _arrow_type(col):
+    """전처리 스키마 컬럼의 Parquet 타입 (스키마에 없는 컬럼은 None)
+
+    정수는 연도마다 int32/int64(범위 초과 시 승격)로 달라질 수 있어 int64 로,
+    범주형은 연도마다 범주가 달라도 같도록 문자열로 저장합니다.
+    """
+    import pyarrow as pa
+
+    schema_dtype = SCHEMA.get(col)
+    if schema_dtype is None:
+        return None
+    if schema_dtype == 'category':
+        return pa.string()
+    if pd.api.types.is_integer_dtype(schema_dtype):
+        return pa.int64()
+    return pa.from_numpy_dtype(schema_dtype)
+
+
+class _ParquetWriter:
+    """청크마다 row group 하나를 쓰는 Parquet
+
+    파일 스키마는 첫 청크의 컬럼에 빠진 전처리 스키마 컬럼을 더해 정하고,
+    이후 청크는 그 스키마에 맞춰 변환합니다 (없는 컬럼은 null, 스키마에 없는
+    추가 컬럼은 제외).
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.schema = None
+        self.writer = None
+
+    def _schema(self, chunk):
+        import pyarrow as pa
+
+        inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+        fields = [pa.field(col, _arrow_type(col) or inferred.field(col).type)
+                  for col in chunk.columns]
+        fields += [pa.field(col, _arrow_type(col))
+                   for col in SCHEMA if col not in chunk.columns]
+        return pa.schema(fields)
+
+    def write(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            self.schema = self._schema(chunk)
+            self.writer = pq.ParquetWriter(self.fp, self.schema)
+        arrays = []
+        for field in self.schema:
+            if field.name not in chunk.columns:
+                arrays.append(pa.nulls(len(chunk), field.type))
+                continue
+            values = chunk[field.name]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(str)
+            arrays.append(pa.array(values, type=field.type, from_pandas=True))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _XlsxWriter:
+    """한글 컬럼명 XLSX (openpyxl write-only 모드로 행 단위 기록)"""
+
+    def __init__(self, fp):
+        from openpyxl import Workbook
+
+        self.fp = fp
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("주민대피시설현황")
+        self.header = True
+
+    def write(self, chunk):
+        chunk = display_frame(chunk)
+        if self.header:
+            self.sheet.append(list(chunk.columns))
+            self.header = False
+        for row in chunk.itertuples(index=False, name=None):
+            self.sheet.append([value.item() if hasattr(value, 'item') else value
+                               for value in row])
+
+    def close(self):
+        self.workbook.save(self.fp)
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    label: str
+    extension: str
+    mime: str
+    writer: type
+
+
+EXPORT_FORMATS = {
+    'csv': ExportFormat("📁 CSV", 'csv', "text/csv", _CsvWriter),
+    'json': ExportFormat("📄 JSON", 'json', "application/json", _JsonWriter),
+    'parquet': ExportFormat("🧱 Parquet", 'parquet', "application/vnd.apache.parquet", _ParquetWriter),
+    'xlsx': ExportFormat(
+        "📊 Excel (XLSX)", 'xlsx',
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", _XlsxWriter,
+    ),
+}
+
+
+def write_export(frames, fmt, fp, chunk_size=CHUNK_SIZE):
+    """DataFrame 목록(또는 제너레이터)을 청크 단위로 fp에 기록"""
+    writer = EXPORT_FORMATS[fmt].writer(fp)
+    for df in frames:
+        for start in range(0, len(df), chunk_size):
+            writer.write(df.iloc[start:start + chunk_size])
+    writer.close()
+
+
+def export_bytes(frames, fmt, chunk_size=CHUNK_SIZE):
+    """내보낸 파일 내용 (청크는 임시 파일에 먼저 쓰고 마지막에 한 번만 읽음)"""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as fp:
+        write_export(frames, fmt, fp, chunk_size)
+        fp.seek(0)
+        return fp.read()
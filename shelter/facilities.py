@@ -0,0 +1,184 @@
+"""시설 단위 대피시설 데이터와 가까운 대피시설 검색
+
+좌표는 연속된 NumPy 배열로 보관하고, 위도/경도 격자 인덱스를 한 번만 만들어
+반경 검색과 최근접 N개 검색을 벡터화한 하버사인 거리로 처리합니다.
+
+    facilities = load_facilities()
+    facilities.nearest(37.5665, 126.9780, k=5)
+    facilities.within(37.5665, 126.9780, radius_km=1.0)
+
+SHELTER_FACILITY_PATH 환경변수로 공공데이터포털에서 내려받은 CSV를 지정합니다.
+fixtures/ 의 표본 파일은 tools.synthetic 으로 만든 가상 시설(가짜 이름/주소/좌표)
+이므로 SHELTER_FACILITY_SAMPLE=1 로 명시했을 때만 씁니다 (개발/데모용).
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FACILITY_FIXTURE = Path(__file__).resolve().parent.parent / "fixtures" / "shelter_facilities_sample.csv"
+FACILITY_PATH = os.environ.get("SHELTER_FACILITY_PATH") or None
+# 1 이면 SHELTER_FACILITY_PATH 가 없을 때 가상 표본 fixture 를 씀
+USE_FACILITY_SAMPLE = os.environ.get("SHELTER_FACILITY_SAMPLE") == "1"
+
+# CSV 컬럼 → 내부 컬럼
+FACILITY_COLUMNS = {
+    '시설명': 'name',
+    '시도': 'regi',
+    '주소': 'address',
+    '위도': 'lat',
+    '경도': 'lon',
+    '시설면적': 'area',
+    '최대수용인원': 'capacity',
+}
+
+EARTH_RADIUS_KM = 6371.0088
+# 위도 1도의 거리 (km)
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# 격자 한 칸의 크기 (도, 약 5.5km)
+DEFAULT_CELL_DEGREES = 0.05
+
+
+def haversine_km(lat, lon, lats, lons):
+    """한 지점에서 여러 지점까지의 하버사인 거리 (km)"""
+    lat1 = np.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - np.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """위도/경도 균일 격자 인덱스
+
+    점들을 격자 칸 번호(행 * 열 수 + 열) 순으로 정렬해 두므로, 격자 한 행에서
+    연속한 칸들의 점은 정렬 배열의 연속 구간이 됩니다. 검색은 경계 상자가
+    걸치는 행마다 구간 하나를 잘라 후보로 씁니다.
+    """
+
+    def __init__(self, lats, lons, cell_degrees=DEFAULT_CELL_DEGREES):
+        self.cell = cell_degrees
+        self.lat0 = float(lats.min()) if len(lats) else 0.0
+        self.lon0 = float(lons.min()) if len(lons) else 0.0
+        rows = self._rows(lats)
+        cols = self._cols(lons)
+        self.n_rows = int(rows.max()) + 1 if len(rows) else 1
+        self.n_cols = int(cols.max()) + 1 if len(cols) else 1
+        cell_ids = rows * self.n_cols + cols
+        self.order = np.argsort(cell_ids, kind='stable')
+        self.sorted_ids = cell_ids[self.order]
+
+    def _rows(self, lats):
+        return np.floor((np.asarray(lats) - self.lat0) / self.cell).astype(np.int64)
+
+    def _cols(self, lons):
+        return np.floor((np.asarray(lons) - self.lon0) / self.cell).astype(np.int64)
+
+    def candidates(self, lat_min, lat_max, lon_min, lon_max):
+        """경계 상자에 걸치는 격자 칸의 점 위치 (원래 순서 기준)"""
+        row_lo, row_hi = np.clip(self._rows([lat_min, lat_max]), 0, self.n_rows - 1)
+        col_lo, col_hi = np.clip(self._cols([lon_min, lon_max]), 0, self.n_cols - 1)
+        if lat_max < self.lat0 or lon_max < self.lon0:
+            return np.empty(0, dtype=np.int64)
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self.sorted_ids, rows * self.n_cols + col_lo, side='left')
+        stops = np.searchsorted(self.sorted_ids, rows * self.n_cols + col_hi, side='right')
+        if len(rows) == 1:
+            return self.order[starts[0]:stops[0]]
+        return self.order[np.concatenate([np.arange(a, b) for a, b in zip(starts, stops)])]
+
+
+@dataclass
+class Facilities:
+    """시설 표와 좌표 배열, 격자 인덱스"""
+    frame: pd.DataFrame
+    lats: np.ndarray
+    lons: np.ndarray
+    index: GridIndex
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _box(self, lat, lon, radius_km):
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(min(abs(lat) + dlat, 89.9))), 1e-6))
+        return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+    def _result(self, positions, distances):
+        result = self.frame.take(positions)
+        result.insert(len(result.columns), 'distance_km', distances)
+        return result
+
+    def within_positions(self, lat, lon, radius_km):
+        """반경 안 시설의 (위치, 거리) — 거리 오름차순"""
+        candidates = self.index.candidates(*self._box(lat, lon, radius_km))
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def nearest_positions(self, lat, lon, k=5):
+        """가장 가까운 k개 시설의 (위치, 거리) — 거리 오름차순
+
+        격자 한 칸 반경에서 시작해, k번째 거리가 검색 반경 안에 들어올 때까지
+        반경을 두 배씩 넓힙니다. 반경 안의 점은 빠짐없이 후보에 포함되므로
+        결과는 전체 탐색과 같습니다.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        radius = self.index.cell * KM_PER_DEGREE
+        while True:
+            positions, distances = self.within_positions(lat, lon, radius)
+            if len(positions) >= k:
+                return positions[:k], distances[:k]
+            if radius > math.pi * EARTH_RADIUS_KM:
+                # 지구 반 바퀴보다 넓으면 전체 탐색
+                distances = haversine_km(lat, lon, self.lats, self.lons)
+                positions = np.argsort(distances, kind='stable')[:k]
+                return positions, distances[positions]
+            radius *= 2
+
+    def within(self, lat, lon, radius_km):
+        """반경 안의 시설 표 (distance_km 컬럼 포함)"""
+        return self._result(*self.within_positions(lat, lon, radius_km))
+
+    def nearest(self, lat, lon, k=5):
+        """가장 가까운 k개 시설 표 (distance_km 컬럼 포함)"""
+        return self._result(*self.nearest_positions(lat, lon, k))
+
+
+def prepare_facilities(frame, cell_degrees=DEFAULT_CELL_DEGREES):
+    """CSV 컬럼 표를 정리하고 좌표 배열과 격자 인덱스를 생성"""
+    df = frame.rename(columns=FACILITY_COLUMNS)
+    df = df[[col for col in FACILITY_COLUMNS.values() if col in df.columns]]
+    df = df.dropna(subset=['lat', 'lon']).reset_index(drop=True)
+    if 'regi' in df.columns:
+        df['regi'] = df['regi'].astype('category')
+    lats = np.ascontiguousarray(df['lat'].to_numpy(dtype='float64'))
+    lons = np.ascontiguousarray(df['lon'].to_numpy(dtype='float64'))
+    return Facilities(df, lats, lons, GridIndex(lats, lons, cell_degrees))
+
+
+def facility_source():
+    """(시설 CSV 경로, 가상 표본 여부) — 쓸 수 있는 데이터가 없으면 (None, False)"""
+    if FACILITY_PATH:
+        return FACILITY_PATH, False
+    if USE_FACILITY_SAMPLE:
+        return str(FACILITY_FIXTURE), True
+    return None, False
+
+
+def load_facilities(path=None, cell_degrees=DEFAULT_CELL_DEGREES):
+    """CSV 파일(기본: facility_source() 경로)에서 시설 데이터 로드"""
+    path = path or facility_source()[0]
+    if path is None:
+        raise FileNotFoundError("SHELTER_FACILITY_PATH 가 지정되지 않았습니다")
+    frame = pd.read_csv(path, encoding='utf-8-sig')
+    return prepare_facilities(frame, cell_degrees)
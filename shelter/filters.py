@@ -0,0 +1,173 @@
+"""데이터셋당 한 번 만드는 인덱스 기반 필터 엔진
+
+수치 컬럼은 정렬된 값 배열에서 searchsorted로 범위를 찾고, 범주 컬럼은
+값 → 행 위치 인덱스로 찾습니다. 조건은 행 위치 배열로 결합하고 마지막에
+한 번만 DataFrame을 잘라냅니다.
+
+    engine = FilterEngine(df)
+    engine.filter([Equals('regi', '서울특별시'), Between('accpt_rt', 50, 100)])
+    engine.filter([Between('target_popl', 1_000_000, None)])  # 인구 구간
+
+같은 인덱스로 정렬 순서(order)와 범주 이름 검색(search)도 제공하므로,
+상세 표의 정렬/검색도 행을 다시 정렬하거나 문자열을 행마다 비교하지 않습니다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Equals:
+    """column == value"""
+
+    column: str
+    value: object
+
+
+@dataclass(frozen=True)
+class Between:
+    """low <= column <= high (None이면 해당 쪽 경계 없음)"""
+
+    column: str
+    low: float = None
+    high: float = None
+
+
+class _SortedIndex:
+    """정렬된 값과 원래 행 위치"""
+
+    def __init__(self, values):
+        self.order = np.argsort(values, kind='stable')
+        self.sorted = values[self.order]
+        # 결측(NaN)은 정렬 시 뒤쪽에 모이며 어떤 범위 조건도 만족하지 않음
+        self.valid = len(self.sorted)
+        if self.sorted.dtype.kind == 'f':
+            self.valid -= int(np.isnan(self.sorted).sum())
+
+    def _bound(self, value):
+        # float32 컬럼은 경계값도 float32로 맞춰 DataFrame 비교와 같은 결과를 냄
+        if self.sorted.dtype.kind == 'f':
+            return self.sorted.dtype.type(value)
+        return value
+
+    def between(self, low, high):
+        start = 0 if low is None else np.searchsorted(self.sorted, self._bound(low), side='left')
+        if high is not None:
+            stop = np.searchsorted(self.sorted[:self.valid], self._bound(high), side='right')
+        elif low is not None:
+            stop = self.valid
+        else:
+            stop = len(self.sorted)
+        return self.order[start:stop]
+
+
+class _ValueIndex:
+    """값 → 행 위치 (값별로 연속된 구간에 저장)"""
+
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, categories = pd.factorize(series, sort=False)
+        self.order = np.argsort(codes, kind='stable')
+        self.categories = pd.Index(categories)
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        # 결측(-1) 코드는 정렬 시 앞쪽에 모이므로 그만큼 건너뜀
+        self.bounds = int((codes < 0).sum()) + np.concatenate([[0], np.cumsum(counts)])
+
+    def equals(self, value):
+        code = self.categories.get_indexer([value])[0]
+        if code < 0:
+            return self.order[:0]
+        return self.order[self.bounds[code]:self.bounds[code + 1]]
+
+    def _gather(self, codes):
+        """범주 codes 의 구간을 주어진 순서대로 이어 붙인 행 위치 (범주별 반복 없음)"""
+        starts = self.bounds[:-1][codes]
+        lengths = self.bounds[1:][codes] - starts
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.order[offsets + np.arange(lengths.sum())]
+
+    def matching(self, mask):
+        """mask(범주별 bool)가 참인 범주들의 행 위치"""
+        return self._gather(np.flatnonzero(mask))
+
+    def ranked_order(self):
+        """범주 이름순으로 정렬한 행 위치 (결측은 맨 뒤)"""
+        by_name = np.argsort(np.asarray(self.categories.astype(str)), kind='stable')
+        return np.concatenate([self._gather(by_name), self.order[:self.bounds[0]]])
+
+
+class FilterEngine:
+    """DataFrame 하나에 대한 인덱스 모음과 조건 결합
+
+    인덱스는 처음 쓰일 때 만들어 보관하므로 새 조건 컬럼을 추가해도
+    엔진을 다시 만들 필요가 없습니다.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._sorted = {}
+        self._values = {}
+        self._orders = {}
+
+    def _value_index(self, column):
+        index = self._values.get(column)
+        if index is None:
+            index = self._values[column] = _ValueIndex(self.df[column])
+        return index
+
+    def _sorted_index(self, column):
+        index = self._sorted.get(column)
+        if index is None:
+            index = self._sorted[column] = _SortedIndex(self.df[column].to_numpy())
+        return index
+
+    def positions(self, predicate):
+        """조건을 만족하는 행 위치 배열 (정렬되지 않음)"""
+        column = predicate.column
+        if isinstance(predicate, Between):
+            return self._sorted_index(column).between(predicate.low, predicate.high)
+        if isinstance(predicate, Equals):
+            return self._value_index(column).equals(predicate.value)
+        raise TypeError(f"지원하지 않는 조건입니다: {predicate!r}")
+
+    def order(self, column):
+        """column 오름차순 행 위치 (수치는 값, 범주/문자열은 이름순)"""
+        order = self._orders.get(column)
+        if order is None:
+            series = self.df[column]
+            if pd.api.types.is_numeric_dtype(series):
+                order = self._sorted_index(column).order
+            else:
+                order = self._value_index(column).ranked_order()
+            self._orders[column] = order
+        return order
+
+    def search(self, column, text):
+        """column 값에 text 가 들어 있는 행 위치 (대소문자 무시, 값 종류마다 한 번 비교)"""
+        index = self._value_index(column)
+        mask = index.categories.astype(str).str.contains(text, case=False, regex=False)
+        return index.matching(np.asarray(mask))
+
+    def select(self, predicates):
+        """모든 조건을 만족하는 행 위치 (원래 순서, 조건이 없으면 None)"""
+        selected = None
+        # 결과가 작은 조건부터 교집합
+        for positions in sorted((self.positions(p) for p in predicates), key=len):
+            if selected is None:
+                selected = np.sort(positions)
+            else:
+                selected = selected[np.isin(selected, positions, assume_unique=True)]
+            if len(selected) == 0:
+                break
+        return selected
+
+    def filter(self, predicates):
+        """조건을 만족하는 행만 담은 DataFrame (전체가 선택되면 원본 그대로)"""
+        selected = self.select(predicates)
+        if selected is None or len(selected) == len(self.df):
+            return self.df
+        return self.df.take(selected)
@@ -0,0 +1,218 @@
+"""디스크 캐시와 API 호출을 묶은 연도별 데이터 로더"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+
+import pandas as pd
+
+from shelter import metrics
+from shelter.api import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_NUM_OF_ROWS,
+    create_session,
+    fetch_pages,
+    is_transient_error,
+    merge_pages,
+)
+from shelter.cache import FRESH, STALE, ShelterCache
+from shelter.resilience import CircuitBreaker, SingleFlight, retry_with_backoff
+
+
+@dataclass
+class LoadResult:
+    """연도별 로드 결과"""
+
+    year: int
+    # 페이지를 합친 컬럼 배열 표 (API 레코드 한 건이 한 행)
+    frame: pd.DataFrame
+    fetched_at: float
+    # TTL이 지나 백그라운드 갱신 중인 데이터인지 여부
+    stale: bool = False
+    # 'memory', 'disk' 또는 'network'
+    source: str = "network"
+    # 업스트림 장애로 마지막 정상 데이터를 대신 돌려준 경우의 오류 메시지
+    error: str = None
+    # 페이지 내용 해시 (내용이 같으면 다시 받아와도 같은 값, 하위 캐시의 데이터 버전)
+    content_hash: str = None
+
+
+class ShelterLoader:
+    """디스크 캐시를 먼저 확인하고 필요할 때만 API를 호출하는 로더
+
+    TTL이 지났지만 max_stale 이내인 데이터는 바로 돌려주고
+    백그라운드 스레드에서 다시 받아옵니다 (stale-while-revalidate).
+    업스트림 호출은 (service_key, year) 별로 한 번만 실행되며(single-flight),
+    재시도와 서킷 브레이커를 거칩니다. 호출이 실패하면 만료된 캐시라도
+    마지막 정상 데이터를 돌려줍니다. 다시 받아온 내용이 이전과 같으면
+    (content_hash 가 같으면) 합친 표를 새로 만들지 않고 이전 표를 재사용합니다.
+    """
+
+    def __init__(self, service_key, cache=None, num_of_rows=DEFAULT_NUM_OF_ROWS,
+                 max_workers=DEFAULT_MAX_WORKERS, url=None, retries=3,
+                 breaker=None):
+        self.service_key = service_key
+        self.cache = cache or ShelterCache()
+        self.num_of_rows = num_of_rows
+        self.max_workers = max_workers
+        self.url = url
+        self.retries = retries
+        self.breaker = breaker or CircuitBreaker()
+        self.session = create_session(max_workers)
+        self._flight = SingleFlight()
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        # 연도별 마지막 신선한 결과 (재실행마다 디스크를 읽지 않도록 메모리에 보관)
+        self._memory = {}
+
+    def load(self, year):
+        """연도 데이터를 캐시 정책에 따라 반환 (메모리 → 디스크 → API 순)"""
+        with metrics.span('loader.load') as span:
+            result = self._load(year)
+            span.set(year=year, source=result.source, stale=result.stale)
+        metrics.count('loader_results', source=result.source)
+        return result
+
+    def _current_memo(self, year):
+        """메모리 결과가 디스크 캐시와 같은 내용일 때만 반환
+
+        다른 프로세스가 새 내용으로 갱신했거나 캐시를 무효화했으면 None 입니다.
+        """
+        memo = self._memory.get(year)
+        if memo is None or self.cache.year_hash(year, self.num_of_rows) != memo.content_hash:
+            return None
+        return memo
+
+    def _load(self, year):
+        memo = self._current_memo(year)
+        if memo is not None and self.cache.policy.state(year, memo.fetched_at) == FRESH:
+            return memo
+
+        cached = self.cache.get_year(year, self.num_of_rows)
+        if cached is not None:
+            pages, fetched_at, content_hash = cached
+            state = self.cache.policy.state(year, fetched_at)
+            if state == FRESH:
+                result = LoadResult(year, self._merge(year, pages, content_hash), fetched_at,
+                                    source="disk", content_hash=content_hash)
+                self._memory[year] = replace(result, source="memory")
+                return result
+            if state == STALE:
+                self._revalidate_async(year)
+                return LoadResult(year, self._merge(year, pages, content_hash), fetched_at,
+                                  stale=True, source="disk", content_hash=content_hash)
+
+        try:
+            return self.refresh(year)
+        except Exception as e:
+            if cached is None:
+                raise
+            # 업스트림 장애: 만료된 캐시라도 마지막 정상 데이터를 반환
+            pages, fetched_at, content_hash = cached
+            return LoadResult(year, self._merge(year, pages, content_hash), fetched_at,
+                              stale=True, source="disk", error=str(e),
+                              content_hash=content_hash)
+
+    def cached(self, year):
+        """네트워크 호출 없이 메모리/디스크에 있는 데이터만 반환 (없으면 None)"""
+        memo = self._current_memo(year)
+        if memo is not None:
+            return memo
+        cached = self.cache.get_year(year, self.num_of_rows)
+        if cached is None:
+            return None
+        pages, fetched_at, content_hash = cached
+        state = self.cache.policy.state(year, fetched_at)
+        return LoadResult(year, self._merge(year, pages, content_hash), fetched_at,
+                          stale=state != FRESH, source="disk", content_hash=content_hash)
+
+    def _merge(self, year, pages, content_hash):
+        """페이지를 합친 표 (메모리에 같은 내용의 표가 있으면 그대로 재사용)"""
+        memo = self._memory.get(year)
+        if memo is not None and memo.content_hash == content_hash:
+            return memo.frame
+        return merge_pages(pages)
+
+    def refresh(self, year):
+        """캐시를 무시하고 API에서 다시 받아 디스크에 기록
+
+        같은 (service_key, year) 호출이 진행 중이면 새로 호출하지 않고 그 결과를 기다립니다.
+        """
+        return self._keep(year, *self._fetch_shared(year))
+
+    def prefetch(self, year, force=False):
+        """디스크 캐시만 채움 (백그라운드 갱신용, 반환값의 frame 은 None)
+
+        디스크 캐시가 신선하면(force 가 아니면) 페이지를 읽지 않고 연도 해시와
+        첫 페이지 메타데이터만 확인합니다. 표를 합치거나 메모리에 새로 보관하지
+        않으므로 레플리카마다 모든 연도의 표를 들고 있지 않습니다 (이미 메모리에
+        있는 연도는 새 내용으로 교체).
+        """
+        if not force:
+            info = self.cache.year_info(year, self.num_of_rows)
+            if info is not None and self.cache.policy.state(year, info[0]) == FRESH:
+                return LoadResult(year, None, info[0], source="disk", content_hash=info[1])
+        pages, fetched_at, content_hash = self._fetch_shared(year)
+        if year in self._memory:
+            self._keep(year, pages, fetched_at, content_hash)
+        return LoadResult(year, None, fetched_at, content_hash=content_hash)
+
+    def _keep(self, year, pages, fetched_at, content_hash):
+        """받아온 페이지로 결과를 만들어 메모리에 보관"""
+        result = LoadResult(year, self._merge(year, pages, content_hash), fetched_at,
+                            content_hash=content_hash)
+        self._memory[year] = replace(result, source="memory")
+        return result
+
+    def _fetch_shared(self, year):
+        return self._flight.do((self.service_key, year), lambda: self._fetch(year))
+
+    def _fetch(self, year):
+        """API에서 모든 페이지를 받아 디스크에 기록하고 (pages, fetched_at, content_hash) 반환"""
+        total_count, pages = self.breaker.call(lambda: retry_with_backoff(
+            lambda: fetch_pages(
+                self.service_key, year, self.num_of_rows, self.max_workers,
+                session=self.session, url=self.url,
+            ),
+            retries=self.retries,
+            is_retryable=is_transient_error,
+        ))
+        fetched_at = time.time()
+        content_hash = self.cache.put_year(year, self.num_of_rows, total_count, pages, fetched_at)
+        memo = self._memory.get(year)
+        unchanged = memo is not None and memo.content_hash == content_hash
+        metrics.count('loader_refreshes', content='unchanged' if unchanged else 'changed')
+        return pages, fetched_at, content_hash
+
+    def forget(self, year=None):
+        """메모리에 보관한 결과만 버림 (디스크 캐시는 유지)"""
+        if year is None:
+            self._memory.clear()
+        else:
+            self._memory.pop(year, None)
+
+    def invalidate(self, year=None):
+        self.forget(year)
+        return self.cache.invalidate(year)
+
+    def _revalidate_async(self, year):
+        """연도별로 한 번만 백그라운드 갱신 스레드를 띄움"""
+        with self._lock:
+            if year in self._revalidating:
+                return
+            self._revalidating.add(year)
+
+        def run():
+            try:
+                # 디스크 캐시만 갱신 (메모리에 없던 연도를 새로 들고 있지 않도록)
+                self.prefetch(year, force=True)
+            except Exception:
+                # 갱신 실패 시 기존 캐시를 유지하고 다음 요청에서 재시도
+                pass
+            finally:
+                with self._lock:
+                    self._revalidating.discard(year)
+
+        # 요청한 재실행의 계측 설정을 따르도록 컨텍스트를 넘김
+        threading.Thread(target=metrics.propagate(run), name=f"shelter-revalidate-{year}",
+                         daemon=True).start()
@@ -0,0 +1,214 @@
+"""시설 지도: 줌 단계별 서버 집계와 화면 범위(viewport) 안의 클러스터만 그리기
+
+시설 수와 무관하게 지도에 그리는 마커는 MAX_MARKERS 개 이하로 유지합니다.
+
+    pyramid = ClusterPyramid(facilities)
+    clusters = pyramid.viewport(zoom=9, bounds=(south, west, north, east))
+    layer = cluster_layer(clusters)
+
+folium은 지도를 실제로 만들 때 불러옵니다. 시도 경계 GeoJSON은
+SHELTER_BOUNDARY_PATH 환경변수로 지정하며, 없으면 시도별 시설 중심점에
+수용률 색 원을 그립니다.
+"""
+
+import json
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+BOUNDARY_PATH = os.environ.get("SHELTER_BOUNDARY_PATH")
+# GeoJSON feature에서 시도명을 담은 속성 이름
+BOUNDARY_NAME_KEY = os.environ.get("SHELTER_BOUNDARY_NAME_KEY", "name")
+
+# 전국이 보이는 기본 화면 (남, 서, 북, 동)
+KOREA_BOUNDS = (33.0, 124.5, 38.7, 131.0)
+DEFAULT_CENTER = (36.3, 127.8)
+DEFAULT_ZOOM = 7
+MIN_ZOOM = 5
+# 이 줌 이상에서 화면 안 시설이 MAX_MARKERS 이하면 개별 시설을 그림
+POINT_ZOOM = 14
+# 화면에 그리는 최대 마커 수
+MAX_MARKERS = 500
+# 클러스터 한 칸의 화면 크기 (픽셀)
+CLUSTER_PIXELS = 64
+TILE_PIXELS = 256
+
+# 수용률 색 범위 (%)
+RATE_COLORS = ['#d73027', '#fee08b', '#1a9850']
+RATE_RANGE = (0, 200)
+
+
+def cell_degrees(zoom, cell_pixels=CLUSTER_PIXELS):
+    """줌 단계에서 클러스터 한 칸의 크기 (도)"""
+    return 360 / (TILE_PIXELS * 2 ** zoom) * cell_pixels
+
+
+def _in_bounds(lats, lons, bounds):
+    south, west, north, east = bounds
+    return (lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)
+
+
+class ClusterPyramid:
+    """줌 단계별 격자 집계 (처음 요청한 단계만 계산하고 보관)"""
+
+    def __init__(self, facilities, max_zoom=POINT_ZOOM):
+        self.facilities = facilities
+        self.max_zoom = max_zoom
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    def level(self, zoom):
+        """줌 단계의 클러스터 표 (lat, lon, count, capacity)"""
+        zoom = int(min(max(zoom, MIN_ZOOM), self.max_zoom))
+        with self._lock:
+            if zoom not in self._levels:
+                self._levels[zoom] = self._aggregate(cell_degrees(zoom))
+            return self._levels[zoom]
+
+    def _aggregate(self, cell):
+        facilities = self.facilities
+        lats, lons = facilities.lats, facilities.lons
+        rows = np.floor(lats / cell).astype(np.int64)
+        cols = np.floor(lons / cell).astype(np.int64)
+        keys = (rows - rows.min()) * (cols.max() - cols.min() + 1) + (cols - cols.min()) if len(rows) else rows
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        capacity = (facilities.frame['capacity'].to_numpy(dtype='float64')
+                    if 'capacity' in facilities.frame.columns else np.zeros(len(lats)))
+        return pd.DataFrame({
+            # 칸 중심이 아닌 시설 좌표 평균에 그려 실제 분포를 따라가게 함
+            'lat': np.bincount(inverse, weights=lats) / counts,
+            'lon': np.bincount(inverse, weights=lons) / counts,
+            'count': counts,
+            'capacity': np.bincount(inverse, weights=capacity).astype(np.int64),
+        })
+
+    def viewport(self, zoom, bounds=KOREA_BOUNDS, max_markers=MAX_MARKERS):
+        """화면 범위 안에 그릴 클러스터 (많으면 시설 수가 큰 순으로 max_markers 개)
+
+        POINT_ZOOM 이상에서 화면 안 시설이 max_markers 이하면 count=1 인 개별 시설을 반환합니다.
+        """
+        if zoom >= self.max_zoom:
+            points = self._points(bounds)
+            if len(points) <= max_markers:
+                return points
+        clusters = self.level(zoom)
+        visible = clusters[_in_bounds(clusters['lat'].to_numpy(), clusters['lon'].to_numpy(), bounds)]
+        if len(visible) > max_markers:
+            top = np.argpartition(-visible['count'].to_numpy(), max_markers - 1)[:max_markers]
+            visible = visible.iloc[np.sort(top)]
+        return visible
+
+    def _points(self, bounds):
+        facilities = self.facilities
+        south, west, north, east = bounds
+        candidates = facilities.index.candidates(south, north, west, east)
+        inside = candidates[_in_bounds(facilities.lats[candidates], facilities.lons[candidates], bounds)]
+        frame = facilities.frame
+        return pd.DataFrame({
+            'lat': facilities.lats[inside],
+            'lon': facilities.lons[inside],
+            'count': 1,
+            'capacity': frame['capacity'].to_numpy()[inside] if 'capacity' in frame.columns else 0,
+            'name': frame['name'].to_numpy()[inside] if 'name' in frame.columns else '',
+        })
+
+
+def parse_bounds(bounds):
+    """st_folium 의 bounds 값을 (남, 서, 북, 동) 으로 변환 (없으면 None)"""
+    try:
+        south_west, north_east = bounds['_southWest'], bounds['_northEast']
+        return (south_west['lat'], south_west['lng'], north_east['lat'], north_east['lng'])
+    except (KeyError, TypeError):
+        return None
+
+
+def rate_colormap():
+    """수용률 색 척도"""
+    import branca.colormap as cm
+
+    return cm.LinearColormap(RATE_COLORS, vmin=RATE_RANGE[0], vmax=RATE_RANGE[1], caption='수용률(%)')
+
+
+def load_boundaries(path=None):
+    """시도 경계 GeoJSON (경로가 없으면 None)"""
+    path = path or BOUNDARY_PATH
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def region_centers(facilities):
+    """시도별 시설 좌표 평균 (경계 GeoJSON이 없을 때 수용률 표시 위치)"""
+    frame = facilities.frame
+    return frame.groupby('regi', observed=True)[['lat', 'lon']].mean()
+
+
+def base_map(rates, boundaries=None, centers=None, center=DEFAULT_CENTER, zoom=DEFAULT_ZOOM):
+    """시도별 수용률 레이어를 얹은 배경 지도
+
+    rates: {시도명: 수용률}. 경계(boundaries)가 있으면 단계구분도로,
+    없으면 시도 중심점(centers)에 색 원으로 그립니다.
+    클러스터는 화면마다 바뀌므로 cluster_layer 로 따로 만듭니다.
+    """
+    import folium
+
+    fmap = folium.Map(location=center, zoom_start=zoom, min_zoom=MIN_ZOOM, control_scale=True)
+    colormap = rate_colormap()
+    layer = folium.FeatureGroup(name='시도별 수용률')
+
+    def color(rate):
+        return '#cccccc' if rate is None or math.isnan(rate) else colormap(min(max(rate, RATE_RANGE[0]), RATE_RANGE[1]))
+
+    if boundaries is not None:
+        folium.GeoJson(
+            boundaries,
+            style_function=lambda feature: {
+                'fillColor': color(rates.get(feature['properties'].get(BOUNDARY_NAME_KEY))),
+                'color': '#555555',
+                'weight': 1,
+                'fillOpacity': 0.5,
+            },
+            tooltip=folium.GeoJsonTooltip(fields=[BOUNDARY_NAME_KEY], labels=False),
+        ).add_to(layer)
+    elif centers is not None:
+        for regi, (lat, lon) in centers.iterrows():
+            rate = rates.get(regi)
+            folium.CircleMarker(
+                location=(lat, lon),
+                radius=18,
+                color=color(rate),
+                fill=True,
+                fill_opacity=0.35,
+                tooltip=f"{regi}: {rate:.1f}%" if rate is not None else regi,
+            ).add_to(layer)
+    layer.add_to(fmap)
+    colormap.add_to(fmap)
+    return fmap
+
+
+def cluster_layer(clusters):
+    """클러스터/개별 시설 마커 레이어"""
+    import folium
+
+    layer = folium.FeatureGroup(name='대피시설')
+    counts = clusters['count'].to_numpy()
+    radii = 4 + 3 * np.log2(np.maximum(counts, 1))
+    names = clusters['name'].to_numpy() if 'name' in clusters.columns else None
+    for i, (lat, lon, count, capacity) in enumerate(
+        clusters[['lat', 'lon', 'count', 'capacity']].itertuples(index=False)
+    ):
+        label = names[i] if names is not None else f"{count:,}개소"
+        folium.CircleMarker(
+            location=(lat, lon),
+            radius=float(radii[i]),
+            color='#2b5797',
+            weight=1,
+            fill=True,
+            fill_opacity=0.6,
+            tooltip=f"{label} · 수용 {capacity:,}명",
+        ).add_to(layer)
+    return layer
@@ -0,0 +1,54 @@
+"""Streamlit 재실행 사이에 결과를 재사용하기 위한 LRU 캐시"""
+
+import threading
+from collections import OrderedDict
+
+from shelter import metrics
+
+
+class LRUCache:
+    """최대 maxsize 개까지 보관하는 스레드 안전 LRU 캐시
+
+    저장된 값은 복사하지 않고 그대로 돌려주므로 호출 측에서 수정하면 안 됩니다.
+    name을 주면 적중/미스를 계측 카운터(cache_hits/cache_misses)에도 기록합니다.
+    """
+
+    def __init__(self, maxsize=64, name=None):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """key의 값을 반환하고, 없으면 compute()로 계산해 저장"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                if self.name:
+                    metrics.count('cache_hits', cache=self.name)
+                return self._data[key]
+            self.misses += 1
+        if self.name:
+            metrics.count('cache_misses', cache=self.name)
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
@@ -0,0 +1,318 @@
+"""핫패스 구간 시간 측정과 카운터, 지연 히스토그램
+
+    from shelter import metrics
+
+    with metrics.span('preprocess'):
+        ...
+    metrics.count('cache_hit', cache='view')
+
+기본값은 꺼져 있으며, 꺼져 있으면 span()은 아무 일도 하지 않는 공용 객체를
+돌려주므로 부하가 사실상 없습니다. SHELTER_METRICS=1 이나 enable()은 프로세스
+전체를 켜고, scoped()는 with 블록 안(같은 스레드/컨텍스트)만 켭니다. 블록 안에서
+스레드로 넘기는 작업은 propagate()로 감싸야 같은 설정으로 계측됩니다.
+
+    with metrics.scoped(panel_open):     # 예: 성능 패널을 켠 세션의 재실행만
+        ...
+
+    SHELTER_METRICS_LOG=metrics.jsonl    구간마다 JSON 한 줄 기록
+    SHELTER_METRICS_PORT=9108            Prometheus 텍스트 형식 /metrics 제공
+    SHELTER_METRICS_HOST=127.0.0.1       /metrics 를 열 주소 (기본값은 로컬만)
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 지연 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 패널에 보여 줄 최근 구간 수
+RECENT_SPANS = 200
+PREFIX = "shelter"
+
+
+class _NoopSpan:
+    """계측이 꺼져 있을 때 쓰는 빈 컨텍스트 매니저"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **labels):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram 과 같은 구조)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+        self.last = value
+
+    def quantile(self, q):
+        """구간 상한으로 근사한 분위수 (마지막 구간은 최댓값)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for upper, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+
+
+class Registry:
+    """구간 히스토그램, 카운터, 게이지(마지막 값)를 보관"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.values = {}
+        self.recent = deque(maxlen=RECENT_SPANS)
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name, n=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self.values[(name, _label_key(labels))] = value
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.values.clear()
+            self.recent.clear()
+
+
+REGISTRY = Registry()
+_enabled = os.environ.get("SHELTER_METRICS", "") not in ("", "0")
+_log_path = os.environ.get("SHELTER_METRICS_LOG")
+_log_lock = threading.Lock()
+# scoped() 로 현재 컨텍스트에서만 켠 상태
+_scoped = ContextVar("shelter_metrics_scoped", default=False)
+
+
+def enabled():
+    return _enabled or _scoped.get()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+@contextmanager
+def scoped(on=True):
+    """with 블록 안(같은 스레드/컨텍스트)에서만 계측을 켬
+
+    다른 스레드와 블록 밖의 호출은 프로세스 설정(enable/SHELTER_METRICS)을 따릅니다
+    (블록 안에서 propagate()로 감싸 넘긴 작업은 블록의 설정을 따름).
+    """
+    token = _scoped.set(bool(on))
+    try:
+        yield
+    finally:
+        _scoped.reset(token)
+
+
+def propagate(fn):
+    """fn 을 지금 컨텍스트(scoped 상태 포함)에서 실행하는 함수로 감쌈
+
+    스레드 풀/스레드에 넘기는 작업에 씁니다. 호출할 때마다 컨텍스트를 복사하므로
+    여러 스레드에서 동시에 불러도 됩니다.
+    """
+    context = copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class Span:
+    """구간 시간을 재서 레지스트리(와 JSONL 로그)에 기록
+
+    생성할 때 준 라벨은 히스토그램을 나누는 데 쓰고, set()으로 붙인 값은
+    최근 구간 목록과 로그에만 남깁니다.
+    """
+
+    __slots__ = ("name", "labels", "extra", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.extra = {}
+
+    def set(self, **values):
+        """구간 안에서 기록할 값 추가 (예: 행 수, 캐시 적중 여부)"""
+        self.extra.update(values)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.extra["error"] = exc_type.__name__
+        REGISTRY.observe(self.name, elapsed, **self.labels)
+        record = {"ts": time.time(), "span": self.name, "seconds": elapsed,
+                  **self.labels, **self.extra}
+        REGISTRY.recent.append(record)
+        if _log_path:
+            line = json.dumps(record, ensure_ascii=False, default=str)
+            with _log_lock, open(_log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return False
+
+
+def span(name, **labels):
+    """구간 시간 측정 컨텍스트 매니저 (꺼져 있으면 빈 객체)"""
+    if not (_enabled or _scoped.get()):
+        return _NOOP
+    return Span(name, labels)
+
+
+def count(name, n=1, **labels):
+    """카운터 증가 (꺼져 있으면 무시)"""
+    if _enabled or _scoped.get():
+        REGISTRY.count(name, n, **labels)
+
+
+def gauge(name, value, **labels):
+    """마지막 값 기록 (예: 표 전송 크기, 꺼져 있으면 무시)"""
+    if _enabled or _scoped.get():
+        REGISTRY.gauge(name, value, **labels)
+
+
+def _format_labels(label_key, extra=()):
+    items = list(label_key) + list(extra)
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in items)
+    return "{" + body + "}"
+
+
+def _metric_name(name):
+    return f"{PREFIX}_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+def to_prometheus(registry=REGISTRY):
+    """Prometheus 텍스트 형식 (구간은 *_seconds 히스토그램, 카운터는 *_total)"""
+    lines = []
+    typed = set()
+
+    def declare(metric, kind):
+        # 같은 이름의 시계열이 여러 개여도 TYPE 은 한 번만
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} {kind}")
+
+    with registry._lock:
+        histograms = sorted(registry.histograms.items())
+        counters = sorted(registry.counters.items())
+        values = sorted(registry.values.items())
+    for (name, label_key), histogram in histograms:
+        metric = _metric_name(name) + "_seconds"
+        declare(metric, "histogram")
+        cumulative = 0
+        for upper, n in zip(histogram.buckets, histogram.counts):
+            cumulative += n
+            lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', upper)])} {cumulative}")
+        lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', '+Inf')])} {histogram.count}")
+        lines.append(f"{metric}_sum{_format_labels(label_key)} {histogram.sum}")
+        lines.append(f"{metric}_count{_format_labels(label_key)} {histogram.count}")
+    for (name, label_key), value in counters:
+        metric = _metric_name(name) + "_total"
+        declare(metric, "counter")
+        lines.append(f"{metric}{_format_labels(label_key)} {value}")
+    for (name, label_key), value in values:
+        metric = _metric_name(name)
+        declare(metric, "gauge")
+        lines.append(f"{metric}{_format_labels(label_key)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def summary(registry=REGISTRY):
+    """구간별 요약 [{span, count, mean, p50, p95, max, last}] (초)"""
+    with registry._lock:
+        histograms = sorted(registry.histograms.items())
+    rows = []
+    for (name, label_key), histogram in histograms:
+        rows.append({
+            "span": name + _format_labels(label_key),
+            "count": histogram.count,
+            "mean": histogram.sum / histogram.count if histogram.count else None,
+            "p50": histogram.quantile(0.5),
+            "p95": histogram.quantile(0.95),
+            "max": histogram.max,
+            "last": histogram.last,
+        })
+    return rows
+
+
+def serve_prometheus(port=0, host="127.0.0.1", registry=REGISTRY):
+    """백그라운드 스레드에서 /metrics 를 제공하고 (server, url) 반환"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = to_prometheus(registry).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="shelter-metrics", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/metrics"
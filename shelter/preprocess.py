@@ -0,0 +1,111 @@
+"""API 레코드를 스키마에 맞춘 DataFrame으로 변환하는 전처리"""
+
+import numpy as np
+import pandas as pd
+
+# 컬럼별 dtype 스키마 (인원/개소/면적은 int32, 수용률은 float32, 지역은 범주형)
+SCHEMA = {
+    'bas_yy': 'int16',
+    'regi': 'category',
+    'target_popl': 'int32',
+    'accpt_rt': 'float32',
+    'shelt_abl_popl_smry': 'int32',
+    'shelt_abl_popl_gov_shelts': 'int32',
+    'shelt_abl_popl_pub_shelts': 'int32',
+    'gov_shelts_shelts': 'int32',
+    'gov_shelts_area': 'int32',
+    'pub_shelts_shelts': 'int32',
+    'pub_shelts_area': 'int32',
+}
+
+# 수치형 컬럼 리스트
+NUMERIC_COLUMNS = [col for col, dtype in SCHEMA.items() if dtype != 'category']
+
+TOTAL_REGION = '합계'
+
+
+def _to_number(series):
+    """숫자 문자열('1,234')을 float64 배열로 변환 (변환 불가/결측치는 NaN)
+
+    이미 float64 인 컬럼은 복사하지 않은 배열을 그대로 돌려주므로 호출한 쪽에서
+    고치면 안 됩니다.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    # 숫자와 문자열이 섞인 object 컬럼만 문자열로 통일
+    if series.dtype == object:
+        series = series.astype(str)
+    cleaned = series.str.replace(',', '', regex=False)
+    try:
+        return cleaned.astype('float64').to_numpy()
+    except (ValueError, TypeError):
+        return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype='float64')
+
+
+def _schema_part(values, mask, dtype):
+    """float64 컬럼의 mask 위치를 스키마 dtype 배열로 (결측치는 0)
+
+    잘라낸 부분만 임시로 복사해 그 자리에서 고치므로 컬럼 전체 복사본을 만들지
+    않습니다.
+    """
+    part = np.nan_to_num(values[mask], copy=False, nan=0.0)
+    if dtype.startswith('int'):
+        np.rint(part, out=part)
+        # 합성/집계 데이터처럼 범위를 넘는 값은 int64로 보관
+        if len(part) and max(part.max(), -part.min()) > np.iinfo(dtype).max:
+            dtype = 'int64'
+    return part.astype(dtype)
+
+
+def _categorical(series):
+    """등장 순서대로 범주를 만든 Categorical (정렬 비용 없음)"""
+    codes, categories = pd.factorize(series, sort=False)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def preprocess_data(raw_data):
+    """원시 데이터를 DataFrame으로 변환하고 전처리
+
+    raw_data는 API 레코드 목록이나 이미 컬럼 배열로 디코딩한 DataFrame입니다.
+    컬럼마다 SCHEMA에 선언된 dtype으로 바로 변환해 지역 행과 '합계' 행으로 나누고
+    (지역 데이터, 합계 행) 으로 반환합니다. 모든 컬럼의 float64 중간 결과를 함께
+    들고 있지 않으므로 최대 메모리가 결과 표 크기에 가깝습니다.
+    """
+    
+    if raw_data is None or len(raw_data) == 0:
+        return pd.DataFrame(), pd.DataFrame()
+    
+    raw = raw_data if isinstance(raw_data, pd.DataFrame) else pd.DataFrame(raw_data)
+    
+    if raw.empty:
+        return raw, pd.DataFrame()
+    
+    # '합계' 행 위치 (컬럼 존재 확인)
+    if 'regi' in raw.columns:
+        is_total = np.asarray(raw['regi'] == TOTAL_REGION)
+    else:
+        is_total = np.zeros(len(raw), dtype=bool)
+    masks = [~is_total, is_total] if is_total.any() else [~is_total]
+
+    # 스키마 기반 변환 (컬럼당 한 번, 변환 중인 컬럼 하나만 float64로 임시 보관)
+    parts = [{} for _ in masks]
+    for col in raw.columns:
+        dtype = SCHEMA.get(col)
+        if dtype == 'category':
+            values = _categorical(raw[col])
+            split = [values[mask] for mask in masks]
+        elif dtype is not None:
+            values = _to_number(raw[col])
+            split = [_schema_part(values, mask, dtype) for mask in masks]
+        else:
+            values = raw[col].to_numpy()
+            split = [values[mask] for mask in masks]
+        for columns, part in zip(parts, split):
+            columns[col] = part
+
+    frames = [pd.DataFrame(columns, index=raw.index[mask], copy=False)
+              for columns, mask in zip(parts, masks)]
+    df_filtered = frames[0]
+    total_row = frames[1] if len(frames) > 1 else pd.DataFrame()
+
+    return df_filtered, total_row
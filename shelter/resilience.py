@@ -0,0 +1,145 @@
+"""업스트림 API 보호용 유틸리티: 단일 비행(single-flight), 재시도, 서킷 브레이커"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 호출을 하나로 합침
+
+    먼저 들어온 호출만 실제로 함수를 실행하고, 나머지는 그 결과(또는 예외)를 기다립니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._waiters = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self._waiters[key] = self._waiters.get(key, 0) + 1
+
+        if not leader:
+            try:
+                return future.result()
+            finally:
+                with self._lock:
+                    remaining = self._waiters[key] - 1
+                    if remaining:
+                        self._waiters[key] = remaining
+                    else:
+                        del self._waiters[key]
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def waiters(self, key):
+        """진행 중인 호출의 결과를 기다리는 (합류한) 호출 수"""
+        with self._lock:
+            return self._waiters.get(key, 0)
+
+
+def backoff_delays(retries, base_delay=0.5, max_delay=8.0):
+    """지수 백오프 + 풀 지터(full jitter) 대기 시간 목록"""
+    return [random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            for attempt in range(retries)]
+
+
+def retry_with_backoff(fn, retries=3, base_delay=0.5, max_delay=8.0,
+                       is_retryable=lambda e: True, sleep=time.sleep):
+    """재시도 가능한 예외가 나면 지수 백오프로 최대 retries 번 다시 호출"""
+    delays = backoff_delays(retries, base_delay, max_delay)
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            sleep(delays[attempt])
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 호출을 건너뛸 때 발생하는 예외"""
+
+
+class CircuitBreaker:
+    """연속 실패가 임계치를 넘으면 reset_timeout 동안 호출을 차단
+
+    차단 시간이 지나면 한 번의 시험 호출(half-open)만 허용하고,
+    성공하면 닫히고 실패하면 다시 열립니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def call(self, fn):
+        self._before_call()
+        try:
+            result = fn()
+        except Exception:
+            self._record_failure()
+            raise
+        self._record_success()
+        return result
+
+    def _before_call(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._clock() - self._opened_at < self.reset_timeout or self._trial_running:
+                raise CircuitOpenError("업스트림 API 호출이 일시 차단되었습니다.")
+            self._state = self.HALF_OPEN
+            self._trial_running = True
+
+    def _record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
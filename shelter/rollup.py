@@ -0,0 +1,163 @@
+"""지역 계층(전국 → 시도 → 시군구) 롤업 큐브
+
+지역명 '서울특별시 종로구' 처럼 첫 단어를 시도, 나머지를 시군구로 보고
+모든 단계의 합계와 인구 가중 수용률, 시설 수를 미리 계산해 둡니다.
+원본 행은 한 번의 groupby 로 말단 지역 합계를 만들 때만 읽고, 시도와 전국은
+말단 합계에서 올려 계산합니다. 조회는 키 → 위치 dict 로 바로 찾으므로 단계를
+오가도 원본 행을 다시 훑지 않습니다. 노드 값 dict 와 하위 노드 표는 조회할 때
+만들고 보관하지 않습니다 (말단 지역이 많으면 노드마다 dict 를 들고 있는 것만으로
+레플리카마다 수백 MiB 가 듭니다).
+
+    rollup = build_rollup(df)
+    rollup.node(NATION)                  # 전국
+    rollup.children(('서울특별시',))      # 서울특별시의 시군구 목록
+
+시도 이름만 있는 행과 같은 시도의 시군구 행이 함께 있으면 시도 행은
+소계로 보고 합산에서 뺍니다 ('합계' 행을 따로 두는 것과 같은 이유).
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+NATION = ()
+LEVELS = ('nation', 'sido', 'sigungu')
+LEVEL_LABELS = {'nation': '전국', 'sido': '시도', 'sigungu': '시군구'}
+NATION_NAME = '전국'
+
+# 단계별로 더하는 컬럼 (데이터에 있는 것만 사용)
+SUM_COLUMNS = [
+    'target_popl',
+    'shelt_abl_popl_smry',
+    'shelt_abl_popl_gov_shelts',
+    'shelt_abl_popl_pub_shelts',
+    'gov_shelts_shelts',
+    'gov_shelts_area',
+    'pub_shelts_shelts',
+    'pub_shelts_area',
+]
+# 대피가능인구 계가 없을 때 수용률 가중 평균에 쓰는 임시 컬럼
+_RATE_WEIGHT = '_rate_x_popl'
+
+
+def split_region(name):
+    """지역명 → (시도, 시군구) — 시군구가 없으면 빈 문자열"""
+    sido, _, sigungu = str(name).strip().partition(' ')
+    return sido, sigungu.strip()
+
+
+@dataclass
+class RegionRollup:
+    """단계별 집계 표와 키 → 위치 색인
+
+    frame 은 노드마다 한 행이며 level, sido, sigungu, name, 합계 컬럼,
+    accpt_rt(인구 가중), shelters(정부지원+공공용 시설 수), regions(말단 지역 수)를
+    가집니다. 키는 전국 (), 시도 (시도,), 시군구 (시도, 시군구) 입니다.
+    """
+
+    frame: pd.DataFrame
+    # (시도, 시군구) → 행 위치 (전국은 ('', ''), 시도는 (시도, ''))
+    _index: pd.MultiIndex = field(repr=False)
+    # 부모 키 → 하위 노드 행 위치
+    _children: dict = field(repr=False)
+
+    def _position(self, key):
+        key = tuple(key)
+        if len(key) > 2:
+            return -1
+        return self._index.get_indexer([key + ('',) * (2 - len(key))])[0]
+
+    def node(self, key=NATION):
+        """노드 하나의 값 dict (없으면 None)"""
+        position = self._position(key)
+        return None if position < 0 else self.frame.iloc[[position]].to_dict('records')[0]
+
+    def children(self, key=NATION):
+        """바로 아래 단계 노드 표 (이름순, 없으면 빈 표)"""
+        rows = self._children.get(tuple(key))
+        return self.frame.iloc[rows] if rows is not None else self.frame.iloc[0:0]
+
+    def has_children(self, key=NATION):
+        return tuple(key) in self._children
+
+    def level(self, name):
+        """한 단계의 노드 전체 (예: 'sido')"""
+        return self.frame[self.frame['level'] == name]
+
+    def __contains__(self, key):
+        return self._position(key) >= 0
+
+
+def _derived(frame):
+    """합계 컬럼에서 수용률과 시설 수 계산"""
+    popl = frame['target_popl'] if 'target_popl' in frame.columns else None
+    if popl is not None and 'shelt_abl_popl_smry' in frame.columns:
+        numerator = frame['shelt_abl_popl_smry'] * 100
+    elif popl is not None and _RATE_WEIGHT in frame.columns:
+        numerator = frame[_RATE_WEIGHT]
+    else:
+        numerator = None
+    if numerator is not None:
+        frame['accpt_rt'] = (numerator / popl.where(popl > 0)).astype('float64')
+    shelters = [col for col in ('gov_shelts_shelts', 'pub_shelts_shelts') if col in frame.columns]
+    if shelters:
+        frame['shelters'] = frame[shelters].sum(axis=1)
+    return frame.drop(columns=[_RATE_WEIGHT], errors='ignore')
+
+
+def build_rollup(df):
+    """전처리된 지역 행으로 롤업 큐브 생성 (지역 컬럼이 없으면 None)"""
+    if df.empty or 'regi' not in df.columns:
+        return None
+
+    columns = [col for col in SUM_COLUMNS if col in df.columns]
+    values = df[columns].astype('float64')
+    if 'shelt_abl_popl_smry' not in columns and {'accpt_rt', 'target_popl'} <= set(df.columns):
+        values[_RATE_WEIGHT] = df['accpt_rt'].astype('float64') * df['target_popl']
+
+    # 말단 지역별 합계 (원본 행을 읽는 유일한 groupby)
+    codes, names = pd.factorize(df['regi'], sort=False)
+    leaf = values.groupby(codes, sort=False).sum()
+    # 같은 지역 행이 여러 개여도 말단 지역은 하나
+    leaf['regions'] = 1.0
+    names = np.asarray(names, dtype=object)[leaf.index.to_numpy()]
+
+    # 계층 분해는 행이 아니라 지역명(범주)마다 한 번
+    parts = [split_region(name) for name in names]
+    leaf.insert(0, 'sido', [sido for sido, _ in parts])
+    leaf.insert(1, 'sigungu', [sigungu for _, sigungu in parts])
+    has_sub = leaf['sigungu'] != ''
+    subdivided = set(leaf.loc[has_sub, 'sido'])
+    counted = leaf[has_sub | ~leaf['sido'].isin(subdivided)]
+
+    measures = [col for col in counted.columns if col not in ('sido', 'sigungu')]
+    sido = counted.groupby('sido', sort=True)[measures].sum().reset_index()
+    sido['sigungu'] = ''
+    sido['level'] = 'sido'
+    sido['name'] = sido['sido']
+
+    sigungu = counted[counted['sigungu'] != ''].sort_values(['sido', 'sigungu'])
+    sigungu = sigungu.assign(level='sigungu', name=sigungu['sigungu'])
+
+    nation = sido[measures].sum().to_frame().T
+    nation['sido'] = ''
+    nation['sigungu'] = ''
+    nation['level'] = 'nation'
+    nation['name'] = NATION_NAME
+
+    frame = pd.concat([nation, sido, sigungu], ignore_index=True)
+    frame = _derived(frame[['level', 'sido', 'sigungu', 'name'] + measures])
+    frame = frame.astype({col: 'int64' for col in columns + ['regions', 'shelters'] if col in frame})
+
+    index = pd.MultiIndex.from_arrays([frame['sido'], frame['sigungu']])
+    level = frame['level'].to_numpy()
+    children = {}
+    sido_rows = np.flatnonzero(level == 'sido')
+    if len(sido_rows):
+        children[NATION] = sido_rows
+    sigungu_rows = np.flatnonzero(level == 'sigungu')
+    parents = frame['sido'].to_numpy()[sigungu_rows]
+    for parent, rows in pd.Series(sigungu_rows).groupby(parents, sort=False):
+        children[(parent,)] = rows.to_numpy()
+    return RegionRollup(frame, index, children)
@@ -0,0 +1,152 @@
+"""수용률 what-if 시나리오 (공공용시설 추가, 대상인구 증감, 몬테카를로 인구 전망)
+
+    수용률(%) = 대피가능인구 ÷ 대상인구 × 100
+    대피가능인구 = 시설 면적 ÷ 1인당 면적(AREA_PER_PERSON)
+
+지역마다 공공용시설 한 곳의 평균 면적으로 시설 X곳을 더했을 때와 대상인구가
+Y% 변했을 때의 수용률을 계산합니다. 시나리오 조합은 (추가 시설 수, 인구 증감률,
+지역) 축으로 브로드캐스트한 배열 연산 한 번으로, 몬테카를로 전망은
+(표본, 지역) 배열로 계산하므로 시나리오마다 파이썬 반복을 돌지 않습니다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# 데이터의 시설 면적 ÷ 대피가능인구 비율 (모든 지역에서 0.825㎡/명)
+AREA_PER_PERSON = 0.825
+REQUIRED_COLUMNS = ('target_popl', 'shelt_abl_popl_smry', 'pub_shelts_shelts', 'pub_shelts_area')
+QUANTILES = (5, 50, 95)
+# 몬테카를로 (표본 × 지역) 배열 최대 크기 — 넘으면 표본 수를 줄임
+MAX_SAMPLE_CELLS = 5_000_000
+
+
+@dataclass
+class ScenarioBase:
+    """시나리오 계산에 쓰는 지역별 기준값 (float64 배열)"""
+
+    regions: np.ndarray
+    target_popl: np.ndarray
+    capacity: np.ndarray
+    # 공공용시설 한 곳의 평균 면적 (시설이 없는 지역은 전체 평균)
+    shelter_area: np.ndarray
+
+    @property
+    def rate(self):
+        return _rate(self.capacity, self.target_popl)
+
+
+def _rate(capacity, popl):
+    """대피가능인구 ÷ 대상인구 × 100 (대상인구가 0 이하면 NaN)"""
+    popl = np.asarray(popl, dtype='float64')
+    safe = np.where(popl > 0, popl, np.nan)
+    return capacity / safe * 100
+
+
+def scenario_base(df):
+    """전처리된 지역 행에서 기준값 생성 (필요한 컬럼이 없으면 None)"""
+    if df.empty or not all(col in df.columns for col in REQUIRED_COLUMNS):
+        return None
+    shelters = df['pub_shelts_shelts'].to_numpy(dtype='float64')
+    area = df['pub_shelts_area'].to_numpy(dtype='float64')
+    overall = area.sum() / shelters.sum() if shelters.sum() > 0 else 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shelter_area = np.where(shelters > 0, area / shelters, overall)
+    regions = df['regi'].astype(str).to_numpy() if 'regi' in df.columns else np.arange(len(df))
+    return ScenarioBase(
+        regions=regions,
+        target_popl=df['target_popl'].to_numpy(dtype='float64'),
+        capacity=df['shelt_abl_popl_smry'].to_numpy(dtype='float64'),
+        shelter_area=shelter_area,
+    )
+
+
+def added_capacity(base, added_shelters):
+    """지역마다 시설 added_shelters 곳을 더했을 때 늘어나는 대피가능인구"""
+    return np.asarray(added_shelters, dtype='float64')[..., None] * base.shelter_area / AREA_PER_PERSON
+
+
+def scenario_grid(base, added_shelters, popl_growth):
+    """(추가 시설 수 S개) × (인구 증감률 G개) 조합의 지역별 수용률, 모양 (S, G, 지역)
+
+    popl_growth 는 비율입니다 (0.05 = 5% 증가).
+    """
+    added = np.atleast_1d(np.asarray(added_shelters, dtype='float64'))
+    growth = np.atleast_1d(np.asarray(popl_growth, dtype='float64'))
+    capacity = base.capacity + added_capacity(base, added)[:, None, :]
+    popl = base.target_popl * (1 + growth)[None, :, None]
+    return _rate(capacity, popl)
+
+
+def national_grid(base, added_shelters, popl_growth):
+    """조합별 전체 수용률 (인구 가중), 모양 (S, G) — 지역 축을 먼저 합쳐 지역 수와 무관"""
+    added = np.atleast_1d(np.asarray(added_shelters, dtype='float64'))
+    growth = np.atleast_1d(np.asarray(popl_growth, dtype='float64'))
+    capacity = base.capacity.sum() + added * (base.shelter_area.sum() / AREA_PER_PERSON)
+    popl = base.target_popl.sum() * (1 + growth)
+    return _rate(capacity[:, None], popl[None, :])
+
+
+def population_paths(base, years, growth_mean, growth_std, draws, correlation=0.5, seed=None):
+    """years 년 뒤 대상인구 배율 표본, 모양 (draws, 지역)
+
+    연간 로그 증가율이 평균 log(1 + growth_mean), 표준편차 growth_std 인
+    정규분포라고 보면 years 년 합도 정규분포이므로, 연도마다 뽑지 않고
+    (표본, 지역)마다 한 번만 뽑습니다. correlation 만큼은 모든 지역이 함께
+    겪는 전국 공통 변동입니다.
+    """
+    rng = np.random.default_rng(seed)
+    shock = rng.standard_normal((draws, len(base.target_popl)))
+    shock *= np.sqrt(1 - correlation)
+    shock += np.sqrt(correlation) * rng.standard_normal((draws, 1))
+    shock *= np.sqrt(years) * growth_std
+    shock += years * np.log1p(growth_mean)
+    return np.exp(shock, out=shock)
+
+
+def monte_carlo(base, added_shelters=0, years=5, growth_mean=0.0, growth_std=0.01,
+                draws=10_000, correlation=0.5, seed=None):
+    """몬테카를로 인구 전망의 수용률 표본 (지역별 (draws, 지역), 전체 (draws,))
+
+    지역 수 × 표본 수가 MAX_SAMPLE_CELLS 를 넘으면 표본 수를 줄입니다
+    (지역이 아주 많으면 지역별 분위수는 거칠어지므로 돌려받은 표본 수를 확인).
+    """
+    regions = max(1, len(base.target_popl))
+    draws = max(1, min(draws, MAX_SAMPLE_CELLS // regions))
+    factor = population_paths(base, years, growth_mean, growth_std, draws, correlation, seed)
+    capacity = base.capacity + added_capacity(base, added_shelters)
+    popl = base.target_popl * factor
+    national = _rate(capacity.sum(), popl.sum(axis=1))
+    return _rate(capacity, popl), national
+
+
+def shortfall_probability(samples, target_rate):
+    """표본 중 목표 수용률에 못 미치는 비율 (축 0 기준)"""
+    return (samples < target_rate).mean(axis=0)
+
+
+def shelters_needed(base, target_rate, popl_growth=0.0):
+    """목표 수용률까지 지역별로 더 필요한 공공용시설 수 (이미 달성했으면 0)"""
+    required = target_rate / 100 * base.target_popl * (1 + popl_growth)
+    shortage = np.maximum(required - base.capacity, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        needed = np.ceil(shortage * AREA_PER_PERSON / base.shelter_area)
+    return np.where(shortage > 0, needed, 0)
+
+
+def scenario_table(base, added_shelters, popl_growth, samples, target_rate):
+    """지역별 현재/시나리오/전망 수용률과 목표 달성에 필요한 시설 수"""
+    scenario = scenario_grid(base, added_shelters, popl_growth)[0, 0]
+    # 대상인구가 0인 지역만 NaN 이며 그 지역 분위수도 NaN 이면 되므로 nanpercentile 불필요
+    low, mid, high = np.percentile(samples, QUANTILES, axis=0)
+    return pd.DataFrame({
+        'regi': base.regions,
+        'current_rate': base.rate,
+        'scenario_rate': scenario,
+        'projected_p5': low,
+        'projected_p50': mid,
+        'projected_p95': high,
+        'shortfall_pct': shortfall_probability(samples, target_rate) * 100,
+        'shelters_needed': shelters_needed(base, target_rate, popl_growth),
+    })
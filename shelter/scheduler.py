@@ -0,0 +1,122 @@
+"""모든 연도의 캐시를 미리 채우고 만료 전에 갱신하는 백그라운드 스케줄러"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+# 연도별 갱신 결과
+PENDING = "pending"
+OK = "ok"
+ERROR = "error"
+
+
+@dataclass
+class RefreshStatus:
+    """연도별 마지막 갱신 상태"""
+
+    year: int
+    outcome: str = PENDING
+    last_refresh_at: float = None
+    duration: float = None
+    # 현재 캐시 데이터를 받은 시각
+    fetched_at: float = None
+    # 현재 데이터 내용 해시와 그 내용이 처음 들어온 시각 (같은 내용을 다시 받으면 유지)
+    content_hash: str = None
+    changed_at: float = None
+    next_refresh_at: float = None
+    error: str = None
+
+
+class RefreshScheduler:
+    """프로세스당 하나의 데몬 스레드로 연도별 데이터를 따뜻하게 유지
+
+    시작 시 모든 연도를 미리 불러오고, 이후 각 연도를 TTL의 refresh_ratio
+    시점에 다시 받아와 사용자 요청이 API 호출을 기다리지 않도록 합니다.
+    디스크 캐시만 채우고 로더 메모리에는 사용자가 불러온 연도만 남깁니다
+    (레플리카마다 모든 연도의 표를 들고 있지 않도록).
+    """
+
+    def __init__(self, loader, years, refresh_ratio=0.8, retry_interval=60.0,
+                 prefetch_workers=4):
+        self.loader = loader
+        self.years = list(years)
+        self.refresh_ratio = refresh_ratio
+        self.retry_interval = retry_interval
+        self.prefetch_workers = prefetch_workers
+        self._status = {year: RefreshStatus(year) for year in self.years}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="shelter-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self):
+        """연도별 갱신 상태 스냅샷"""
+        with self._lock:
+            return [replace(self._status[year]) for year in self.years]
+
+    def _run(self):
+        # 시작 시 전체 연도 프리페치 (디스크 캐시가 신선하면 네트워크 호출 없음)
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers) as pool:
+            list(pool.map(lambda year: self._update(year, self._prefetch), self.years))
+
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                due = [s.year for s in self._status.values() if s.next_refresh_at <= now]
+                next_at = min(s.next_refresh_at for s in self._status.values())
+            for year in due:
+                if self._stop.is_set():
+                    return
+                self._update(year, self._refresh)
+            if not due:
+                self._stop.wait(max(0.0, next_at - now))
+
+    def _prefetch(self, year):
+        return self.loader.prefetch(year)
+
+    def _refresh(self, year):
+        return self.loader.prefetch(year, force=True)
+
+    def _update(self, year, fetch):
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            result = fetch(year)
+        except Exception as e:
+            outcome, error, fetched_at, content_hash = ERROR, str(e), None, None
+        else:
+            # 업스트림 장애로 마지막 정상 데이터를 돌려받은 경우도 실패로 기록
+            outcome = ERROR if result.error else OK
+            error, fetched_at = result.error, result.fetched_at
+            content_hash = result.content_hash
+        duration = time.perf_counter() - t0
+
+        if outcome == OK:
+            ttl = self.loader.cache.policy.ttl(year)
+            next_at = fetched_at + ttl * self.refresh_ratio
+        else:
+            next_at = started + self.retry_interval
+
+        with self._lock:
+            status = self._status[year]
+            status.outcome = outcome
+            status.last_refresh_at = started
+            status.duration = duration
+            status.error = error
+            status.next_refresh_at = next_at
+            if fetched_at is not None:
+                status.fetched_at = fetched_at
+            if content_hash is not None and content_hash != status.content_hash:
+                status.content_hash = content_hash
+                status.changed_at = fetched_at
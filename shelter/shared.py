@@ -0,0 +1,271 @@
+"""전처리된 연도별 데이터를 여러 프로세스가 함께 쓰는 메모리 매핑 파일 저장소
+
+같은 호스트의 Streamlit 레플리카들이 전처리 결과를 한 번만 기록하고
+모두 읽기 전용으로 메모리 매핑해 씁니다. 수치형 컬럼과 범주 코드는 복사 없이
+매핑된 페이지를 그대로 가리키므로 레플리카 수가 늘어도 OS 페이지 캐시 한 벌만
+차지합니다. 범주 목록의 해시 색인과 이 표로 만드는 필터 인덱스, 롤업 큐브,
+지역 선택 목록은 레플리카마다 따로 만들므로 전용 메모리가 0이 되지는 않습니다
+(python -m benchmarks.shared_memory --app 으로 앱 전체를 측정).
+
+    <root>/<year>/<version>/data.arrow    지역 행 (Arrow IPC, 비압축)
+    <root>/<year>/<version>/total.arrow   '합계' 행
+    <root>/<year>/<version>/fetched_at    원본 데이터를 받은 시각
+    <root>/<year>/<version>/content_hash  원본 데이터 내용 해시
+    <root>/<year>/CURRENT                 현재 버전 디렉터리 이름
+
+새 버전은 디렉터리를 다 쓴 뒤 CURRENT 를 원자적으로 교체(os.replace)하므로
+읽는 쪽은 반쯤 쓰인 파일을 볼 수 없습니다. 이미 매핑한 이전 버전은
+파일을 지워도 매핑이 유지됩니다. 다시 받아온 내용이 현재 버전과 같으면
+(content_hash 가 같으면) 새 버전을 쓰지 않고 fetched_at 만 교체합니다.
+
+    python -m shelter.shared list
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from shelter.cache import CACHE_DIR
+
+SHARED_DIR = Path(os.environ.get("SHELTER_SHARED_DIR", str(Path(CACHE_DIR) / "shared")))
+POINTER = "CURRENT"
+INDEX_COLUMN = "__index__"
+# pandas 기본 문자열 dtype과 같은 Arrow 기반 문자열 (매핑된 버퍼를 그대로 사용)
+_STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+# 교체 후에도 남겨 둘 이전 버전 수 (아직 열고 있는 프로세스용)
+KEEP_VERSIONS = 2
+
+
+@dataclass
+class SharedDataset:
+    """메모리 매핑으로 읽은 전처리 결과"""
+
+    year: int
+    df: pd.DataFrame
+    total_df: pd.DataFrame
+    fetched_at: float
+    # 원본 데이터 내용 해시 (없는 이전 게시본은 버전 이름)
+    content_hash: str = None
+
+
+def _version_name(fetched_at):
+    return f"v{fetched_at:.6f}".replace(".", "_")
+
+
+def _write_frame(path, frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.append_column(INDEX_COLUMN, pa.array(frame.index.to_numpy()))
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            # 한 덩어리로 기록해야 읽을 때 컬럼별로 복사 없이 매핑됨
+            writer.write_table(table.combine_chunks())
+
+
+def _write_text(path, text):
+    """작은 텍스트 파일을 원자적으로 교체"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _map_column(column):
+    """Arrow 컬럼 → pandas 값 (수치형은 매핑된 버퍼를 그대로 가리킴)"""
+    chunk = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if pa.types.is_dictionary(chunk.type):
+        # 범주형: 코드는 매핑된 버퍼 그대로, 범주는 Arrow 기반 문자열로
+        categories = pd.Index(pd.array(chunk.dictionary, dtype=_STRING_DTYPE))
+        return pd.Categorical.from_codes(
+            chunk.indices.to_numpy(zero_copy_only=False),
+            dtype=pd.CategoricalDtype(categories),
+            validate=False,
+        )
+    if pa.types.is_string(chunk.type) or pa.types.is_large_string(chunk.type):
+        return pd.array(chunk, dtype=_STRING_DTYPE)
+    return chunk.to_numpy(zero_copy_only=False)
+
+
+def _map_frame(path):
+    """Arrow IPC 파일을 메모리 매핑해 DataFrame으로 (수치형 컬럼은 복사 없음)"""
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    columns = {
+        name: _map_column(table.column(name))
+        for name in table.column_names if name != INDEX_COLUMN
+    }
+    index = table.column(INDEX_COLUMN).to_numpy() if INDEX_COLUMN in table.column_names else None
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+class SharedStore:
+    """연도별 전처리 결과를 메모리 매핑 파일로 게시/조회"""
+
+    def __init__(self, root=SHARED_DIR):
+        self.root = Path(root)
+        self._mapped = {}
+        self._lock = threading.Lock()
+
+    def _current(self, year):
+        try:
+            return (self.root / str(year) / POINTER).read_text().strip() or None
+        except OSError:
+            return None
+
+    def get(self, year):
+        """현재 버전을 매핑해 반환 (없으면 None, 같은 버전은 다시 매핑하지 않음)"""
+        name = self._current(year)
+        if name is None:
+            return None
+        directory = self.root / str(year) / name
+        try:
+            fetched_at = float((directory / "fetched_at").read_text())
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            mapped = self._mapped.get(year)
+            if mapped is not None and mapped[0] == name:
+                # 같은 내용을 다시 받아 fetched_at 만 바뀐 경우
+                if mapped[1].fetched_at != fetched_at:
+                    mapped = (name, replace(mapped[1], fetched_at=fetched_at))
+                    self._mapped[year] = mapped
+                return mapped[1]
+        try:
+            content_hash = (directory / "content_hash").read_text().strip()
+        except OSError:
+            content_hash = name
+        try:
+            dataset = SharedDataset(
+                year,
+                _map_frame(directory / "data.arrow"),
+                _map_frame(directory / "total.arrow"),
+                fetched_at,
+                content_hash,
+            )
+        except (OSError, pa.ArrowInvalid):
+            return None
+        with self._lock:
+            self._mapped[year] = (name, dataset)
+        return dataset
+
+    def publish(self, year, fetched_at, df, total_df, content_hash=None):
+        """새 버전을 기록하고 CURRENT 를 원자적으로 교체 (이미 같은 버전이면 False)
+
+        현재 버전과 content_hash 가 같으면 데이터는 다시 쓰지 않고 fetched_at 만
+        더 최근 값으로 바꿉니다.
+        """
+        name = _version_name(fetched_at)
+        current = self._current(year)
+        if current == name:
+            return False
+        if content_hash is not None and self.touch(year, fetched_at, content_hash):
+            return False
+        year_dir = self.root / str(year)
+        year_dir.mkdir(parents=True, exist_ok=True)
+
+        staging = Path(tempfile.mkdtemp(dir=year_dir, prefix=".staging-"))
+        try:
+            _write_frame(staging / "data.arrow", df)
+            _write_frame(staging / "total.arrow", total_df)
+            (staging / "fetched_at").write_text(repr(fetched_at))
+            if content_hash is not None:
+                (staging / "content_hash").write_text(content_hash)
+            target = year_dir / name
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # 다른 프로세스가 같은 버전을 먼저 게시함
+                shutil.rmtree(staging, ignore_errors=True)
+
+            _write_text(year_dir / POINTER, name)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._prune(year_dir, name)
+        return True
+
+    def touch(self, year, fetched_at, content_hash):
+        """현재 버전이 같은 내용이면 fetched_at 만 더 최근 값으로 바꾸고 True
+
+        같은 내용을 다시 받아왔을 때(전처리 결과를 다시 만들지 않는 경우에도)
+        호출해 게시본이 오래된 것으로 보이지 않게 합니다.
+        """
+        current = self._current(year)
+        if current is None:
+            return False
+        directory = self.root / str(year) / current
+        try:
+            if (directory / "content_hash").read_text().strip() != content_hash:
+                return False
+            previous = float((directory / "fetched_at").read_text())
+        except (OSError, ValueError):
+            return False
+        if fetched_at > previous:
+            _write_text(directory / "fetched_at", repr(fetched_at))
+        return True
+
+    def _prune(self, year_dir, current):
+        """현재 버전과 최근 KEEP_VERSIONS 개를 남기고 이전 버전 삭제"""
+        versions = sorted(
+            (path for path in year_dir.iterdir() if path.is_dir() and path.name.startswith("v")),
+            key=lambda path: path.name,
+        )
+        for path in versions[:-(KEEP_VERSIONS + 1)]:
+            if path.name != current:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def entries(self):
+        """게시된 연도 목록 [(year, 버전, fetched_at)]"""
+        entries = []
+        for year_dir in sorted(self.root.glob("*")):
+            name = self._current(year_dir.name)
+            if name is None:
+                continue
+            try:
+                fetched_at = float((year_dir / name / "fetched_at").read_text())
+            except (OSError, ValueError):
+                continue
+            entries.append((year_dir.name, name, fetched_at))
+        return entries
+
+    def clear(self, year=None):
+        """연도(또는 전체) 게시본 삭제"""
+        target = self.root if year is None else self.root / str(year)
+        shutil.rmtree(target, ignore_errors=True)
+        with self._lock:
+            if year is None:
+                self._mapped.clear()
+            else:
+                self._mapped.pop(year, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 메모리 매핑 데이터 관리")
+    parser.add_argument("--root", default=str(SHARED_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="게시된 연도 목록 출력")
+    clear = sub.add_parser("clear", help="게시본 삭제")
+    clear.add_argument("--year", type=int, help="삭제할 연도 (생략 시 전체)")
+    args = parser.parse_args()
+
+    store = SharedStore(args.root)
+    if args.command == "list":
+        for year, name, fetched_at in store.entries():
+            stamp = datetime.fromtimestamp(fetched_at).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{year}\t{name}\t{stamp}")
+    else:
+        store.clear(args.year)
+        target = f"{args.year}년" if args.year else "전체"
+        print(f"{target} 게시본 삭제")
+
+
+if __name__ == "__main__":
+    main()
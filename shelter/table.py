@@ -0,0 +1,96 @@
+"""서버 측 페이지 단위 상세 표
+
+정렬과 검색은 데이터셋의 필터 엔진 인덱스(정렬 순서, 범주 → 행 위치)로
+처리하고, 표시용 형식(컬럼명 한글화, 정수/반올림 변환)은 보이는 페이지의
+행에만 적용합니다. 전송량과 형식 변환 비용이 전체 행 수가 아니라 페이지
+크기에 비례합니다.
+
+    positions = ordered_positions(dataset.engine, view.positions, query)
+    page = table_page(dataset.df, positions, query)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from shelter.views import display_frame
+
+PAGE_SIZES = (50, 100, 200, 500)
+DEFAULT_PAGE_SIZE = 100
+# 이 행 수 이하면 페이지로 나누지 않고 전체 표를 보냄 (브라우저에서 정렬)
+FULL_TABLE_ROWS = 500
+SEARCH_COLUMN = 'regi'
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """정렬/검색/페이지 상태 (page 는 0부터)"""
+
+    sort: str = None
+    ascending: bool = True
+    search: str = ''
+    page: int = 0
+    page_size: int = DEFAULT_PAGE_SIZE
+
+    def order_key(self):
+        """페이지와 무관한 부분 (정렬된 행 위치 캐시 키)"""
+        return (self.sort, self.ascending, self.search)
+
+
+@dataclass
+class TablePage:
+    """표시용으로 변환한 한 페이지와 위치 정보"""
+
+    frame: pd.DataFrame
+    total_rows: int
+    page: int
+    pages: int
+    start: int
+
+
+def ordered_positions(engine, selected, query):
+    """검색 → 필터 선택 → 정렬 순서를 적용한 행 위치 (데이터셋 기준)
+
+    selected 는 필터 엔진 select() 결과이며 None 이면 전체 행입니다.
+    정렬은 미리 만든 전체 정렬 순서에서 선택된 행만 골라 내므로 요청마다
+    다시 정렬하지 않습니다.
+    """
+    n = len(engine.df)
+    keep = None
+    if selected is not None:
+        keep = np.zeros(n, dtype=bool)
+        keep[selected] = True
+    search = query.search.strip()
+    if search and SEARCH_COLUMN in engine.df.columns:
+        found = np.zeros(n, dtype=bool)
+        found[engine.search(SEARCH_COLUMN, search)] = True
+        keep = found if keep is None else keep & found
+
+    if query.sort is None or query.sort not in engine.df.columns:
+        return np.arange(n) if keep is None else np.flatnonzero(keep)
+    order = engine.order(query.sort)
+    if not query.ascending:
+        order = order[::-1]
+    return order if keep is None else order[keep[order]]
+
+
+def page_count(total, page_size):
+    """행 수 total 을 page_size 로 나눈 페이지 수 (빈 표도 1페이지)"""
+    return max(1, -(-total // page_size))
+
+
+def table_page(df, positions, query):
+    """positions 중 요청한 페이지만 잘라 표시용으로 변환"""
+    total = len(positions)
+    pages = page_count(total, query.page_size)
+    page = min(max(query.page, 0), pages - 1)
+    start = page * query.page_size
+    rows = df.take(positions[start:start + query.page_size])
+    # 잘라낸 범주형 컬럼도 전체 범주 목록을 들고 있어 그대로 보내면 전송량이 전체에 비례함
+    rows = rows.assign(**{
+        col: rows[col].cat.remove_unused_categories()
+        for col, dtype in rows.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+    })
+    frame = display_frame(rows)
+    return TablePage(frame, total, page, pages, start)
@@ -0,0 +1,142 @@
+"""여러 연도를 (연도, 지역) 긴 형식 표로 모으고 전년 대비/연평균 증감률을 미리 계산
+
+    table = TrendTable()
+    table.update(2024, content_hash, df_2024, total_2024)
+    table.frame  # year, regi, accpt_rt, accpt_rt_yoy, accpt_rt_yoy_pct, accpt_rt_cagr, ...
+
+새 연도가 기존 연도보다 뒤에 추가되면 그 연도의 증감률만 계산하고,
+중간 연도가 추가되거나 바뀌면 전체를 한 번에 다시 계산합니다.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from shelter import metrics
+
+# 증감률을 계산할 컬럼
+TREND_COLUMNS = ['accpt_rt', 'target_popl', 'pub_shelts_shelts']
+
+KEY_COLUMNS = ['year', 'regi']
+
+
+def _long_rows(year, df, total_df=None):
+    """연도 DataFrame을 (year, regi, 값...) 형식으로 변환 ('합계' 행 포함)"""
+    frames = [df] if total_df is None or total_df.empty else [total_df, df]
+    columns = ['regi'] + [col for col in TREND_COLUMNS if col in df.columns]
+    rows = pd.concat([frame[columns] for frame in frames], ignore_index=True)
+    rows['regi'] = rows['regi'].astype(str)
+    for col in TREND_COLUMNS:
+        rows[col] = rows[col].astype('float64') if col in rows.columns else np.nan
+    # float32 수용률을 소수 첫째 자리로 맞춰 증감률에 오차가 섞이지 않게 함
+    rows['accpt_rt'] = rows['accpt_rt'].round(1)
+    rows.insert(0, 'year', np.int16(year))
+    return rows[KEY_COLUMNS + TREND_COLUMNS]
+
+
+def _with_deltas(rows, previous, base):
+    """rows 에 전년 대비(YoY)와 기준 연도 대비 연평균 증감률(CAGR) 컬럼 추가
+
+    previous/base 는 rows 와 같은 순서로 정렬된 직전 행/최초 연도 값 (year 포함) 입니다.
+    직전 행이 바로 전년이 아니면 (그 지역이 빠졌거나 불러오지 못한 연도가 있으면)
+    전년 대비 값은 NaN 입니다.
+    """
+    out = rows.copy()
+    year = rows['year'].to_numpy()
+    span = (year - base['year'].to_numpy()).astype('float64')
+    valid = span > 0
+    consecutive = previous['year'].to_numpy() == year - 1
+    for col in TREND_COLUMNS:
+        value = rows[col].to_numpy()
+        prev = np.where(consecutive, previous[col].to_numpy(), np.nan)
+        first = base[col].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[f'{col}_yoy'] = value - prev
+            out[f'{col}_yoy_pct'] = np.where(prev > 0, (value / prev - 1) * 100, np.nan)
+            out[f'{col}_cagr'] = np.where(
+                valid & (first > 0), ((value / first) ** (1 / span) - 1) * 100, np.nan
+            )
+    return out
+
+
+def compute_trends(long_rows):
+    """긴 형식 표 전체의 증감률을 한 번에 계산"""
+    rows = long_rows.sort_values(KEY_COLUMNS, ignore_index=True)
+    grouped = rows.groupby('regi', sort=False)
+    previous = grouped[['year'] + TREND_COLUMNS].shift(1)
+    base = grouped[['year'] + TREND_COLUMNS].transform('first')
+    return _with_deltas(rows, previous, base).sort_values(KEY_COLUMNS, ignore_index=True)
+
+
+class TrendTable:
+    """연도별 데이터를 모은 추이 표 (프로세스 단위로 공유)"""
+
+    def __init__(self):
+        empty = pd.DataFrame({'year': pd.Series(dtype='int16'), 'regi': pd.Series(dtype=str)})
+        for col in TREND_COLUMNS:
+            empty[col] = pd.Series(dtype='float64')
+        self.frame = compute_trends(empty)
+        self.versions = {}
+        self._lock = threading.Lock()
+
+    @property
+    def years(self):
+        return sorted(self.versions)
+
+    def update(self, year, version, df, total_df=None):
+        """연도 데이터를 추가하거나 바뀐 경우에만 교체 (바뀌었으면 True)
+
+        version이 None이면 항상 교체합니다.
+        """
+        with self._lock:
+            if version is not None and self.versions.get(year) == version:
+                return False
+            rows = _long_rows(year, df, total_df)
+            if self.versions and year > max(self.versions):
+                self.frame = self._append(rows)
+            else:
+                kept = self.frame.loc[self.frame['year'] != year, KEY_COLUMNS + TREND_COLUMNS]
+                self.frame = compute_trends(pd.concat([kept, rows], ignore_index=True))
+            self.versions[year] = version
+            return True
+
+    def _append(self, rows):
+        """마지막 연도 뒤에 붙는 연도는 그 연도의 증감률만 계산"""
+        frame = self.frame
+        latest = frame.drop_duplicates('regi', keep='last').set_index('regi')
+        first = frame.drop_duplicates('regi', keep='first').set_index('regi')
+        columns = ['year'] + TREND_COLUMNS
+        # 처음 등장한 지역은 자기 자신이 기준 (증감률 없음)
+        previous = latest[columns].reindex(rows['regi']).reset_index(drop=True)
+        base = first[columns].reindex(rows['regi']).reset_index(drop=True)
+        new = base['year'].isna()
+        base.loc[new, columns] = rows.loc[new, columns].to_numpy()
+        appended = _with_deltas(rows, previous, base)
+        return pd.concat([frame, appended], ignore_index=True).sort_values(
+            KEY_COLUMNS, ignore_index=True
+        )
+
+    def region(self, regi):
+        """한 지역의 연도별 추이"""
+        return self.frame[self.frame['regi'] == regi]
+
+    def latest(self):
+        """가장 최근 연도의 지역별 값과 증감률"""
+        if not self.versions:
+            return self.frame
+        return self.frame[self.frame['year'] == max(self.versions)]
+
+
+def load_years(load_year, years, max_workers=4):
+    """여러 연도를 동시에 불러와 {year: 결과} 로 반환 (실패한 연도는 제외)"""
+    def safe_load(year):
+        try:
+            return year, load_year(year)
+        except Exception:
+            return year, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return {year: result for year, result in pool.map(metrics.propagate(safe_load), years)
+                if result is not None}
@@ -0,0 +1,203 @@
+"""필터 상태별 화면 데이터(필터링 결과, KPI, 통계표, 표시용 표) 계산"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import pandas as pd
+
+from shelter import metrics
+from shelter.filters import Between, Equals, FilterEngine
+from shelter.preprocess import preprocess_data
+from shelter.rollup import NATION, build_rollup
+
+ALL_REGIONS = '전체'
+
+# 컬럼명 한글화
+COLUMN_LABELS = {
+    'bas_yy': '기준년도',
+    'regi': '지역',
+    'target_popl': '대상인구(명)',
+    'accpt_rt': '수용률(%)',
+    'shelt_abl_popl_smry': '대피가능인구 계(명)',
+    'shelt_abl_popl_gov_shelts': '정부지원시설 대피가능인구(명)',
+    'shelt_abl_popl_pub_shelts': '공공용시설 대피가능인구(명)',
+    'gov_shelts_shelts': '정부지원시설 수(개소)',
+    'gov_shelts_area': '정부지원시설 면적(㎡)',
+    'pub_shelts_shelts': '공공용시설 수(개소)',
+    'pub_shelts_area': '공공용시설 면적(㎡)'
+}
+
+
+@dataclass
+class Dataset:
+    """연도별 전처리 결과와 필터 엔진"""
+
+    df: pd.DataFrame
+    total_df: pd.DataFrame
+    regions: list
+    engine: FilterEngine
+    # 지역 계층 롤업 큐브 (지역 컬럼이 없으면 None)
+    rollup: object = None
+
+
+@dataclass
+class DashboardView:
+    """한 가지 (연도, 필터 상태)에 대한 화면 데이터 묶음"""
+
+    filtered_df: pd.DataFrame
+    # 필터 결과의 데이터셋 기준 행 위치 (None 이면 전체 행)
+    positions: object
+    # 전국 통계 (합계 행 → 롤업 큐브 전국 노드 → 필터링 결과 순으로 사용)
+    national: dict
+    national_from_total: bool
+    # 선택 지역 통계
+    selection: dict
+    rate_stats: pd.DataFrame
+    facility_stats: pd.DataFrame
+
+    @cached_property
+    def display_df(self):
+        """표시용 전체 표 (처음 쓸 때 변환, 큰 표는 table.table_page 로 페이지만 변환)"""
+        if self.filtered_df.empty:
+            return pd.DataFrame()
+        return display_frame(self.filtered_df)
+
+
+def _column(df, col):
+    return df.get(col, pd.Series([0]))
+
+
+def filter_predicates(df, region, rate_range):
+    """사이드바 필터 상태를 필터 엔진 조건 목록으로 변환"""
+    predicates = []
+    if region != ALL_REGIONS and 'regi' in df.columns:
+        predicates.append(Equals('regi', region))
+    if 'accpt_rt' in df.columns:
+        predicates.append(Between('accpt_rt', rate_range[0], rate_range[1]))
+    return predicates
+
+
+def national_summary(total_df, filtered_df, rollup=None):
+    """전국 통계 (값 dict, 전국 값 여부)
+
+    합계 행이 없으면 롤업 큐브의 전국 노드(인구 가중 수용률)를 쓰고,
+    둘 다 없을 때만 필터링 결과로 계산합니다.
+    """
+    if not total_df.empty:
+        total_row = total_df.iloc[0]
+        return {
+            'target_popl': total_row.get('target_popl', 0),
+            'accpt_rt': total_row.get('accpt_rt', 0),
+            'pub_shelts_shelts': total_row.get('pub_shelts_shelts', 0),
+            'pub_shelts_area': total_row.get('pub_shelts_area', 0),
+        }, True
+    nation = rollup.node(NATION) if rollup is not None else None
+    if nation is not None:
+        return {
+            'target_popl': nation.get('target_popl', 0),
+            'accpt_rt': nation.get('accpt_rt', 0),
+            'pub_shelts_shelts': nation.get('pub_shelts_shelts', 0),
+            'pub_shelts_area': nation.get('pub_shelts_area', 0),
+        }, True
+    return {
+        'target_popl': _column(filtered_df, 'target_popl').sum(),
+        'accpt_rt': _column(filtered_df, 'accpt_rt').mean(),
+        'pub_shelts_shelts': _column(filtered_df, 'pub_shelts_shelts').sum(),
+        'pub_shelts_area': _column(filtered_df, 'pub_shelts_area').sum(),
+    }, False
+
+
+def selection_summary(filtered_df, df):
+    """선택 지역 통계"""
+    return {
+        'region_count': len(filtered_df),
+        'region_delta': len(filtered_df) - len(df),
+        'target_popl': _column(filtered_df, 'target_popl').sum(),
+        'accpt_rt': _column(filtered_df, 'accpt_rt').mean(),
+        'pub_shelts_shelts': _column(filtered_df, 'pub_shelts_shelts').sum(),
+    }
+
+
+def display_frame(filtered_df):
+    """컬럼명을 한글화하고 숫자를 표시용으로 정리한 표"""
+    existing_columns = {k: v for k, v in COLUMN_LABELS.items() if k in filtered_df.columns}
+    display_df = filtered_df.rename(columns=existing_columns)
+
+    # 숫자 포맷팅
+    for col, label in existing_columns.items():
+        if col in ('bas_yy', 'regi'):
+            continue
+        if col == 'accpt_rt':
+            display_df[label] = display_df[label].astype('float64').round(1)
+        else:
+            display_df[label] = display_df[label].astype(int)
+    return display_df
+
+
+def rate_statistics(filtered_df):
+    """수용률 통계표"""
+    rates = filtered_df['accpt_rt']
+    stats_df = pd.DataFrame({
+        '통계': ['평균', '중앙값', '최댓값', '최솟값', '표준편차'],
+        '수용률(%)': [rates.mean(), rates.median(), rates.max(), rates.min(), rates.std()]
+    })
+    stats_df['수용률(%)'] = stats_df['수용률(%)'].round(2)
+    return stats_df
+
+
+def facility_statistics(filtered_df):
+    """공공용 시설 수 통계표"""
+    shelts = filtered_df['pub_shelts_shelts']
+    facility_stats = pd.DataFrame({
+        '통계': ['총 시설 수', '평균 시설 수', '최대 시설 수', '최소 시설 수'],
+        '값': [shelts.sum(), shelts.mean(), shelts.max(), shelts.min()]
+    })
+    facility_stats['값'] = facility_stats['값'].round(0).astype(int)
+    return facility_stats
+
+
+def prepare_dataset(raw_data):
+    """전처리 결과, 지역 선택 목록, 필터 엔진을 묶은 Dataset 생성"""
+    with metrics.span('preprocess') as span:
+        df, total_df = preprocess_data(raw_data)
+        span.set(rows=len(df))
+    return dataset_from_frames(df, total_df)
+
+
+def dataset_from_frames(df, total_df):
+    """이미 전처리된 표(예: 공유 메모리 매핑 파일)로 Dataset 생성"""
+    regions = [ALL_REGIONS]
+    if 'regi' in df.columns:
+        regions += sorted(df['regi'].unique().tolist())
+    with metrics.span('rollup'):
+        rollup = build_rollup(df)
+    return Dataset(df, total_df, regions, FilterEngine(df), rollup)
+
+
+def build_view(dataset, region, rate_range):
+    """필터 상태에 대한 화면 데이터를 한 번에 계산"""
+    df, total_df = dataset.df, dataset.total_df
+    with metrics.span('filter') as span:
+        positions = dataset.engine.select(filter_predicates(df, region, rate_range))
+        if positions is None or len(positions) == len(df):
+            filtered_df = df
+        else:
+            filtered_df = df.take(positions)
+        span.set(rows=len(filtered_df))
+
+    with metrics.span('summarize'):
+        national, from_total = national_summary(total_df, filtered_df, dataset.rollup)
+        has_rate = not filtered_df.empty and 'accpt_rt' in filtered_df.columns
+        return DashboardView(
+            filtered_df=filtered_df,
+            positions=positions,
+            national=national,
+            national_from_total=from_total,
+            selection=selection_summary(filtered_df, df),
+            rate_stats=rate_statistics(filtered_df) if has_rate else pd.DataFrame(),
+            facility_stats=(
+                facility_statistics(filtered_df)
+                if has_rate and 'pub_shelts_shelts' in filtered_df.columns
+                else pd.DataFrame()
+            ),
+        )
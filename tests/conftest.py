@@ -0,0 +1,22 @@
+"""테스트 공통 환경
+
+shelter 모듈은 불러올 때 환경변수(캐시/공유 디렉터리, API 주소)를 읽으므로
+테스트 모듈보다 먼저 임시 디렉터리와 로컬 목업 API 를 지정합니다.
+"""
+
+import os
+import shutil
+import tempfile
+
+from tools.mock_api import start_mock_server
+
+WORKDIR = tempfile.mkdtemp(prefix="shelter-tests-")
+os.environ["SHELTER_CACHE_DIR"] = os.path.join(WORKDIR, "cache")
+os.environ["SHELTER_SHARED_DIR"] = os.path.join(WORKDIR, "shared")
+MOCK_SERVER, MOCK_URL = start_mock_server()
+os.environ["SHELTER_API_URL"] = MOCK_URL
+
+
+def pytest_sessionfinish(session, exitstatus):
+    MOCK_SERVER.shutdown()
+    shutil.rmtree(WORKDIR, ignore_errors=True)
@@ -0,0 +1,81 @@
+"""API 페이지 호출과 병합 (로컬 목업 서버, 네트워크 호출 없음)"""
+
+import math
+
+import numpy as np
+import pytest
+
+from shelter.api import fetch_all_pages, fetch_pages, merge_pages, parse_numbers
+from tools.mock_api import load_fixture_rows, scale_rows, start_mock_server
+
+NUM_OF_ROWS = 7
+
+
+@pytest.fixture(scope="module")
+def rows():
+    rows = scale_rows(load_fixture_rows(), 3)
+    # 업스트림이 페이지 경계에서 같은 레코드를 다시 보내는 경우
+    return rows + [dict(rows[5]), dict(rows[20])]
+
+
+@pytest.fixture(scope="module")
+def mock_server(rows):
+    server, url = start_mock_server(rows)
+    yield server, url
+    server.shutdown()
+
+
+def test_fetch_pages_requests_every_page(rows, mock_server):
+    server, url = mock_server
+    before = server.RequestHandlerClass.request_count
+    total_count, pages = fetch_pages("test-key", 2024, NUM_OF_ROWS, url=url)
+
+    page_count = math.ceil(len(rows) / NUM_OF_ROWS)
+    assert total_count == len(rows)
+    assert sorted(pages) == list(range(1, page_count + 1))
+    assert all(len(frame) <= NUM_OF_ROWS for frame in pages.values())
+    assert sum(len(frame) for frame in pages.values()) == len(rows)
+    assert server.RequestHandlerClass.request_count - before == page_count
+
+
+def test_merge_pages_drops_duplicates_in_page_order(rows, mock_server):
+    _, url = mock_server
+    _, pages = fetch_pages("test-key", 2024, NUM_OF_ROWS, url=url)
+    merged = merge_pages(pages)
+
+    assert len(merged) == len(rows) - 2
+    assert not merged.duplicated().any()
+    expected = list(dict.fromkeys(row["regi"] for row in rows))
+    assert merged["regi"].tolist() == expected
+    assert merged.index.tolist() == list(range(len(merged)))
+
+
+def test_merge_pages_ignores_dict_order(mock_server):
+    _, url = mock_server
+    _, pages = fetch_pages("test-key", 2024, NUM_OF_ROWS, url=url)
+    shuffled = {page_no: pages[page_no] for page_no in reversed(sorted(pages))}
+    assert merge_pages(shuffled).equals(merge_pages(pages))
+
+
+def test_fetch_all_pages_matches_single_page(rows, mock_server):
+    _, url = mock_server
+    paged = fetch_all_pages("test-key", 2024, NUM_OF_ROWS, url=url)
+    single = fetch_all_pages("test-key", 2024, len(rows), url=url)
+    assert paged.equals(single)
+
+
+def test_merge_pages_empty():
+    assert merge_pages({}).empty
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["1,234", "5", "0.5"], [1234.0, 5.0, 0.5]),
+    (["1", None, "x"], [1.0, np.nan, np.nan]),
+    # 공백이 든 값과 빈 값이 이어 붙인 문자열에서 서로 개수를 상쇄하는 경우
+    (["1 2", ""], [np.nan, np.nan]),
+    (["", "1\t2"], [np.nan, np.nan]),
+    ([" 7 ", "8"], [7.0, 8.0]),
+    ([",", "3"], [np.nan, 3.0]),
+])
+def test_parse_numbers(values, expected):
+    np.testing.assert_array_equal(parse_numbers(values), np.array(expected))
@@ -0,0 +1,108 @@
+"""app.py 재실행 (AppTest, 로컬 목업 API)"""
+
+import gc
+import time
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from shelter.api import DEFAULT_NUM_OF_ROWS
+from shelter.cache import DAY, ShelterCache
+from shelter.loader import ShelterLoader
+from shelter.shared import SharedStore
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+# 처음 선택되는 연도 (마감된 연도라 TTL 30일)
+YEAR = 2025
+
+
+def _loader_memory():
+    """앱이 st.cache_resource 로 만든 로더들이 메모리에 들고 있는 연도"""
+    years = set()
+    for obj in gc.get_objects():
+        if isinstance(obj, ShelterLoader):
+            years.update(obj._memory)
+    return years
+
+
+def _shared_fetched_at(store):
+    return {int(year): fetched_at for year, _, fetched_at in store.entries()}.get(YEAR)
+
+
+def _age_shared(store, seconds):
+    """게시본의 fetched_at 을 seconds 만큼 과거로 (다시 쓰지 않은 같은 내용)"""
+    for year, name, fetched_at in store.entries():
+        if int(year) == YEAR:
+            (store.root / year / name / "fetched_at").write_text(repr(time.time() - seconds))
+
+
+def _age_disk(cache, seconds):
+    """디스크 캐시를 같은 내용, 과거 fetched_at 으로 다시 기록"""
+    pages, _, _ = cache.get_year(YEAR, DEFAULT_NUM_OF_ROWS)
+    total_count = cache.get_page(YEAR, 1, DEFAULT_NUM_OF_ROWS).total_count
+    cache.put_year(YEAR, DEFAULT_NUM_OF_ROWS, total_count, pages, time.time() - seconds)
+
+
+@pytest.fixture(scope="module")
+def app():
+    at = AppTest.from_file(str(APP), default_timeout=60).run()
+    assert not at.exception
+    return at
+
+
+def test_first_run_publishes_and_drops_loader_frame(app):
+    assert _shared_fetched_at(SharedStore()) is not None
+    assert YEAR not in _loader_memory()
+
+
+def test_stale_shared_copy_with_fresh_disk_cache_is_used(app):
+    # 스케줄러가 같은 내용을 다시 받아와 디스크 캐시만 신선한 경우
+    _age_shared(SharedStore(), 31 * DAY)
+    for _ in range(3):
+        app.run()
+        assert not app.exception
+    assert YEAR not in _loader_memory()
+
+
+def test_refetch_with_unchanged_content_bumps_shared_copy(app):
+    store = SharedStore()
+    _age_shared(store, 400 * DAY)
+    _age_disk(ShelterCache(), 400 * DAY)
+    before = time.time()
+
+    # 만료된 캐시 → 다시 받아옴 (같은 내용이라 전처리 결과는 캐시에서 재사용)
+    app.run()
+    assert not app.exception
+    assert _shared_fetched_at(store) >= before
+    assert YEAR not in _loader_memory()
+
+    app.run()
+    assert not app.exception
+    assert YEAR not in _loader_memory()
+
+
+def test_scenario_is_not_recomputed_on_rerun(app, monkeypatch):
+    import shelter.scenarios
+
+    calls = []
+    original = shelter.scenarios.monte_carlo
+
+    def counting(*args, **kwargs):
+        calls.append(args[1:])
+        return original(*args, **kwargs)
+
+    # app.py 는 재실행마다 다시 실행되므로 모듈 속성을 바꾸면 새 함수를 가져감
+    monkeypatch.setattr(shelter.scenarios, "monte_carlo", counting)
+    toggle = next(box for box in app.sidebar.checkbox if box.label == "🧮 수용률 시나리오 보기")
+    toggle.check().run()
+    assert not app.exception
+    assert len(calls) == 1
+
+    app.run()
+    assert not app.exception
+    assert len(calls) == 1
+
+    app.slider(key="scenario_added").set_value(50).run()
+    assert not app.exception
+    assert len(calls) == 2
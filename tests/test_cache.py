@@ -0,0 +1,90 @@
+"""디스크 캐시 (신선도 정책, 페이지/연도 content_hash)"""
+
+import pandas as pd
+import pytest
+
+from shelter.cache import DAY, EXPIRED, FRESH, HOUR, STALE, FreshnessPolicy, ShelterCache
+
+ROWS = 2
+CLOSED = 2020
+
+
+def _pages(values):
+    """[(지역, 대상인구), ...] → ROWS 행씩 나눈 {pageNo: 컬럼 배열 표}"""
+    frame = pd.DataFrame(values, columns=['regi', 'target_popl'])
+    return {n // ROWS + 1: frame.iloc[n:n + ROWS].reset_index(drop=True)
+            for n in range(0, len(frame), ROWS)}
+
+
+VALUES = [('a', '10'), ('b', '20'), ('c', '30')]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ShelterCache(tmp_path)
+
+
+@pytest.mark.parametrize("age, state", [
+    (29 * DAY, FRESH),
+    (31 * DAY, STALE),
+    (30 * DAY + 366 * DAY, EXPIRED),
+])
+def test_closed_year_freshness(age, state):
+    assert FreshnessPolicy().state(CLOSED, 1000.0, now=1000.0 + age) == state
+
+
+def test_current_year_has_short_ttl():
+    policy = FreshnessPolicy(current_year_ttl=HOUR, current_year_max_stale=DAY)
+    year = 3000
+    assert policy.state(year, 0.0, now=HOUR / 2) == FRESH
+    assert policy.state(year, 0.0, now=2 * HOUR) == STALE
+    assert policy.state(year, 0.0, now=2 * DAY) == EXPIRED
+
+
+def test_put_year_round_trip(cache):
+    pages = _pages(VALUES)
+    year_hash = cache.put_year(CLOSED, ROWS, len(VALUES), pages, fetched_at=123.0)
+
+    read_pages, fetched_at, read_hash = cache.get_year(CLOSED, ROWS)
+    assert sorted(read_pages) == [1, 2]
+    for page_no, frame in pages.items():
+        pd.testing.assert_frame_equal(read_pages[page_no], frame)
+    assert fetched_at == 123.0
+    assert read_hash == year_hash
+    assert cache.year_info(CLOSED, ROWS) == (123.0, year_hash)
+
+
+def test_content_hash_ignores_fetch_time_but_not_values(cache, tmp_path):
+    first = cache.put_year(CLOSED, ROWS, len(VALUES), _pages(VALUES), fetched_at=1.0)
+    assert cache.put_year(CLOSED, ROWS, len(VALUES), _pages(VALUES), fetched_at=2.0) == first
+    assert cache.year_info(CLOSED, ROWS) == (2.0, first)
+
+    changed = VALUES[:-1] + [('c', '31')]
+    assert cache.put_year(CLOSED, ROWS, len(changed), _pages(changed)) != first
+    # 다른 디렉터리/프로세스에서 기록해도 같은 내용이면 같은 해시
+    other = ShelterCache(tmp_path / "other")
+    assert other.put_year(CLOSED, ROWS, len(VALUES), _pages(VALUES)) == first
+
+
+def test_missing_page_means_no_year(cache):
+    cache.put_year(CLOSED, ROWS, len(VALUES), _pages(VALUES))
+    cache.path(CLOSED, 2, ROWS).unlink()
+    assert cache.get_year(CLOSED, ROWS) is None
+
+
+def test_year_hash_file_is_rebuilt_from_pages(cache):
+    year_hash = cache.put_year(CLOSED, ROWS, len(VALUES), _pages(VALUES))
+    # 연도 해시 파일이 없던 이전 형식 캐시
+    cache.hash_path(CLOSED, ROWS).unlink()
+    assert cache.year_info(CLOSED, ROWS) is None
+    assert cache.get_year(CLOSED, ROWS)[2] == year_hash
+    assert cache.year_hash(CLOSED, ROWS) == year_hash
+
+
+def test_invalidate_removes_hash_first(cache):
+    cache.put_year(CLOSED, ROWS, len(VALUES), _pages(VALUES))
+    cache.put_year(CLOSED + 1, ROWS, len(VALUES), _pages(VALUES))
+    assert cache.invalidate(CLOSED) == 2
+    assert cache.year_hash(CLOSED, ROWS) is None
+    assert cache.get_year(CLOSED, ROWS) is None
+    assert cache.year_info(CLOSED + 1, ROWS) is not None
@@ -0,0 +1,30 @@
+"""차트 그림 데이터(JSON) 크기가 행 수와 무관하게 예산 이내인지 확인"""
+
+import plotly.io as pio
+import pytest
+
+from benchmarks.chart_payload import PAYLOAD_BUDGET
+from shelter.charts import CHARTS, build_figure
+from shelter.views import prepare_dataset
+from tools.synthetic import synthetic_rows
+
+ROWS = 100_000
+
+
+@pytest.fixture(scope="module")
+def df():
+    return prepare_dataset(synthetic_rows(ROWS)).df
+
+
+@pytest.mark.parametrize("chart_id", list(CHARTS))
+def test_payload_within_budget(df, chart_id):
+    fig = build_figure(chart_id, df)
+    assert fig is not None
+    payload = len(pio.to_json(fig, validate=False).encode('utf-8'))
+    assert payload <= PAYLOAD_BUDGET, f"{chart_id}: {payload:,} bytes"
+
+
+@pytest.mark.parametrize("chart_id", list(CHARTS))
+def test_small_dataset_builds(chart_id):
+    df = prepare_dataset(synthetic_rows(17)).df
+    assert build_figure(chart_id, df) is not None
@@ -0,0 +1,46 @@
+"""다운로드 파일 생성 (연도마다 dtype/컬럼이 다른 청크 이어 쓰기)"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from shelter.export import export_bytes
+from shelter.preprocess import preprocess_data
+from tools.mock_api import load_fixture_rows
+
+
+def _year(year, regions, popl, popl_dtype='int32'):
+    return pd.DataFrame({
+        'bas_yy': np.int16(year),
+        'regi': pd.Categorical(regions),
+        'target_popl': np.array(popl, dtype=popl_dtype),
+        'accpt_rt': np.array([50.5] * len(regions), dtype='float32'),
+    })
+
+
+def test_parquet_with_mixed_dtype_chunks():
+    frames = [
+        _year(2023, ['a', 'b'], [10, 20]),
+        # 범위를 넘어 int64 로 승격된 연도, 다른 범주
+        _year(2024, ['c'], [3_000_000_000], popl_dtype='int64'),
+        # 컬럼이 빠진 연도
+        _year(2025, ['a'], [30]).drop(columns=['accpt_rt']),
+    ]
+    result = pq.read_table(io.BytesIO(export_bytes(frames, 'parquet', chunk_size=1))).to_pandas()
+    assert result['bas_yy'].tolist() == [2023, 2023, 2024, 2025]
+    assert result['regi'].tolist() == ['a', 'b', 'c', 'a']
+    assert result['target_popl'].tolist() == [10, 20, 3_000_000_000, 30]
+    assert result['accpt_rt'].iloc[:3].tolist() == [50.5] * 3
+    assert np.isnan(result['accpt_rt'].iloc[3])
+
+
+def test_parquet_round_trip_keeps_values():
+    df, _ = preprocess_data(load_fixture_rows())
+    result = pq.read_table(io.BytesIO(export_bytes([df, df], 'parquet', chunk_size=7))).to_pandas()
+    expected = pd.concat([df, df], ignore_index=True)
+    assert list(result.columns) == list(expected.columns)
+    assert result['regi'].tolist() == expected['regi'].astype(str).tolist()
+    assert result['target_popl'].tolist() == expected['target_popl'].tolist()
+    assert result['accpt_rt'].dtype == 'float32'
@@ -0,0 +1,114 @@
+"""인덱스 기반 필터 엔진 결과를 pandas 불리언 마스크와 비교"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shelter.filters import Between, Equals, FilterEngine
+from shelter.views import prepare_dataset
+from tools.synthetic import synthetic_rows
+
+
+@pytest.fixture(scope="module")
+def df():
+    return prepare_dataset(synthetic_rows(2_000)).df
+
+
+@pytest.fixture(scope="module")
+def engine(df):
+    return FilterEngine(df)
+
+
+def _mask(df, predicates):
+    mask = pd.Series(True, index=df.index)
+    for p in predicates:
+        column = df[p.column]
+        if isinstance(p, Equals):
+            mask &= column == p.value
+        else:
+            if p.low is not None:
+                mask &= column >= p.low
+            if p.high is not None:
+                mask &= column <= p.high
+    return mask.to_numpy()
+
+
+def _rate_cases(df):
+    rates = df['accpt_rt']
+    region = df['regi'].iloc[3]
+    low, mid, high = rates.quantile([0.1, 0.5, 0.9])
+    return [
+        [Between('accpt_rt', low, high)],
+        [Between('accpt_rt', rates.min(), rates.max())],
+        [Between('accpt_rt', mid, None)],
+        [Between('accpt_rt', None, mid)],
+        # 경계값이 데이터에 있는 값과 정확히 같은 경우
+        [Between('accpt_rt', rates.iloc[10], rates.iloc[10])],
+        [Between('target_popl', 1_000_000, None)],
+        [Equals('regi', region)],
+        [Equals('regi', region), Between('accpt_rt', low, high)],
+        [Equals('regi', '없는 지역')],
+        [Between('accpt_rt', high, low)],
+        [Between('accpt_rt', low, high), Between('target_popl', None, df['target_popl'].median())],
+    ]
+
+
+def test_select_matches_boolean_mask(df, engine):
+    for predicates in _rate_cases(df):
+        selected = engine.select(predicates)
+        expected = np.flatnonzero(_mask(df, predicates))
+        assert np.array_equal(selected, expected), predicates
+
+
+def test_filter_matches_boolean_mask(df, engine):
+    for predicates in _rate_cases(df):
+        expected = df[_mask(df, predicates)]
+        pd.testing.assert_frame_equal(engine.filter(predicates), expected)
+
+
+def test_filter_returns_original_when_everything_matches(df, engine):
+    rates = df['accpt_rt']
+    assert engine.filter([Between('accpt_rt', rates.min(), rates.max())]) is df
+
+
+def test_select_without_predicates(engine):
+    assert engine.select([]) is None
+
+
+def test_missing_values_excluded_like_pandas():
+    df = pd.DataFrame({
+        'x': np.array([1.0, np.nan, 3.0, 2.0, np.nan], dtype='float32'),
+        'regi': pd.Categorical(['a', None, 'b', 'a', 'b']),
+    })
+    engine = FilterEngine(df)
+    for predicates in ([Between('x', 1.5, None)], [Between('x', None, 2.5)],
+                       [Between('x', None, None)], [Equals('regi', 'a')]):
+        expected = np.flatnonzero(_mask(df, predicates))
+        assert np.array_equal(engine.select(predicates), expected), predicates
+
+
+def test_order_matches_sort_values(df, engine):
+    for column in ('accpt_rt', 'target_popl'):
+        expected = df[column].sort_values(kind='stable').index
+        assert np.array_equal(df.index[engine.order(column)], expected)
+    names = df['regi'].astype(str)
+    assert np.array_equal(engine.order('regi'), np.argsort(names.to_numpy(), kind='stable'))
+
+
+def test_search_matches_str_contains(df, engine):
+    for text in ('0001', '지역 00000', ' 0', '없는 지역'):
+        expected = np.flatnonzero(df['regi'].astype(str).str.contains(text, case=False, regex=False))
+        assert np.array_equal(np.sort(engine.search('regi', text)), expected), text
+
+
+@dataclass(frozen=True)
+class NotEquals:
+    column: str
+    value: object
+
+
+def test_unsupported_predicate(engine):
+    with pytest.raises(TypeError):
+        engine.positions(NotEquals('regi', '지역 0000001'))
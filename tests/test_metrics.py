@@ -0,0 +1,82 @@
+"""계측 켜기 범위 (프로세스 전체 vs scoped 블록)"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shelter import metrics
+from shelter.api import fetch_pages
+from shelter.trends import load_years
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    was_enabled = metrics.enabled()
+    metrics.disable()
+    metrics.REGISTRY.reset()
+    yield
+    metrics.REGISTRY.reset()
+    if was_enabled:
+        metrics.enable()
+
+
+def test_disabled_span_records_nothing():
+    with metrics.span('rerun'):
+        pass
+    metrics.count('cache_hit')
+    assert metrics.summary() == []
+    assert metrics.REGISTRY.counters == {}
+
+
+def test_scoped_enables_only_inside_block():
+    with metrics.scoped():
+        assert metrics.enabled()
+        with metrics.span('rerun'):
+            pass
+    assert not metrics.enabled()
+    with metrics.span('rerun'):
+        pass
+    assert [row['count'] for row in metrics.summary()] == [1]
+
+
+def test_scoped_does_not_leak_to_other_threads():
+    seen = []
+    with metrics.scoped():
+        thread = threading.Thread(target=lambda: seen.append(metrics.enabled()))
+        thread.start()
+        thread.join()
+    assert seen == [False]
+
+
+def test_scoped_off_keeps_process_setting():
+    metrics.enable()
+    with metrics.scoped(False):
+        assert metrics.enabled()
+
+
+def test_propagate_carries_scope_into_pool_workers():
+    with metrics.scoped():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            seen = list(pool.map(metrics.propagate(lambda _: metrics.enabled()), range(8)))
+    assert seen == [True] * 8
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert list(pool.map(metrics.propagate(lambda _: metrics.enabled()), range(2))) == [False, False]
+
+
+def test_scoped_records_every_fetched_page():
+    with metrics.scoped():
+        _, pages = fetch_pages("test-key", 2025, num_of_rows=3, max_workers=4)
+    assert len(pages) > 1
+    requests = [record for record in metrics.REGISTRY.recent if record['span'] == 'api.request']
+    assert sorted(record['page'] for record in requests) == sorted(pages)
+
+
+def test_scoped_covers_load_years_workers():
+    def load_year(year):
+        with metrics.span('load', year=year):
+            return year
+
+    with metrics.scoped():
+        assert load_years(load_year, [2023, 2024, 2025]) == {2023: 2023, 2024: 2024, 2025: 2025}
+    assert sorted(row['count'] for row in metrics.summary()) == [1, 1, 1]
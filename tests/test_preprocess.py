@@ -0,0 +1,51 @@
+"""스키마 기반 전처리 (dtype, '합계' 행 분리, 결측/범위 초과 값)"""
+
+import numpy as np
+import pandas as pd
+
+from shelter.api import rows_to_frame
+from shelter.preprocess import SCHEMA, TOTAL_REGION, preprocess_data
+from tools.mock_api import load_fixture_rows
+
+
+def test_schema_dtypes_and_total_split():
+    rows = load_fixture_rows()
+    for raw in (rows, rows_to_frame(rows)):
+        df, total = preprocess_data(raw)
+        assert len(df) + len(total) == len(rows)
+        assert (total['regi'] == TOTAL_REGION).all()
+        assert TOTAL_REGION not in set(df['regi'])
+        for col, dtype in SCHEMA.items():
+            assert str(df[col].dtype) == dtype, col
+
+
+def test_missing_and_unparsable_values_become_zero():
+    raw = pd.DataFrame({
+        'regi': [TOTAL_REGION, 'a', 'b'],
+        'target_popl': ['1,000', None, 'x'],
+        'accpt_rt': [np.nan, 12.5, 7.25],
+    })
+    df, total = preprocess_data(raw)
+    assert df['target_popl'].tolist() == [0, 0]
+    assert total['target_popl'].tolist() == [1000]
+    assert df['accpt_rt'].tolist() == [12.5, 7.25]
+    assert total['accpt_rt'].tolist() == [0.0]
+
+
+def test_out_of_range_part_is_kept_as_int64():
+    raw = pd.DataFrame({
+        'regi': [TOTAL_REGION, 'a', 'b'],
+        'target_popl': [3_000_000_000.0, 1.4, 2.6],
+    })
+    df, total = preprocess_data(raw)
+    assert df['target_popl'].dtype == 'int32'
+    assert df['target_popl'].tolist() == [1, 3]
+    assert total['target_popl'].dtype == 'int64'
+    assert total['target_popl'].tolist() == [3_000_000_000]
+
+
+def test_does_not_modify_decoded_input():
+    raw = pd.DataFrame({'regi': ['a', 'b'], 'target_popl': [np.nan, 2.6]})
+    preprocess_data(raw)
+    assert np.isnan(raw['target_popl'].iloc[0])
+    assert raw['target_popl'].iloc[1] == 2.6
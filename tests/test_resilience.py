@@ -0,0 +1,205 @@
+"""single-flight, 재시도, 서킷 브레이커"""
+
+import threading
+import time
+
+import pytest
+
+from shelter.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    SingleFlight,
+    retry_with_backoff,
+)
+
+FOLLOWERS = 8
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_single_flight_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("2024", fetch)))
+    leader.start()
+    _wait_until(lambda: flight.in_flight("2024"))
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("2024", fetch)))
+        for _ in range(FOLLOWERS)
+    ]
+    for thread in followers:
+        thread.start()
+    # 뒤따른 호출이 모두 진행 중인 호출에 합류한 뒤 끝냄
+    _wait_until(lambda: flight.waiters("2024") == FOLLOWERS)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["result"] * (FOLLOWERS + 1)
+    assert not flight.in_flight("2024")
+    assert flight.waiters("2024") == 0
+
+
+def test_single_flight_shares_exception_and_allows_retry():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("upstream")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("2024", failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    _wait_until(lambda: flight.in_flight("2024"))
+    threads += [threading.Thread(target=call) for _ in range(FOLLOWERS)]
+    for thread in threads[1:]:
+        thread.start()
+    _wait_until(lambda: flight.waiters("2024") == FOLLOWERS)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ["upstream"] * (FOLLOWERS + 1)
+    # 실패한 호출은 남지 않으므로 다음 호출은 새로 실행
+    assert flight.do("2024", lambda: "ok") == "ok"
+
+
+def test_single_flight_keys_are_independent():
+    flight = SingleFlight()
+    assert flight.do(2023, lambda: 2023) == 2023
+    assert flight.do(2024, lambda: 2024) == 2024
+
+
+def test_retry_with_backoff_retries_transient_errors():
+    attempts = []
+    sleeps = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert retry_with_backoff(flaky, retries=3, sleep=sleeps.append) == "ok"
+    assert len(attempts) == 3
+    assert len(sleeps) == 2
+
+
+def test_retry_with_backoff_stops_on_non_retryable_error():
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        retry_with_backoff(bad_request, retries=3, sleep=lambda _: None,
+                           is_retryable=lambda e: isinstance(e, ConnectionError))
+    assert len(attempts) == 1
+
+
+def test_retry_with_backoff_gives_up_after_retries():
+    attempts = []
+
+    def down():
+        attempts.append(1)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        retry_with_backoff(down, retries=2, sleep=lambda _: None)
+    assert len(attempts) == 3
+
+
+def _fail():
+    raise ConnectionError("down")
+
+
+def test_circuit_breaker_opens_after_threshold():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+
+
+def test_circuit_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_half_open_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 시험 호출이 실패하면 다시 열림
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "blocked")
+
+    clock.now = 20
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_allows_one_trial_at_a_time():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    clock.now = 10
+
+    def trial():
+        # 시험 호출이 끝나기 전의 다른 호출은 차단
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "second")
+        return "trial"
+
+    assert breaker.call(trial) == "trial"
+    assert breaker.state == CircuitBreaker.CLOSED
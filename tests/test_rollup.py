@@ -0,0 +1,93 @@
+"""지역 계층 롤업 큐브 (단계별 합계, 인구 가중 수용률, 시도 소계 제외)"""
+
+import pandas as pd
+import pytest
+
+from shelter.preprocess import preprocess_data
+from shelter.rollup import NATION, NATION_NAME, build_rollup, split_region
+from tools.mock_api import load_fixture_rows
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=[
+        'regi', 'target_popl', 'shelt_abl_popl_smry', 'gov_shelts_shelts', 'pub_shelts_shelts',
+    ])
+
+
+ROWS = [
+    ('서울특별시 종로구', 100, 80, 1, 2),
+    ('서울특별시 중구', 300, 330, 0, 5),
+    ('서울특별시 종로구', 50, 40, 0, 1),
+    # 시군구 행이 있는 시도의 시도 행은 소계 → 합산에서 제외
+    ('서울특별시', 450, 450, 1, 8),
+    # 시군구가 없는 시도는 그대로 말단
+    ('세종특별자치시', 50, 25, 2, 0),
+]
+
+
+def test_split_region():
+    assert split_region('서울특별시 종로구') == ('서울특별시', '종로구')
+    assert split_region('경기도 수원시 장안구') == ('경기도', '수원시 장안구')
+    assert split_region(' 세종특별자치시 ') == ('세종특별자치시', '')
+
+
+def test_totals_by_level():
+    rollup = build_rollup(_frame(ROWS))
+
+    nation = rollup.node(NATION)
+    assert nation['name'] == NATION_NAME
+    assert nation['target_popl'] == 500
+    assert nation['shelt_abl_popl_smry'] == 475
+    assert nation['accpt_rt'] == pytest.approx(95.0)
+    assert nation['shelters'] == 11
+    assert nation['regions'] == 3
+
+    seoul = rollup.node(('서울특별시',))
+    assert seoul['target_popl'] == 450
+    assert seoul['accpt_rt'] == pytest.approx(100.0)
+    assert seoul['regions'] == 2
+
+    jongno = rollup.node(('서울특별시', '종로구'))
+    assert jongno['target_popl'] == 150
+    assert jongno['accpt_rt'] == pytest.approx(80.0)
+    assert jongno['shelters'] == 4
+
+    sejong = rollup.node(('세종특별자치시',))
+    assert sejong['target_popl'] == 50
+    assert not rollup.has_children(('세종특별자치시',))
+
+
+def test_children_and_lookup():
+    rollup = build_rollup(_frame(ROWS))
+    assert rollup.children(NATION)['name'].tolist() == ['서울특별시', '세종특별자치시']
+    assert rollup.children(('서울특별시',))['name'].tolist() == ['종로구', '중구']
+    assert rollup.children(('부산광역시',)).empty
+    assert ('서울특별시', '중구') in rollup
+    assert ('부산광역시',) not in rollup
+    assert rollup.node(('서울특별시', '중구', 'extra')) is None
+    # 각 단계 합계는 바로 아래 단계 합계와 같음
+    for key in [NATION, ('서울특별시',)]:
+        assert rollup.children(key)['target_popl'].sum() == rollup.node(key)['target_popl']
+
+
+def test_rate_weighted_by_population_without_capacity_column():
+    df = pd.DataFrame({
+        'regi': ['a x', 'a y'],
+        'target_popl': [100, 300],
+        'accpt_rt': [50.0, 90.0],
+    })
+    rollup = build_rollup(df)
+    assert rollup.node(NATION)['accpt_rt'] == pytest.approx(80.0)
+
+
+def test_nation_matches_total_row():
+    df, total_df = preprocess_data(load_fixture_rows())
+    nation = build_rollup(df).node(NATION)
+    assert nation['target_popl'] == total_df['target_popl'].iloc[0]
+    assert nation['shelt_abl_popl_smry'] == total_df['shelt_abl_popl_smry'].iloc[0]
+    assert nation['regions'] == df['regi'].nunique()
+
+
+def test_no_rollup_without_regions():
+    assert build_rollup(pd.DataFrame()) is None
+    assert build_rollup(pd.DataFrame({'target_popl': [1]})) is None
@@ -0,0 +1,125 @@
+"""프로세스 간 공유 저장소 (게시/조회, 메모리 매핑, 이전 버전 정리)"""
+
+import numpy as np
+import pytest
+
+from shelter.preprocess import preprocess_data
+from shelter.shared import KEEP_VERSIONS, SharedStore
+from tools.mock_api import load_fixture_rows
+
+YEAR = 2024
+
+
+@pytest.fixture
+def frames():
+    return preprocess_data(load_fixture_rows())
+
+
+def _versions(store):
+    return sorted(path.name for path in (store.root / str(YEAR)).iterdir()
+                  if path.is_dir() and path.name.startswith("v"))
+
+
+def test_publish_then_get_round_trip(tmp_path, frames):
+    df, total_df = frames
+    store = SharedStore(tmp_path)
+    assert store.get(YEAR) is None
+    assert store.publish(YEAR, 100.0, df, total_df, content_hash="h1")
+
+    shared = SharedStore(tmp_path).get(YEAR)
+    assert shared.fetched_at == 100.0
+    assert shared.content_hash == "h1"
+    assert list(shared.df.index) == list(df.index)
+    assert list(shared.total_df.index) == list(total_df.index)
+    assert shared.df['regi'].astype(str).tolist() == df['regi'].astype(str).tolist()
+    for col in df.columns.drop('regi'):
+        assert shared.df[col].dtype == df[col].dtype, col
+        assert np.array_equal(shared.df[col].to_numpy(), df[col].to_numpy()), col
+
+
+def test_numeric_columns_are_read_only_mappings(tmp_path, frames):
+    store = SharedStore(tmp_path)
+    store.publish(YEAR, 100.0, *frames)
+    values = store.get(YEAR).df['target_popl'].to_numpy()
+    assert not values.flags.writeable
+
+
+def test_get_reuses_mapping_until_new_version(tmp_path, frames):
+    df, total_df = frames
+    store = SharedStore(tmp_path)
+    store.publish(YEAR, 100.0, df, total_df, content_hash="h1")
+    first = store.get(YEAR)
+    assert store.get(YEAR) is first
+
+    changed = df.assign(target_popl=df['target_popl'] + 1)
+    assert store.publish(YEAR, 200.0, changed, total_df, content_hash="h2")
+    second = store.get(YEAR)
+    assert second is not first
+    assert second.content_hash == "h2"
+    assert (second.df['target_popl'].to_numpy() == changed['target_popl'].to_numpy()).all()
+    # 이미 매핑한 이전 버전은 계속 읽을 수 있음
+    assert (first.df['target_popl'].to_numpy() == df['target_popl'].to_numpy()).all()
+
+
+def test_publish_same_version_twice_is_noop(tmp_path, frames):
+    store = SharedStore(tmp_path)
+    assert store.publish(YEAR, 100.0, *frames)
+    assert not store.publish(YEAR, 100.0, *frames)
+    assert len(_versions(store)) == 1
+
+
+def test_old_versions_are_pruned(tmp_path, frames):
+    df, total_df = frames
+    store = SharedStore(tmp_path)
+    for n in range(KEEP_VERSIONS + 3):
+        store.publish(YEAR, 100.0 + n, df, total_df, content_hash=f"h{n}")
+    assert len(_versions(store)) == KEEP_VERSIONS + 1
+    assert store.get(YEAR).content_hash == f"h{KEEP_VERSIONS + 2}"
+
+
+def test_clear_removes_year(tmp_path, frames):
+    store = SharedStore(tmp_path)
+    store.publish(YEAR, 100.0, *frames)
+    store.publish(YEAR + 1, 100.0, *frames)
+    store.clear(YEAR)
+    assert store.get(YEAR) is None
+    assert [int(year) for year, _, _ in store.entries()] == [YEAR + 1]
+
+
+def test_unchanged_content_only_bumps_fetched_at(tmp_path, frames):
+    store = SharedStore(tmp_path)
+    store.publish(YEAR, 100.0, *frames, content_hash="h1")
+    mapped = store.get(YEAR)
+
+    # 같은 내용을 다시 받아옴: 새 버전을 쓰지 않음
+    assert not store.publish(YEAR, 500.0, *frames, content_hash="h1")
+    assert len(_versions(store)) == 1
+    assert SharedStore(tmp_path).get(YEAR).fetched_at == 500.0
+    refreshed = store.get(YEAR)
+    assert refreshed.fetched_at == 500.0
+    # 매핑은 그대로 재사용
+    assert refreshed.df is mapped.df
+
+
+def test_touch(tmp_path, frames):
+    store = SharedStore(tmp_path)
+    assert not store.touch(YEAR, 200.0, "h1")
+    store.publish(YEAR, 100.0, *frames, content_hash="h1")
+
+    assert not store.touch(YEAR, 200.0, "other")
+    assert store.get(YEAR).fetched_at == 100.0
+
+    assert store.touch(YEAR, 200.0, "h1")
+    assert store.get(YEAR).fetched_at == 200.0
+    # 더 오래된 시각으로 되돌리지 않음
+    assert store.touch(YEAR, 150.0, "h1")
+    assert store.get(YEAR).fetched_at == 200.0
+
+
+def test_touch_without_recorded_hash(tmp_path, frames):
+    # content_hash 없이 게시한 이전 게시본은 같은 내용인지 알 수 없음
+    store = SharedStore(tmp_path)
+    store.publish(YEAR, 100.0, *frames)
+    assert not store.touch(YEAR, 200.0, "h1")
+    assert store.publish(YEAR, 200.0, *frames, content_hash="h1")
+    assert len(_versions(store)) == 2
@@ -0,0 +1,92 @@
+"""서버 측 페이지 단위 상세 표 (정렬/검색/필터 결과를 pandas 와 비교)"""
+
+import numpy as np
+import pytest
+
+from shelter.filters import Between, FilterEngine
+from shelter.table import TableQuery, ordered_positions, page_count, table_page
+from shelter.views import COLUMN_LABELS, prepare_dataset
+from tools.synthetic import synthetic_rows
+
+
+@pytest.fixture(scope="module")
+def df():
+    return prepare_dataset(synthetic_rows(2_000)).df
+
+
+@pytest.fixture(scope="module")
+def engine(df):
+    return FilterEngine(df)
+
+
+def _expected(df, selected, query):
+    """pandas 로 같은 조건을 적용한 결과 (정렬 컬럼 값, 행 위치 집합)"""
+    keep = np.ones(len(df), dtype=bool)
+    if selected is not None:
+        keep[:] = False
+        keep[selected] = True
+    search = query.search.strip()
+    if search:
+        keep &= df['regi'].astype(str).str.contains(search, case=False, regex=False).to_numpy()
+    rows = df[keep]
+    if query.sort in df.columns:
+        key = rows[query.sort].astype(str) if query.sort == 'regi' else rows[query.sort]
+        rows = rows.loc[key.sort_values(ascending=query.ascending, kind='stable').index]
+    return rows, set(np.flatnonzero(keep))
+
+
+@pytest.mark.parametrize("query", [
+    TableQuery(),
+    TableQuery(sort='accpt_rt'),
+    TableQuery(sort='target_popl', ascending=False),
+    TableQuery(sort='regi', ascending=False),
+    TableQuery(search='00001'),
+    TableQuery(sort='accpt_rt', ascending=False, search='0000 '),
+    TableQuery(sort='not_a_column', search='없는 지역'),
+])
+@pytest.mark.parametrize("filtered", [False, True])
+def test_ordered_positions_match_pandas(df, engine, query, filtered):
+    selected = engine.select([Between('accpt_rt', 50, 120)]) if filtered else None
+    positions = ordered_positions(engine, selected, query)
+    expected, expected_set = _expected(df, selected, query)
+
+    assert set(positions) == expected_set
+    assert len(positions) == len(expected_set)
+    column = query.sort if query.sort in df.columns else None
+    if column is None:
+        # 정렬하지 않으면 원래 순서
+        assert list(positions) == sorted(expected_set)
+    else:
+        got = df[column].to_numpy()[positions]
+        assert list(map(str, got)) == list(map(str, expected[column].to_numpy()))
+
+
+def test_page_count():
+    assert page_count(0, 100) == 1
+    assert page_count(100, 100) == 1
+    assert page_count(101, 100) == 2
+
+
+def test_table_page_slices_and_formats(df, engine):
+    query = TableQuery(sort='target_popl', page_size=300)
+    positions = ordered_positions(engine, None, query)
+
+    page = table_page(df, positions, TableQuery(page=1, page_size=300))
+    assert (page.total_rows, page.pages, page.page, page.start) == (2_000, 7, 1, 300)
+    assert len(page.frame) == 300
+    assert list(page.frame.index) == list(df.index[positions[300:600]])
+    assert list(page.frame.columns) == [COLUMN_LABELS[col] for col in df.columns]
+    # 보이는 페이지의 범주만 남김
+    assert len(page.frame[COLUMN_LABELS['regi']].cat.categories) == 300
+
+    last = table_page(df, positions, TableQuery(page=6, page_size=300))
+    assert len(last.frame) == 2_000 - 6 * 300
+
+
+def test_table_page_clamps_page_number(df):
+    positions = np.arange(10)
+    assert table_page(df, positions, TableQuery(page=99, page_size=4)).page == 2
+    assert table_page(df, positions, TableQuery(page=-1, page_size=4)).page == 0
+
+    empty = table_page(df, np.array([], dtype=int), TableQuery(page=3))
+    assert (empty.total_rows, empty.pages, empty.page, len(empty.frame)) == (0, 1, 0, 0)
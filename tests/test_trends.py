@@ -0,0 +1,108 @@
+"""연도별 추이 표의 전년 대비/연평균 증감률"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shelter.trends import TrendTable, _long_rows, compute_trends
+
+
+def _year_frame(values):
+    """{지역: 수용률} → 한 연도의 전처리 결과 형태"""
+    regions = list(values)
+    return pd.DataFrame({
+        'regi': regions,
+        'accpt_rt': [values[regi] for regi in regions],
+        'target_popl': [1000.0] * len(regions),
+        'pub_shelts_shelts': [10.0] * len(regions),
+    })
+
+
+def _long(year, values):
+    frame = _year_frame(values)
+    frame.insert(0, 'year', np.int16(year))
+    return frame
+
+
+def _row(frame, year, regi):
+    row = frame[(frame['year'] == year) & (frame['regi'] == regi)]
+    assert len(row) == 1
+    return row.iloc[0]
+
+
+def test_yoy_against_previous_year():
+    rows = pd.concat([_long(2020, {'a': 50.0}), _long(2021, {'a': 60.0})], ignore_index=True)
+    row = _row(compute_trends(rows), 2021, 'a')
+    assert row['accpt_rt_yoy'] == pytest.approx(10.0)
+    assert row['accpt_rt_yoy_pct'] == pytest.approx(20.0)
+
+
+def test_region_missing_a_year_has_no_yoy():
+    rows = pd.concat([
+        _long(2020, {'a': 50.0, 'b': 40.0}),
+        _long(2021, {'b': 45.0}),
+        _long(2022, {'a': 72.0, 'b': 50.0}),
+    ], ignore_index=True)
+    trends = compute_trends(rows)
+    gap = _row(trends, 2022, 'a')
+    assert np.isnan(gap['accpt_rt_yoy'])
+    assert np.isnan(gap['accpt_rt_yoy_pct'])
+    # 연평균 증감률은 기준 연도부터의 연수로 계산하므로 유지
+    assert gap['accpt_rt_cagr'] == pytest.approx(20.0)
+    assert _row(trends, 2022, 'b')['accpt_rt_yoy'] == pytest.approx(5.0)
+
+
+def test_missing_year_in_table_has_no_yoy():
+    # load_years 에서 실패한 연도가 빠진 경우 (추가 순서대로 증분 계산)
+    table = TrendTable()
+    table.update(2020, 'v2020', _year_frame({'a': 50.0}))
+    table.update(2022, 'v2022', _year_frame({'a': 72.0}))
+    assert np.isnan(_row(table.frame, 2022, 'a')['accpt_rt_yoy'])
+
+    table.update(2021, 'v2021', _year_frame({'a': 60.0}))
+    assert _row(table.frame, 2022, 'a')['accpt_rt_yoy'] == pytest.approx(12.0)
+
+
+def _random_years(seed=0):
+    """연도마다 일부 지역이 빠지거나 새로 생기는 무작위 연도별 표"""
+    rng = np.random.default_rng(seed)
+    regions = [f'r{n}' for n in range(12)]
+    years = {}
+    for year in range(2018, 2025):
+        present = [regi for regi in regions if rng.random() > 0.2]
+        frame = _year_frame(dict(zip(present, rng.uniform(30, 120, len(present)).round(1))))
+        frame['target_popl'] = rng.integers(0, 5000, len(present)).astype('float64')
+        total = _year_frame({'합계': round(rng.uniform(50, 100), 1)})
+        years[year] = (frame, total)
+    return years
+
+
+def _recomputed(years):
+    return compute_trends(pd.concat(
+        [_long_rows(year, df, total) for year, (df, total) in years.items()], ignore_index=True
+    ))
+
+
+def test_incremental_update_matches_full_recompute():
+    years = _random_years()
+    table = TrendTable()
+    for year, (df, total) in years.items():
+        assert table.update(year, f'v{year}', df, total)
+        done = {y: years[y] for y in years if y <= year}
+        pd.testing.assert_frame_equal(table.frame, _recomputed(done), check_dtype=False)
+    assert table.years == list(years)
+
+
+def test_out_of_order_and_replaced_years_match_full_recompute():
+    years = _random_years(seed=1)
+    table = TrendTable()
+    for year in [2020, 2024, 2018, 2022, 2019, 2023, 2021]:
+        table.update(year, f'v{year}', *years[year])
+    pd.testing.assert_frame_equal(table.frame, _recomputed(years), check_dtype=False)
+
+    # 같은 버전은 다시 계산하지 않고, 바뀐 연도만 교체
+    assert not table.update(2021, 'v2021', *years[2021])
+    changed = _random_years(seed=2)[2021]
+    assert table.update(2021, 'v2021b', *changed)
+    years[2021] = changed
+    pd.testing.assert_frame_equal(table.frame, _recomputed(years), check_dtype=False)
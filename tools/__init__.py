@@ -0,0 +1 @@
+"""개발용 도구 (목업 API 서버 등)"""
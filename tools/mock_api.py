@@ -0,0 +1,123 @@
+"""data.go.kr AirRaidShelterRegion API 로컬 목업 서버
+
+녹화된 fixtures/ 응답으로 pageNo/numOfRows/bas_yy 페이지네이션을 흉내냅니다.
+
+    python -m tools.mock_api --port 8765 --scale 50 --latency 0.2
+    SHELTER_API_URL=http://127.0.0.1:8765/ streamlit run app.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+FIXTURE_FILE = FIXTURE_DIR / "air_raid_shelter_region_2024.json"
+
+
+def load_fixture_rows(path=FIXTURE_FILE):
+    """녹화된 응답에서 레코드 목록을 읽음"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for block in data["AirRaidShelterRegion"]:
+        if "row" in block:
+            return block["row"]
+    return []
+
+
+def scale_rows(rows, scale):
+    """지역명에 번호를 붙여 레코드 수를 scale 배로 늘림 (합계 행은 1개 유지)"""
+    if scale <= 1:
+        return list(rows)
+    scaled = [row for row in rows if row.get("regi") == "합계"]
+    for i in range(scale):
+        for row in rows:
+            if row.get("regi") == "합계":
+                continue
+            scaled.append({**row, "regi": f"{row['regi']} {i + 1:04d}"})
+    return scaled
+
+
+def build_response(rows, page_no, num_of_rows):
+    """API와 같은 구조의 페이지 응답 생성"""
+    start = (page_no - 1) * num_of_rows
+    return {
+        "AirRaidShelterRegion": [
+            {"head": [
+                {"totalCount": len(rows)},
+                {"numOfRows": str(num_of_rows), "pageNo": str(page_no), "type": "json"},
+                {"RESULT": {"resultCode": "INFO-0", "resultMsg": "NORMAL SERVICE"}},
+            ]},
+            {"row": rows[start:start + num_of_rows]},
+        ]
+    }
+
+
+def make_handler(rows, latency=0.0):
+    """목업 응답을 돌려주는 요청 핸들러 클래스 생성"""
+
+    class MockHandler(BaseHTTPRequestHandler):
+        request_count = 0
+
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            page_no = int(query.get("pageNo", ["1"])[0])
+            num_of_rows = int(query.get("numOfRows", ["10"])[0])
+            year = query.get("bas_yy", [None])[0]
+
+            MockHandler.request_count += 1
+            if latency:
+                time.sleep(latency)
+
+            year_rows = [{**row, "bas_yy": year} for row in rows] if year else rows
+            body = json.dumps(
+                build_response(year_rows, page_no, num_of_rows), ensure_ascii=False
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockHandler
+
+
+def start_mock_server(rows=None, latency=0.0, port=0, host="127.0.0.1"):
+    """백그라운드 스레드에서 목업 서버를 띄우고 (server, url)을 반환"""
+    if rows is None:
+        rows = load_fixture_rows()
+    server = ThreadingHTTPServer((host, port), make_handler(rows, latency))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://{host}:{server.server_address[1]}/"
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주민대피시설 API 목업 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scale", type=int, default=1, help="레코드 수 배율")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연(초)")
+    args = parser.parse_args()
+
+    rows = scale_rows(load_fixture_rows(), args.scale)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(rows, args.latency))
+    print(f"목업 서버 실행 중: http://{args.host}:{args.port}/ ({len(rows)}개 레코드)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
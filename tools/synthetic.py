@@ -0,0 +1,132 @@
+"""AirRaidShelterRegion 스키마를 따르는 합성 레코드 생성기 (벤치마크용)"""
+
+import numpy as np
+
+
+def _with_commas(values):
+    return [f"{v:,}" for v in values.tolist()]
+
+
+def synthetic_rows(n, year=2024, seed=0, total_row=True):
+    """지역 n개 (+ '합계' 행) 의 API 형식 레코드 목록 생성
+
+    값은 실제 응답처럼 콤마가 포함된 문자열입니다.
+    """
+    rng = np.random.default_rng(seed)
+    target_popl = rng.integers(10_000, 2_000_000, n)
+    pub_shelts = np.maximum(1, target_popl // rng.integers(900, 2500, n))
+    pub_area = (pub_shelts * rng.uniform(700, 1600, n)).astype(np.int64)
+    gov_shelts = rng.integers(0, 40, n)
+    gov_area = gov_shelts * rng.integers(150, 400, n)
+    abl_gov = (gov_area / 0.825).astype(np.int64)
+    abl_pub = (pub_area / 0.825).astype(np.int64)
+    abl_smry = abl_gov + abl_pub
+    accpt_rt = np.round(abl_smry / target_popl * 100, 1)
+
+    columns = {
+        'target_popl': target_popl,
+        'shelt_abl_popl_smry': abl_smry,
+        'shelt_abl_popl_gov_shelts': abl_gov,
+        'shelt_abl_popl_pub_shelts': abl_pub,
+        'gov_shelts_shelts': gov_shelts,
+        'gov_shelts_area': gov_area,
+        'pub_shelts_shelts': pub_shelts,
+        'pub_shelts_area': pub_area,
+    }
+    formatted = {col: _with_commas(values) for col, values in columns.items()}
+    rates = [f"{v:.1f}" for v in accpt_rt.tolist()]
+    bas_yy = str(year)
+
+    rows = []
+    if total_row:
+        totals = {col: int(values.sum()) for col, values in columns.items()}
+        rows.append({
+            'bas_yy': bas_yy,
+            'regi': '합계',
+            'target_popl': f"{totals['target_popl']:,}",
+            'accpt_rt': f"{totals['shelt_abl_popl_smry'] / totals['target_popl'] * 100:.1f}",
+            **{col: f"{v:,}" for col, v in totals.items() if col != 'target_popl'},
+        })
+    for i in range(n):
+        row = {
+            'bas_yy': bas_yy,
+            'regi': f"지역 {i + 1:07d}",
+            'target_popl': formatted['target_popl'][i],
+            'accpt_rt': rates[i],
+        }
+        for col in columns:
+            if col != 'target_popl':
+                row[col] = formatted[col][i]
+        rows.append(row)
+    return rows
+
+
+# 시도별 대표 좌표 (도청/시청 소재지 부근, 위도/경도)
+REGION_CENTERS = {
+    '서울특별시': (37.5665, 126.9780),
+    '부산광역시': (35.1796, 129.0756),
+    '대구광역시': (35.8714, 128.6014),
+    '인천광역시': (37.4563, 126.7052),
+    '광주광역시': (35.1595, 126.8526),
+    '대전광역시': (36.3504, 127.3845),
+    '울산광역시': (35.5384, 129.3114),
+    '세종특별자치시': (36.4800, 127.2890),
+    '경기도': (37.2752, 127.0095),
+    '강원특별자치도': (37.8813, 127.7298),
+    '충청북도': (36.6424, 127.4890),
+    '충청남도': (36.6588, 126.6728),
+    '전북특별자치도': (35.8242, 127.1480),
+    '전라남도': (34.8161, 126.4629),
+    '경상북도': (36.5760, 128.5056),
+    '경상남도': (35.2383, 128.6924),
+    '제주특별자치도': (33.4996, 126.5312),
+}
+# 광역시/특별시는 좁게, 도는 넓게 흩어짐 (표준편차, 도 단위)
+_CITY_SPREAD = 0.06
+_PROVINCE_SPREAD = 0.35
+
+
+def synthetic_facilities(n=None, seed=0):
+    """시설 단위 대피시설 표 생성 (SHELTER_FACILITY_PATH CSV와 같은 컬럼)
+
+    n이 없으면 녹화된 지역 응답의 시설 수(공공+정부지원)만큼, 있으면
+    그 비율대로 n개를 시도 대표 좌표 주변에 흩어 놓습니다.
+    """
+    import pandas as pd
+
+    from tools.mock_api import load_fixture_rows
+
+    counts = {
+        row['regi']: int(row['pub_shelts_shelts'].replace(',', ''))
+        + int(row['gov_shelts_shelts'].replace(',', ''))
+        for row in load_fixture_rows() if row['regi'] in REGION_CENTERS
+    }
+    regions = list(counts)
+    weights = np.array([counts[regi] for regi in regions], dtype='float64')
+    if n is None:
+        per_region = weights.astype(np.int64)
+    else:
+        per_region = np.floor(weights / weights.sum() * n).astype(np.int64)
+        per_region[np.argmax(weights)] += n - per_region.sum()
+
+    rng = np.random.default_rng(seed)
+    regi = np.repeat(regions, per_region)
+    centers = np.array([REGION_CENTERS[r] for r in regions])
+    spread = np.array([_PROVINCE_SPREAD if r.endswith('도') else _CITY_SPREAD for r in regions])
+    # 시도마다 하위 중심 5곳을 두고 그 주변에 모이게 함
+    sub = rng.normal(0, 1, (len(regions), 5, 2)) * spread[:, None, None]
+    region_idx = np.repeat(np.arange(len(regions)), per_region)
+    pick = rng.integers(0, 5, len(region_idx))
+    base = centers[region_idx] + sub[region_idx, pick]
+    coords = base + rng.normal(0, 1, base.shape) * (spread[region_idx, None] / 4)
+
+    area = np.round(rng.lognormal(6.5, 0.9, len(regi)), 1)
+    return pd.DataFrame({
+        '시설명': [f"대피시설 {i + 1:06d}" for i in range(len(regi))],
+        '시도': regi,
+        '주소': [f"{r} 가상로 {i + 1}" for i, r in enumerate(regi)],
+        '위도': np.round(coords[:, 0], 6),
+        '경도': np.round(coords[:, 1], 6),
+        '시설면적': area,
+        '최대수용인원': (area / 0.825).astype(np.int64),
+    })